@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+对比标准库 json 与 json_io（当前后端：orjson / msgspec / json）在一个 GE 文件和一张 Buffs.json 上的
+解析、写出耗时，并检查 json_io 写出与 json.dump(ensure_ascii=False, indent=2) 是否逐字节一致。
+样本路径不存在时自动生成同量级的合成文件（GE：数百个函数 Export；Buffs：数千行 BuffSetting）。
+用法：
+    python bench_json_io.py                 使用下方配置
+    python bench_json_io.py a.json b.json   指定样本文件
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import bench_scan
+import json_io
+
+# ============== 配置（按需修改） ==============
+SAMPLES: List[str] = [
+    r"D:\Unreal_tools\original_files\Wandering_Sword\Content\JH\Skills\JH_A_ZhongSheng\GE_ZhongSheng_1.json",
+    r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_1\Wandering_Sword\Content\JH\Tables\Buffs.json",
+]
+REPEAT = 3                # 每项重复次数，取最快一次
+SYNTH_GE_FUNCS = 400      # 合成 GE 的函数 Export 数
+SYNTH_BUFF_ROWS = 6000    # 合成 Buffs.json 的行数
+# ===========================================
+
+_S = "UAssetAPI.PropertyTypes.Structs.StructPropertyData, UAssetAPI"
+_O = "UAssetAPI.PropertyTypes.Objects.{}, UAssetAPI"
+
+
+def make_buffs(n_rows: int) -> dict:
+    rng = random.Random(2)
+
+    def text(name, v):
+        return {"$type": _O.format("TextPropertyData"), "Name": name, "DuplicationIndex": 0, "IsZero": False,
+                "CultureInvariantString": v, "Namespace": None, "Value": None}
+
+    def soft(name, v):
+        return {"$type": _O.format("SoftObjectPropertyData"), "Name": name, "DuplicationIndex": 0, "IsZero": False,
+                "Value": {"AssetPath": {"PackageName": None, "AssetName": v}, "SubPathString": None}}
+
+    def num(kind, name, v):
+        return {"$type": _O.format(kind), "Name": name, "DuplicationIndex": 0, "IsZero": False, "Value": v}
+
+    rows = []
+    for i in range(n_rows):
+        bid = 2025000 + i
+        rows.append({"$type": _S, "StructType": "BuffSetting", "SerializeNone": True,
+                     "StructGUID": "{00000000-0000-0000-0000-000000000000}", "Name": str(bid),
+                     "DuplicationIndex": 0, "IsZero": False, "Value": [
+                         num("IntPropertyData", "ID", bid),
+                         text("ViewName", f"状态{i}"),
+                         text("Description", f"<Buff>每回合恢复{rng.randint(1, 99)}%气血</>"),
+                         soft("Blueprint", f"/Game/JH/Skills/Buff/GE_Buff{i}.GE_Buff{i}_C"),
+                         soft("Icon", f"/Game/JH/UI/Icon/T_Buff{i % 300}.T_Buff{i % 300}"),
+                         num("FloatPropertyData", "Duration", rng.choice([1.0, 2.5, 0.0001, 1e-05])),
+                         num("IntPropertyData", "MaxStack", rng.randint(1, 9)),
+                     ]})
+    return {"Info": "Serialized with UAssetAPI", "NameMap": ["BuffSetting", "ID", "ViewName", "Description"],
+            "Imports": [], "Exports": [{"$type": "UAssetAPI.ExportTypes.DataTableExport, UAssetAPI",
+                                        "ObjectName": "Buffs", "Data": [], "Table": {"Data": rows}}]}
+
+
+def synth_samples(root: Path) -> List[Path]:
+    ge = root / "GE_Synthetic.json"
+    buffs = root / "Buffs.json"
+    for p, doc in ((ge, bench_scan.make_ge(random.Random(1), ge.stem, SYNTH_GE_FUNCS)),
+                   (buffs, make_buffs(SYNTH_BUFF_ROWS))):
+        with p.open("w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2)
+    return [ge, buffs]
+
+
+def best_of(fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(max(1, REPEAT)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_file(path: Path, tmp: Path) -> None:
+    mb = path.stat().st_size / 1048576
+
+    def std_load():
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+
+    doc = std_load()
+    out_std, out_io = tmp / "std.json", tmp / "io.json"
+
+    def std_dump():
+        with out_std.open("w", encoding="utf-8") as f:
+            json.dump(doc, f, ensure_ascii=False, indent=2)
+
+    t = {
+        "load_json": best_of(std_load),
+        "load_io": best_of(lambda: json_io.load(path)),
+        "dump_json": best_of(std_dump),
+        "dump_io": best_of(lambda: json_io.dump(doc, out_io)),
+    }
+    same = out_std.read_bytes() == out_io.read_bytes()
+    print(f"\n{path.name}（{mb:.1f} MB）")
+    print(f"  解析：json {t['load_json'] * 1000:8.1f} ms   json_io {t['load_io'] * 1000:8.1f} ms"
+          f"   ×{t['load_json'] / t['load_io']:.2f}")
+    print(f"  写出：json {t['dump_json'] * 1000:8.1f} ms   json_io {t['dump_io'] * 1000:8.1f} ms"
+          f"   ×{t['dump_json'] / t['dump_io']:.2f}")
+    print(f"  写出逐字节一致：{'是' if same else '否'}")
+
+
+def main():
+    paths = [Path(p) for p in (sys.argv[1:] or SAMPLES)]
+    with tempfile.TemporaryDirectory(prefix="bench_json_io_") as td:
+        tmp = Path(td)
+        if not all(p.is_file() for p in paths):
+            print("[样本] 配置的样本文件不存在，改用合成文件。")
+            paths = synth_samples(tmp)
+        print(f"[后端] json_io.BACKEND = {json_io.BACKEND}")
+        for p in paths:
+            bench_file(p, tmp)
+
+
+if __name__ == "__main__":
+    main()
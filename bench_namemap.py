@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+对比 fix_indices_namemap 的 NameMap 总表补齐步骤（NM-2）新旧两种做法在大 GE 文件上的耗时与结果：
+   - 旧：collect_all_strings 收集整份文档的键与字符串，逐串做 Property 记号正则，再逐行扫描 namemap_all.txt；
+   - 新：collect_name_candidates 只看会进 NameMap 的字段（规范化带缓存），再查 namemap_table 编译总表的哈希索引。
+输出每个样本两种做法各自的耗时、加速比，以及追加条目的差异（新做法不再把 JSON 键名、普通字符串值当作 NameMap 候选）。
+样本或总表不存在时自动生成合成数据（GE：SYNTH_GE_FUNCS 个函数 Export，另加 Name / 软引用 / 枚举属性，
+以及 GameplayAttribute（AttributeName + FieldPath）与委托属性，覆盖两种做法都要取到的 FName 字段）。
+用法：
+    python bench_namemap.py                 使用下方配置
+    python bench_namemap.py a.json b.json   指定样本文件
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import bench_scan
+import fix_indices_namemap as fix
+import json_io
+import namemap_table
+
+# ============== 配置（按需修改） ==============
+SAMPLES: List[str] = [
+    r"D:\Unreal_tools\original_files\Wandering_Sword\Content\JH\Skills\JH_A_ZhongSheng\GE_ZhongSheng_1.json",
+]
+NAMEMAP_TXT = fix.NAMEMAP_TXT   # 不存在时依次尝试本仓库 outputfiles/namemap_all.txt、合成总表
+REPEAT = 5                      # 每项重复次数，取最快一次
+SYNTH_GE_FUNCS = 600            # 合成 GE 的函数 Export 数
+SYNTH_TABLE_LINES = 8400        # 合成总表行数
+# ===========================================
+
+_O = "UAssetAPI.PropertyTypes.Objects.{}, UAssetAPI"
+_ATTRIBUTES = ("Agility", "AttackPower", "Constitution", "Strength", "Health", "MaxHealth")   # 均在 namemap_all.txt 中
+_DELEGATES = ("OnBuffAdded", "OnBuffRemoved", "OnSkillHit")
+
+
+def _extra_props(rng: random.Random, k: int, pick: Callable[[str], str]) -> list:
+    path = pick("/Game/")
+    return [
+        {"$type": _O.format("SoftObjectPropertyData"), "Name": "Effect", "DuplicationIndex": 0, "IsZero": False,
+         "Value": {"$type": "UAssetAPI.PropertyTypes.Objects.FSoftObjectPath, UAssetAPI",
+                   "AssetPath": {"$type": "UAssetAPI.PropertyTypes.Objects.FTopLevelAssetPath, UAssetAPI",
+                                 "PackageName": path, "AssetName": path.rsplit("/", 1)[-1]},
+                   "SubPathString": None}},
+        {"$type": _O.format("NamePropertyData"), "Name": "TagName", "DuplicationIndex": 0, "IsZero": False,
+         "Value": pick("JH.Ability.")},
+        {"$type": _O.format("EnumPropertyData"), "Name": "EventType", "DuplicationIndex": 0, "IsZero": False,
+         "EnumType": "EAbilitySystemEventType", "InnerType": None, "Value": pick("EAbilitySystemEventType::")},
+        {"$type": _O.format("StrPropertyData"), "Name": "Comment", "DuplicationIndex": 0, "IsZero": False,
+         "Value": f"备注 {k}：造成 {rng.randint(1, 99)}% 伤害"},
+        _attribute(rng.choice(_ATTRIBUTES), -(k % 5 + 1)),
+        {"$type": _O.format("DelegatePropertyData"), "Name": "OnTrigger", "DuplicationIndex": 0, "IsZero": False,
+         "Value": {"$type": "UAssetAPI.UnrealTypes.FDelegate, UAssetAPI", "Object": -1, "Delegate": rng.choice(_DELEGATES)}},
+    ]
+
+
+def _attribute(attr: str, owner: int) -> dict:
+    """GE Modifier 里的 GameplayAttribute：属性名同时出现在 StrProperty 与 FieldPath 的 Path 中。"""
+    return {"$type": "UAssetAPI.PropertyTypes.Structs.StructPropertyData, UAssetAPI", "StructType": "GameplayAttribute",
+            "SerializeNone": True, "StructGUID": "{00000000-0000-0000-0000-000000000000}",
+            "Name": "Attribute", "DuplicationIndex": 0, "IsZero": False,
+            "Value": [
+                {"$type": _O.format("StrPropertyData"), "Name": "AttributeName", "DuplicationIndex": 0, "IsZero": False,
+                 "Value": attr},
+                {"$type": _O.format("FieldPathPropertyData"), "Name": "Attribute", "DuplicationIndex": 0, "IsZero": False,
+                 "Value": {"$type": "UAssetAPI.UnrealTypes.FFieldPath, UAssetAPI", "Path": [attr], "ResolvedOwner": owner}},
+                {"$type": _O.format("ObjectPropertyData"), "Name": "AttributeOwner", "DuplicationIndex": 0, "IsZero": False,
+                 "Value": owner},
+            ]}
+
+
+def make_sample(rng: random.Random, table: List[str]) -> dict:
+    """合成大 GE；软引用、Tag、触发器的值从总表里抽，NameMap 只保留一半，让补齐步骤有事可做。"""
+    groups = {}
+
+    def pick(prefix: str) -> str:
+        if prefix not in groups:
+            groups[prefix] = [s for s in table if s.startswith(prefix)] or [prefix + "Synth"]
+        return rng.choice(groups[prefix])
+
+    doc = bench_scan.make_ge(rng, "GE_BenchNameMap", SYNTH_GE_FUNCS)
+    for k, exp in enumerate(doc["Exports"][2:]):
+        exp["Data"].extend(_extra_props(rng, k, pick))
+    doc["NameMap"] = doc["NameMap"][: len(doc["NameMap"]) // 2]
+    return doc
+
+
+def make_table() -> List[str]:
+    """合成总表：NameMap 里常见的几类条目（资源路径 / Tag / 触发器 / 属性类型 / 函数名）。"""
+    lines = [f"/Game/JH/Skills/School{i % 40}/GE_Synth{i}" for i in range(SYNTH_TABLE_LINES - 400)]
+    lines += [f"JH.Ability.State.S{i}" for i in range(200)]
+    lines += [f"EAbilitySystemEventType::E{i}" for i in range(100)]
+    lines += ["IntProperty", "FloatProperty", "NameProperty", "StrProperty", "ArrayProperty", "StructProperty",
+              "EnumPropertyData", "SoftObjectProperty", "BuffId", "BuffIds", "Rate", "Level", "Tag", "None"]
+    lines += list(bench_scan._FUNCS) + list(_ATTRIBUTES) + list(_DELEGATES)
+    lines += ["GameplayAttribute", "FieldPathProperty", "DelegateProperty", "AttributeName", "AttributeOwner", "Attribute"]
+    return lines
+
+
+def best_of(fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(max(1, REPEAT)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    rng = random.Random(3)
+    tmp = Path(tempfile.mkdtemp(prefix="bench_namemap_"))
+    try:
+        txt = next((Path(p) for p in (NAMEMAP_TXT, Path(__file__).resolve().parent / "outputfiles" / "namemap_all.txt")
+                    if Path(p).is_file()), None)
+        if txt is None:
+            txt = tmp / "namemap_all.txt"
+            txt.write_text("\n".join(make_table()), encoding="utf-8")
+        elif not namemap_table.compiled_path(txt).exists():
+            # 不在用户目录里留下编译文件：复制到临时目录再测
+            shutil.copy2(txt, tmp / txt.name)
+            txt = tmp / txt.name
+        t0 = time.perf_counter()
+        lines = fix.load_lines(txt)
+        namemap_table.load_table(txt)
+        print(f"[总表] {txt}（{len(lines)} 行，首次载入含编译 {(time.perf_counter() - t0) * 1000:.1f} ms）")
+
+        paths = [Path(p) for p in (sys.argv[1:] or SAMPLES) if Path(p).is_file()]
+        docs = [(p.name, json_io.load(p)) for p in paths] or [("合成 GE", make_sample(rng, lines))]
+
+        print(f"{'样本':<24}{'字符串':>8}{'旧(ms)':>10}{'新(ms)':>10}{'加速比':>8}{'旧追加':>8}{'新追加':>8}")
+        for name, doc in docs:
+            n_fields = len(fix.collect_all_strings(doc))
+            # 旧：每个文件重读 .txt + 全文档字符串 + 逐行扫描
+            old = lambda: fix.table_entries_to_add(doc, fix.load_lines(txt), targeted=False)
+            new = lambda: fix.table_entries_to_add(doc, namemap_table.load_table(txt), targeted=True)
+            t_old, t_new = best_of(old), best_of(new)
+            a_old, a_new = old(), new()
+            print(f"{name[:23]:<24}{n_fields:>8}{t_old * 1000:>10.2f}{t_new * 1000:>10.2f}{t_old / t_new:>8.1f}"
+                  f"{len(a_old):>8}{len(a_new):>8}")
+            only_old = [s for s in a_old if s not in set(a_new)]
+            only_new = [s for s in a_new if s not in set(a_old)]
+            if only_old:
+                print(f"  仅旧做法追加（{len(only_old)}）：" + "，".join(only_old[:15]))
+            if only_new:
+                print(f"  仅新做法追加（{len(only_new)}）：" + "，".join(only_new[:15]))
+    finally:
+        namemap_table.close_all()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 生成合成语料（UAssetAPI 结构的 GE_*.json：NameMap / Imports / 若干 JH 函数 Export，含 BuffId、Tag、检测器）。
+2) 对扫描类脚本的单文件函数分别测量：
+   - 线程池（原行为，各脚本的 MAX_WORKERS）；
+   - 进程池 1、2、4 … N 个进程（scan_pool 进程模式）；
+   输出耗时、文件/s 与相对 1 进程的加速比，即 1→N 核的扩展曲线。
+用法：
+    python bench_scan.py            使用下方配置
+    python bench_scan.py 2000       指定合成文件数
+"""
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import scan_pool
+
+# ============== 配置（按需修改） ==============
+N_FILES = 1000            # 合成文件数
+FUNCS_PER_FILE = 40       # 每个文件的函数 Export 数
+BENCH_DIR = ""            # 合成语料目录；"" = 系统临时目录（结束后删除）
+KEEP_CORPUS = False       # True：保留合成语料（BENCH_DIR 非空时总是保留）
+MAX_PROCS = 0             # 扩展曲线的最大进程数；0 = CPU 核数（可设得比核数大，观察超额订阅）
+REPEAT = 1                # 每个点重复次数，取最快一次
+# 参与测试的脚本
+BENCH_TARGETS = ("namemap_all_exporter", "search_funcNtagNtrigger", "find_buffid", "fuc_main2minor")
+# ===========================================
+
+_T = "UAssetAPI.PropertyTypes.{}, UAssetAPI"
+_FUNCS = ("JHGEExtAct_AddBuff", "JHGEExtReq_Attribute", "JHExecutionPhase_Damage",
+          "JHGEExtAct_Heal", "JHExecutionPhase_ClearDamage")
+_TAGS = ("JH.Ability.State.Stun", "JH.Ability.State.Poison", "JH.Ability.Skill.Passive")
+_EVENTS = ("EAbilitySystemEventType::Hit", "EAbilitySystemEventType::None", "EAbilitySystemEventType::Kill")
+
+
+def _prop(kind: str, name: str, value, **extra) -> dict:
+    return {"$type": _T.format(kind), **extra, "Name": name, "DuplicationIndex": 0, "IsZero": False, "Value": value}
+
+
+def _import(name: str, cls: str, pkg: str, outer: int) -> dict:
+    return {"$type": "UAssetAPI.Import, UAssetAPI", "ObjectName": name, "OuterIndex": outer,
+            "ClassPackage": pkg, "ClassName": cls, "PackageName": None, "bImportOptional": False}
+
+
+def _export(name: str, data: list, outer: int = 0, cls: int = 0, tpl: int = 0) -> dict:
+    return {"$type": "UAssetAPI.ExportTypes.NormalExport, UAssetAPI", "Data": data, "ObjectName": name,
+            "ObjectFlags": "RF_Public", "SerialSize": 12, "SerialOffset": 6050,
+            "SerializationBeforeSerializationDependencies": [], "CreateBeforeSerializationDependencies": [],
+            "SerializationBeforeCreateDependencies": [], "CreateBeforeCreateDependencies": [],
+            "OuterIndex": outer, "ClassIndex": cls, "SuperIndex": 0, "TemplateIndex": tpl}
+
+
+def make_ge(rng: random.Random, name: str, n_funcs: int) -> dict:
+    imports = [_import("/Script/JH", "Package", "/Script/CoreUObject", 0),
+               _import("/Script/CoreUObject", "Package", "/Script/CoreUObject", 0)]
+    for f in _FUNCS:
+        imports.append(_import(f, "Class", "/Script/CoreUObject", -1))
+        imports.append(_import("Default__" + f, f, "/Script/JH", -1))
+    idx = {imp["ObjectName"]: -(i + 1) for i, imp in enumerate(imports)}
+    exports = [
+        _export(name + "_C", []),
+        _export("Default__" + name + "_C", [_prop("Objects.NamePropertyData", "Tag", rng.choice(_TAGS))]),
+    ]
+    for k in range(n_funcs):
+        f = rng.choice(_FUNCS)
+        ids = [_prop("Objects.IntPropertyData", str(j), rng.randint(2025900, 2025999)) for j in range(3)]
+        data = [
+            _prop("Objects.IntPropertyData", "BuffId", rng.randint(2025900, 2025999)),
+            _prop("Objects.FloatPropertyData", "Rate", rng.choice([0.5, 1.0, 2.25])),
+            _prop("Objects.NamePropertyData", "Event", rng.choice(_EVENTS)),
+            _prop("Objects.ArrayPropertyData", "BuffIds", ids, ArrayType="IntProperty", DummyStruct=None),
+            _prop("Structs.StructPropertyData", "Setting", [
+                _prop("Objects.IntPropertyData", "Level", rng.randint(1, 10)),
+                _prop("Objects.NamePropertyData", "Tag", rng.choice(_TAGS)),
+            ], StructType="JHGEExtendSetting", SerializeNone=True),
+        ]
+        exports.append(_export(f"{f}_{k}", data, outer=2, cls=idx[f], tpl=idx["Default__" + f]))
+    nm = sorted({"/Script/JH", "IntProperty", "ArrayProperty", "StructProperty", "BuffId", "BuffIds", name,
+                 *_FUNCS, *_TAGS, *_EVENTS})
+    return {"Info": "Serialized with UAssetAPI", "NameMap": nm, "Imports": imports, "Exports": exports}
+
+
+def build_corpus(root: Path, n_files: int, n_funcs: int) -> List[Path]:
+    rng = random.Random(1)
+    files = []
+    for i in range(n_files):
+        d = root / f"School{i % 8}"
+        d.mkdir(parents=True, exist_ok=True)
+        p = d / f"GE_Bench{i}.json"
+        with p.open("w", encoding="utf-8") as f:
+            json.dump(make_ge(rng, p.stem, n_funcs), f, ensure_ascii=False, indent=2)
+        files.append(p)
+    return files
+
+
+def _targets() -> List[Tuple[str, Callable, tuple, int]]:
+    """(名称, 单文件函数, 额外参数, 线程模式并发数)"""
+    entry = {
+        "namemap_all_exporter": ("process_file", ()),
+        "search_funcNtagNtrigger": ("process_file", ()),
+        "find_buffid": ("file_contains_buffid", (2025950,)),
+        "fuc_main2minor": ("parse_file_build_index", (frozenset(_FUNCS),)),
+    }
+    out = []
+    for name in BENCH_TARGETS:
+        mod = __import__(name)
+        fn_name, args = entry[name]
+        out.append((name, getattr(mod, fn_name), args, mod.MAX_WORKERS or scan_pool.default_workers("thread")))
+    return out
+
+
+def time_run(fn: Callable, files: List, mode: str, workers: int, args: tuple) -> float:
+    best = float("inf")
+    for _ in range(max(1, REPEAT)):
+        t0 = time.perf_counter()
+        for _ in scan_pool.scan_map(fn, files, mode=mode, workers=workers, args=args):
+            pass
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def proc_steps(n: int) -> List[int]:
+    steps, k = [], 1
+    while k < n:
+        steps.append(k)
+        k *= 2
+    steps.append(n)
+    return steps
+
+
+def main():
+    n_files = N_FILES
+    if len(sys.argv) > 1:
+        if len(sys.argv) > 2 or not sys.argv[1].isdigit() or int(sys.argv[1]) < 1:
+            print("用法：python bench_scan.py [合成文件数（正整数）]")
+            return
+        n_files = int(sys.argv[1])
+    n_cpu = MAX_PROCS or os.cpu_count() or 1
+    root = Path(BENCH_DIR) if BENCH_DIR else Path(tempfile.mkdtemp(prefix="bench_scan_"))
+    t0 = time.perf_counter()
+    files = build_corpus(root, n_files, FUNCS_PER_FILE)
+    total_mb = sum(p.stat().st_size for p in files) / 1048576
+    print(f"[语料] {len(files)} 个文件，{total_mb:.1f} MB，生成用时 {time.perf_counter() - t0:.1f}s -> {root}")
+    print(f"[环境] CPU {os.cpu_count()} 核，进程数 {proc_steps(n_cpu)}")
+
+    try:
+        for name, fn, args, threads in _targets():
+            print("\n" + "=" * 72)
+            print(name)
+            print(f"{'模式':<10}{'并发':>6}{'耗时(s)':>10}{'文件/s':>10}{'MB/s':>8}{'加速比':>8}")
+            el = time_run(fn, files, "thread", threads, args)
+            base = None
+            print(f"{'thread':<10}{threads:>6}{el:>10.2f}{len(files) / el:>10.1f}{total_mb / el:>8.1f}{'':>8}")
+            for n in proc_steps(n_cpu):
+                el = time_run(fn, files, "process", n, args)
+                base = base or el
+                print(f"{'process':<10}{n:>6}{el:>10.2f}{len(files) / el:>10.1f}{total_mb / el:>8.1f}{base / el:>8.2f}")
+    finally:
+        if not BENCH_DIR and not KEEP_CORPUS:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,17 @@
    - Skill：ID(Name) / ViewName
 3) 支持按遍历顺序的起止 ID 过滤（起始含，结束不含）。
 4) 导出为一个 Excel（两工作表：Buffs、Skills）到指定目录。
+5) USE_STREAMING=True 时用 json_stream 流式逐条读取，碰到结束ID立即停止读盘。
 """
 
 
-import json
 import os
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
 import pandas as pd
 
+import json_io
+import json_stream
+
 # ==== 输入与输出配置 ====
 buffs  = r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_1\Wandering_Sword\Content\JH\Tables\Buffs.json"
 skills = r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_1\Wandering_Sword\Content\JH\Tables\Skills.json"
@@ -29,6 +32,9 @@ BUFF_ID_END:   Optional[str] = None  # 兼容旧逻辑
 SKILL_ID_START: Optional[str] = None
 SKILL_ID_END:   Optional[str] = None  # 兼容旧逻辑
 
+# ==== 读取方式 ====
+USE_STREAMING = True  # True: 流式逐条读取（内存只占一行）；False: json.load 整表后递归遍历
+
 def iter_nodes(obj: Any) -> Generator[Dict[str, Any], None, None]:
     if isinstance(obj, dict):
         yield obj
@@ -80,45 +86,34 @@ def extract_buff_fields(buff_node: Dict[str, Any]) -> Tuple[str, str, str]:
             break
     return buff_id, name_text, desc_text
 
-def collect_buffs(data: Any) -> List[Tuple[str, str, str]]:
+def buff_rows_from_nodes(nodes: Iterable[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+    """按遍历顺序处理节点；碰到结束ID即停止消费（流式读取时也就停止读盘）。"""
     rows: List[Tuple[str, str, str]] = []
     started = BUFF_ID_START is None
 
-    def process_node(node: Dict[str, Any]) -> bool:
-        nonlocal started
+    for node in nodes:
         if not is_buff_setting(node):
-            return True
+            continue
         buff_id, name_text, desc_text = extract_buff_fields(node)
         if not buff_id:
-            return True
+            continue
 
         if not started and BUFF_ID_START is not None and buff_id == BUFF_ID_START:
             started = True  # 从起始ID这一条开始收集
 
         if BUFF_ID_END is not None and buff_id == BUFF_ID_END:
-            return False  # 碰到结束ID即停止，不收集该条
+            break  # 碰到结束ID即停止，不收集该条
 
         if started:
             rows.append((buff_id, name_text, desc_text))
-        return True
+    return rows
 
+def collect_buffs(data: Any) -> List[Tuple[str, str, str]]:
     exports = data.get("Exports") if isinstance(data, dict) else None
-    if isinstance(exports, list):
-        for node in exports:
-            if isinstance(node, dict):
-                if not process_node(node):
-                    break
-            for sub in iter_nodes(node):
-                if sub is node:
-                    continue
-                if not process_node(sub):
-                    return rows
-    else:
-        for node in iter_nodes(data):
-            if isinstance(node, dict):
-                if not process_node(node):
-                    break
-    return rows
+    return buff_rows_from_nodes(iter_nodes(exports if isinstance(exports, list) else data))
+
+def collect_buffs_stream(path: str) -> List[Tuple[str, str, str]]:
+    return buff_rows_from_nodes(json_stream.iter_struct_values(path, "BuffSetting"))
 
 # ===== Skills =====
 
@@ -144,60 +139,52 @@ def extract_skill_fields(skill_node: Dict[str, Any]) -> Tuple[str, str]:
                 break
     return skill_id, name_text
 
-def collect_skills(data: Any) -> List[Tuple[str, str]]:
+def skill_rows_from_nodes(nodes: Iterable[Dict[str, Any]]) -> List[Tuple[str, str]]:
     rows: List[Tuple[str, str]] = []
     started = SKILL_ID_START is None
 
-    def process_node(node: Dict[str, Any]) -> bool:
-        nonlocal started
+    for node in nodes:
         if not is_skill_setting(node):
-            return True
+            continue
         skill_id, name_text = extract_skill_fields(node)
         if not skill_id:
-            return True
+            continue
 
         if not started and SKILL_ID_START is not None and skill_id == SKILL_ID_START:
             started = True
 
         if SKILL_ID_END is not None and skill_id == SKILL_ID_END:
-            return False  # 不包含结束ID
+            break  # 不包含结束ID
 
         if started:
             rows.append((skill_id, name_text))
-        return True
+    return rows
 
+def collect_skills(data: Any) -> List[Tuple[str, str]]:
     exports = data.get("Exports") if isinstance(data, dict) else None
-    if isinstance(exports, list):
-        for node in exports:
-            if isinstance(node, dict):
-                if not process_node(node):
-                    break
-            for sub in iter_nodes(node):
-                if sub is node:
-                    continue
-                if not process_node(sub):
-                    return rows
-    else:
-        for node in iter_nodes(data):
-            if isinstance(node, dict):
-                if not process_node(node):
-                    break
-    return rows
+    return skill_rows_from_nodes(iter_nodes(exports if isinstance(exports, list) else data))
+
+def collect_skills_stream(path: str) -> List[Tuple[str, str]]:
+    return skill_rows_from_nodes(json_stream.iter_struct_values(path, "SkillSetting"))
 
 # ================== 入口 ==================
 
 def main():
     if not os.path.isfile(buffs):
         raise FileNotFoundError(f"找不到输入文件：{buffs}")
-    with open(buffs, "r", encoding="utf-8") as f:
-        buffs_data = json.load(f)
-    buff_rows = collect_buffs(buffs_data)
+    if USE_STREAMING:
+        buff_rows = collect_buffs_stream(buffs)
+    else:
+        buffs_data = json_io.load(buffs)
+        buff_rows = collect_buffs(buffs_data)
 
     if not os.path.isfile(skills):
         raise FileNotFoundError(f"找不到输入文件：{skills}")
-    with open(skills, "r", encoding="utf-8") as f:
-        skills_data = json.load(f)
-    skill_rows = collect_skills(skills_data)
+    if USE_STREAMING:
+        skill_rows = collect_skills_stream(skills)
+    else:
+        skills_data = json_io.load(skills)
+        skill_rows = collect_skills(skills_data)
 
     out_dir = FIXED_OUTPUT_DIR if OUTPUT_TO_FIXED_DIR else os.getcwd()
     os.makedirs(out_dir, exist_ok=True)
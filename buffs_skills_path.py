@@ -3,10 +3,14 @@
 - 导出 Buffs / Skills 指定 ID 的 Blueprint 路径，格式为：ID + 基础路径 + 完整路径_C，以及Icon和大招
 - 去掉“数值闭区间模式”，仅保留“按出现顺序的起止ID”与“显式ID清单”
 - 顶部常量可直接控制：模式、各自起止ID、各自离散ID清单、输入输出路径
+- USE_STREAMING=True 时用 json_stream 流式逐条读取，碰到终结ID / 清单取完即停止读盘
 """
 
-import json, os, sys, argparse
-from typing import Any, List, Tuple, Optional, Iterable, Set, Dict
+import os, sys, argparse
+from typing import Any, List, Tuple, Optional, Iterable, Iterator, Set, Dict
+
+import json_io
+import json_stream
 
 # ====================== 顶部总开关（你改这里即可） ======================
 # 模式：0 = 同时导出 skills 与 buffs；1 = 仅 skills；2 = 仅 buffs
@@ -29,6 +33,9 @@ DEFAULT_SKILLS_JSON = r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_X
 # —— 输出控制、输出路径——
 FIXED_OUTPUT_DIR    = r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles"
 OUTPUT_TO_FIXED_DIR = True  # True: 输出到 FIXED_OUTPUT_DIR；False: 输出到脚本目录（除非命令行指定）
+
+# —— 读取方式——
+USE_STREAMING = True  # True: 流式逐条读取（内存只占一行）；False: json.load 整表后递归遍历
 # =====================================================================
 
 # ===== 常量 =====
@@ -159,100 +166,90 @@ def filter_and_dedupe(rows: List[Tuple[str, str, str]],
     all_exist = (len(out) == 0 and len(dedup_dot) > 0)
     return out, all_exist
 
-def collect_by_id_sequence(data: Any, struct_type: str, id_iter: Iterable[str]) -> List[Tuple[str, str, str]]:
-    """按显式 ID 清单（字符串）收集，输出顺序=文件出现顺序"""
+def is_target_struct(node: Any, struct_type: str) -> bool:
+    return (
+        isinstance(node, dict) and
+        node.get("$type") == STRUCT_PROP_TYPE and
+        node.get("StructType") == struct_type and
+        isinstance(node.get("Name"), str) and
+        isinstance(node.get("Value"), list)
+    )
+
+def iter_struct_nodes(data: Any, struct_type: str) -> Iterator[Dict[str, Any]]:
+    """整表已载入时：深度优先按出现顺序产出目标结构体"""
+    if isinstance(data, dict):
+        if is_target_struct(data, struct_type):
+            yield data
+        for v in data.values():
+            yield from iter_struct_nodes(v, struct_type)
+    elif isinstance(data, list):
+        for v in data:
+            yield from iter_struct_nodes(v, struct_type)
+
+def stream_struct_nodes(path: str, struct_type: str, namemap_out: Set[str]) -> Iterator[Dict[str, Any]]:
+    """流式读取：顺带把顶层 NameMap（位于 Exports 之前）收进 namemap_out，再逐条产出目标结构体"""
+    for tag, obj in json_stream.iter_structs(path, (struct_type,), top_keys=("NameMap",)):
+        if tag == "NameMap":
+            namemap_out.update(extract_namemap_set({"NameMap": obj}))
+        elif is_target_struct(obj, struct_type):
+            yield obj
+
+def append_struct_rows(rows: List[Tuple[str, str, str]], this_id: str, vals: list, struct_type: str) -> None:
+    # Blueprint 三元组
+    full_bp = find_blueprint_asset_name(vals)
+    if _valid_str(full_bp):
+        rows.append((this_id, _split_base(full_bp), full_bp))
+    # 追加图标（只导完整路径），id/base 置空
+    if struct_type == TARGET_STRUCT_BUFFS:
+        full_icon = find_soft_object_asset(vals, BUFF_ICON_FIELD)
+        if _valid_str(full_icon):
+            rows.append(("", "", full_icon))
+    if struct_type == TARGET_STRUCT_SKILLS:
+        full_ulti = find_soft_object_asset(vals, SKILL_ULTRA_FIELD)
+        if _valid_str(full_ulti):
+            rows.append(("", "", full_ulti))
+
+def collect_by_id_sequence(nodes: Iterable[Dict[str, Any]], struct_type: str, id_iter: Iterable[str]) -> List[Tuple[str, str, str]]:
+    """按显式 ID 清单（字符串）收集，输出顺序=文件出现顺序；清单取完即停止"""
     want = set(id_iter)
     rows: List[Tuple[str, str, str]] = []
-
-    def dfs(node: Any):
+    for node in nodes:
         if not want:
-            return
-        if isinstance(node, dict):
-            if (
-                node.get("$type") == STRUCT_PROP_TYPE and
-                node.get("StructType") == struct_type and
-                isinstance(node.get("Name"), str) and
-                isinstance(node.get("Value"), list)
-            ):
-                this_id = node["Name"]
-                if this_id in want:
-                    vals = node["Value"]
-                    # Blueprint 三元组
-                    full_bp = find_blueprint_asset_name(vals)
-                    if _valid_str(full_bp):
-                        rows.append((this_id, _split_base(full_bp), full_bp))
-                    # 追加图标（只导完整路径），id/base 置空
-                    if struct_type == TARGET_STRUCT_BUFFS:
-                        full_icon = find_soft_object_asset(vals, BUFF_ICON_FIELD)
-                        if _valid_str(full_icon):
-                            rows.append(("", "", full_icon))
-                    if struct_type == TARGET_STRUCT_SKILLS:
-                        full_ulti = find_soft_object_asset(vals, SKILL_ULTRA_FIELD)
-                        if _valid_str(full_ulti):
-                            rows.append(("", "", full_ulti))
-                    want.discard(this_id)
-            for v in node.values():
-                if not want: break
-                dfs(v)
-        elif isinstance(node, list):
-            for v in node:
-                if not want: break
-                dfs(v)
-
-    dfs(data)
+            break
+        this_id = node["Name"]
+        if this_id in want:
+            append_struct_rows(rows, this_id, node["Value"], struct_type)
+            want.discard(this_id)
     return rows
 
-def collect_ordered(data: Any, struct_type: str, start_id_num: Optional[int], end_id_num: Optional[int]) -> List[Tuple[str, str, str]]:
+def collect_ordered(nodes: Iterable[Dict[str, Any]], struct_type: str, start_id_num: Optional[int], end_id_num: Optional[int]) -> List[Tuple[str, str, str]]:
     """按出现顺序从 start_id 到 end_id（含）收集；二者可为 None（开头/末尾）"""
     start_id = str(start_id_num) if start_id_num is not None else None
     end_id   = str(end_id_num)   if end_id_num   is not None else None
 
     rows: List[Tuple[str, str, str]] = []
     started = (start_id is None)
-    stopped = False
-
-    def dfs(node: Any):
-        nonlocal started, stopped
-        if stopped: return
-        if isinstance(node, dict):
-            if (
-                node.get("$type") == STRUCT_PROP_TYPE and
-                node.get("StructType") == struct_type and
-                isinstance(node.get("Name"), str) and
-                isinstance(node.get("Value"), list)
-            ):
-                this_id = node["Name"]
-                if not started and start_id is not None and this_id == start_id:
-                    started = True
-                if started:
-                    vals = node["Value"]
-                    # Blueprint 三元组
-                    full_bp = find_blueprint_asset_name(vals)
-                    if _valid_str(full_bp):
-                        rows.append((this_id, _split_base(full_bp), full_bp))
-                    # 追加图标（只导完整路径），id/base 置空
-                    if struct_type == TARGET_STRUCT_BUFFS:
-                        full_icon = find_soft_object_asset(vals, BUFF_ICON_FIELD)
-                        if _valid_str(full_icon):
-                            rows.append(("", "", full_icon))
-                    if struct_type == TARGET_STRUCT_SKILLS:
-                        full_ulti = find_soft_object_asset(vals, SKILL_ULTRA_FIELD)
-                        if _valid_str(full_ulti):
-                            rows.append(("", "", full_ulti))
-                    if end_id is not None and this_id == end_id:
-                        stopped = True  # **包含**终结ID后停止
-                        return
-            for v in node.values():
-                if stopped: break
-                dfs(v)
-        elif isinstance(node, list):
-            for v in node:
-                if stopped: break
-                dfs(v)
-
-    dfs(data)
+    for node in nodes:
+        this_id = node["Name"]
+        if not started and start_id is not None and this_id == start_id:
+            started = True
+        if started:
+            append_struct_rows(rows, this_id, node["Value"], struct_type)
+            if end_id is not None and this_id == end_id:
+                break  # **包含**终结ID后停止
     return rows
 
+def load_struct_nodes(path: str, struct_type: str) -> Tuple[Set[str], Iterable[Dict[str, Any]]]:
+    """返回 (NameMap 集合, 目标结构体序列)。流式模式下集合在开始消费序列后才被填充。"""
+    if USE_STREAMING:
+        if not os.path.isfile(path):
+            print(f"找不到文件：{path}")
+            sys.exit(1)
+        namemap: Set[str] = set()
+        return namemap, stream_struct_nodes(path, struct_type, namemap)
+    data = load_json(path)
+    return extract_namemap_set(data), iter_struct_nodes(data, struct_type)
+
 def decide_out_path(default_name: str, user_out: Optional[str]) -> str:
     if user_out:
         return user_out
@@ -291,8 +288,7 @@ def load_json(path: str) -> Any:
     if not os.path.isfile(path):
         print(f"找不到文件：{path}")
         sys.exit(1)
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_io.load(path)
 
 def main():
     ap = argparse.ArgumentParser(description="导出 BuffSetting / SkillSetting 的 Blueprint 路径（ID、基础路径、完整路径_C）")
@@ -331,17 +327,16 @@ def main():
 
     # ===== Buffs =====
     if do_buffs:
-        data_buffs = load_json(args.buffs_json)
-        namemap_buffs = extract_namemap_set(data_buffs)
+        namemap_buffs, nodes_buffs = load_struct_nodes(args.buffs_json, TARGET_STRUCT_BUFFS)
 
         ids_list = parse_id_list(buffs_ids_s)
         if ids_list is not None:
-            rows_buffs = collect_by_id_sequence(data_buffs, TARGET_STRUCT_BUFFS, ids_list)
+            rows_buffs = collect_by_id_sequence(nodes_buffs, TARGET_STRUCT_BUFFS, ids_list)
             eff_start = ids_list[0] if ids_list else "NA"
             eff_end   = ids_list[-1] if ids_list else "NA"
             tip = f"Buffs：按 ID 清单匹配到 {len(rows_buffs)} 条。清单首尾=({eff_start}→{eff_end})"
         else:
-            rows_buffs = collect_ordered(data_buffs, TARGET_STRUCT_BUFFS, buffs_start, buffs_end)
+            rows_buffs = collect_ordered(nodes_buffs, TARGET_STRUCT_BUFFS, buffs_start, buffs_end)
             if rows_buffs:
                 eff_start, eff_end = rows_buffs[0][0] or "BEGIN", rows_buffs[-1][0] or "END"
             else:
@@ -365,17 +360,16 @@ def main():
 
     # ===== Skills =====
     if do_skills:
-        data_skills = load_json(args.skills_json)
-        namemap_skills = extract_namemap_set(data_skills)
+        namemap_skills, nodes_skills = load_struct_nodes(args.skills_json, TARGET_STRUCT_SKILLS)
 
         ids_list_s = parse_id_list(skills_ids_s)
         if ids_list_s is not None:
-            rows_skills = collect_by_id_sequence(data_skills, TARGET_STRUCT_SKILLS, ids_list_s)
+            rows_skills = collect_by_id_sequence(nodes_skills, TARGET_STRUCT_SKILLS, ids_list_s)
             eff_start_s = ids_list_s[0] if ids_list_s else "NA"
             eff_end_s   = ids_list_s[-1] if ids_list_s else "NA"
             tip = f"Skills：按 ID 清单匹配到 {len(rows_skills)} 条。清单首尾=({eff_start_s}→{eff_end_s})"
         else:
-            rows_skills = collect_ordered(data_skills, TARGET_STRUCT_SKILLS, skills_start, skills_end)
+            rows_skills = collect_ordered(nodes_skills, TARGET_STRUCT_SKILLS, skills_start, skills_end)
             if rows_skills:
                 eff_start_s, eff_end_s = rows_skills[0][0] or "BEGIN", rows_skills[-1][0] or "END"
             else:
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 转换任务调度器（uasset2json / json2uasset 共用）：
+   - 按文件大小从大到小下发（LPT），大文件不会拖到最后成为“掉队者”；
+   - 同时在途的任务数有上限（= 当前并发数），不再一次性提交全部 future，5 万文件时内存也保持平稳；
+   - 自动调并发：每个统计窗口比较吞吐（MB/s），吞吐上升就继续同方向调整，下降就回退并反向（爬山法）；
+     装了 psutil 时 CPU 已饱和（≥ CPU_SATURATED）则不再加并发；
+   - 吞吐持平时看尾延迟：窗口内单文件耗时按大小折算（秒/MB）取 p95，变长（> LATENCY_WORSE 倍）说明上一步多出的并发
+     只在排队（磁盘 / 转换进程争用），反向；变短则同方向继续。这样吞吐到顶后并发会往回收，而不是停在最高处。
+     按大小折算是因为大文件先发，原始耗时本来就逐窗口下降。
+2) 结束时输出吞吐汇总：文件/s、MB/s、单文件耗时 p50 / p95，以及并发调整轨迹。
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import psutil  # 可选：用于判断 CPU 是否饱和
+except ImportError:
+    psutil = None
+
+# ============== 配置 ==============
+WINDOW_SEC = 2.0        # 自动调并发的统计窗口（秒）
+STEP = 1                # 每次调整的并发步长
+IMPROVE_RATIO = 1.05    # 吞吐提升超过 5% 才算“变好”
+CPU_SATURATED = 95.0    # psutil 可用时，CPU 占用 ≥ 此值不再加并发
+LATENCY_WORSE = 1.10    # 吞吐持平时，窗口 p95（秒/MB）变化超过 10% 才算变长 / 变短
+# =================================
+
+
+def files_size(paths: Sequence[Path]) -> int:
+    """若干文件的总大小（不存在的计 0）。"""
+    total = 0
+    for p in paths:
+        try:
+            total += os.path.getsize(p)
+        except OSError:
+            pass
+    return total
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    i = min(len(sorted_vals) - 1, max(0, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[i]
+
+
+class ConvertScheduler:
+    """
+    用法：
+        sched = ConvertScheduler(start_workers=8, max_workers=16)
+        for item, result in sched.run(files, convert_one, size_of=lambda f: ...):
+            ...
+        print(sched.summary())
+    is_work(result) 返回 False 的任务（如 SKIP）不计入吞吐与耗时统计。
+    """
+
+    def __init__(self, start_workers: int = 8, min_workers: int = 1, max_workers: Optional[int] = None,
+                 autotune: bool = True):
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers or start_workers)
+        self.target = min(self.max_workers, max(self.min_workers, start_workers))
+        self.autotune = autotune
+        self.trace: List[Tuple[float, int, float, float]] = []   # (时刻, 并发, 该窗口 MB/s, 该窗口 p95 秒/MB)
+        self.latencies: List[float] = []
+        self.done_files = 0
+        self.done_bytes = 0
+        self.elapsed = 0.0
+
+    # ---------- 自动调并发（爬山法） ----------
+    def _cpu_saturated(self) -> bool:
+        if psutil is None:
+            return False
+        try:
+            return psutil.cpu_percent(interval=None) >= CPU_SATURATED
+        except Exception:
+            return False
+
+    def _retune(self, rate: float, p95: float, state: dict) -> None:
+        prev = state.get("rate")
+        prev_p95 = state.get("p95")
+        direction = state.get("dir", +1)
+        if prev is not None and rate * IMPROVE_RATIO < prev:
+            direction = -direction          # 变差：回退并反向
+        elif prev is not None and rate < prev * IMPROVE_RATIO:
+            if prev_p95 and p95 > prev_p95 * LATENCY_WORSE:
+                direction = -direction      # 吞吐持平、尾延迟变长：上一步多出的并发只在排队，反向
+            elif not (prev_p95 and p95 * LATENCY_WORSE < prev_p95):
+                state["rate"] = max(rate, prev)
+                state["p95"] = p95
+                return                      # 吞吐、尾延迟都持平：保持当前并发
+            # 吞吐持平、尾延迟变短：同方向继续
+        step = direction * STEP
+        if step > 0 and self._cpu_saturated():
+            step = 0                        # CPU 已饱和：不再加并发
+        self.target = min(self.max_workers, max(self.min_workers, self.target + step))
+        state["rate"] = rate
+        state["p95"] = p95
+        state["dir"] = direction
+
+    # ---------- 主循环 ----------
+    def run(self, items: Iterable[Any], fn: Callable[[Any], Any],
+            size_of: Callable[[Any], int] = lambda p: files_size([p]),
+            is_work: Callable[[Any], bool] = lambda r: True) -> Iterator[Tuple[Any, Any]]:
+        jobs = sorted(((size_of(it), i, it) for i, it in enumerate(items)), key=lambda t: (-t[0], t[1]))
+        t0 = time.perf_counter()
+        if psutil is not None:
+            try:
+                psutil.cpu_percent(interval=None)   # 初始化采样基准
+            except Exception:
+                pass
+
+        def timed(it):
+            s = time.perf_counter()
+            r = fn(it)
+            return r, time.perf_counter() - s
+
+        tune_state: dict = {}
+        win_start, win_bytes = t0, 0
+        win_lat: List[float] = []   # 本窗口单文件耗时（秒/MB）
+        next_job = 0
+        inflight = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            while next_job < len(jobs) or inflight:
+                while next_job < len(jobs) and len(inflight) < self.target:
+                    size, _, it = jobs[next_job]
+                    next_job += 1
+                    inflight[ex.submit(timed, it)] = (it, size)
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    it, size = inflight.pop(fut)
+                    result, dt = fut.result()
+                    if is_work(result):
+                        self.latencies.append(dt)
+                        self.done_files += 1
+                        self.done_bytes += size
+                        win_bytes += size
+                        win_lat.append(dt / max(size / 1048576, 1e-3))
+                    yield it, result
+
+                now = time.perf_counter()
+                if self.autotune and now - win_start >= WINDOW_SEC:
+                    rate = win_bytes / (now - win_start) / 1048576
+                    p95 = percentile(sorted(win_lat), 0.95)
+                    self.trace.append((now - t0, self.target, rate, p95))
+                    if win_bytes:
+                        self._retune(rate, p95, tune_state)
+                    win_start, win_bytes, win_lat = now, 0, []
+        self.elapsed = time.perf_counter() - t0
+
+    def summary(self) -> str:
+        el = self.elapsed or 1e-9
+        lat = sorted(self.latencies)
+        lines = [
+            f"吞吐：{self.done_files} 个文件 / {el:.1f}s = {self.done_files / el:.2f} 文件/s，"
+            f"{self.done_bytes / 1048576 / el:.2f} MB/s；单文件耗时 p50 {percentile(lat, 0.5) * 1000:.0f} ms，"
+            f"p95 {percentile(lat, 0.95) * 1000:.0f} ms"
+        ]
+        if self.trace:
+            path = " → ".join(str(w) for _, w, _, _ in self.trace[:20])
+            lines.append(f"并发调整（每 {WINDOW_SEC:g}s）：{path}{' …' if len(self.trace) > 20 else ''}，最终 {self.target}")
+        return "\n".join(lines)
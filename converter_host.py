@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 常驻转换进程池：启动 N 个转换器进程（UAssetDumpJson / UAssetGUI 的常驻模式），
+   通过 stdin/stdout 的 JSON Lines 协议逐个下发文件，省掉每个文件一次的 .NET 启动开销。
+2) 协议（每行一个 JSON，UTF-8）：
+   请求  {"id": 1, "args": ["D:/x/GE_A.uasset", "--usmap", "D:/Mappings.usmap"]}
+   响应  {"id": 1, "code": 0, "stdout": "...", "stderr": "..."}
+   args 与单次命令行参数完全相同（不含可执行文件本身）；code/stdout/stderr 对应单次运行的结果。
+   常驻模式下转换器自身的日志只能写 stderr 或放进响应字段，stdout 只能输出协议行。
+3) run(args) 返回 subprocess.CompletedProcess，调用方（uasset2json / json2uasset）的
+   成功判定、usmap 失败回退、错误日志逻辑保持不变。
+4) 某个进程崩溃/协议错乱/超过 CALL_TIMEOUT 没有响应时，本次返回 code=-1（含原因），结束并重启该进程；
+   重启失败（如可执行文件已不在）时该进程标记为不可用，之后分到它的请求直接返回 code=-1，不会抛异常。
+5) converter_stub.py 实现了同一协议（也支持单次命令行），可在 Linux 上测试：
+   EXE 指向 converter_stub.py 即可（.py 会自动用当前 Python 启动）。
+"""
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+# ============== 配置 ==============
+SERVE_ARGS = ["--serve"]   # 让转换器进入常驻模式的参数
+CALL_TIMEOUT = 300.0       # 单个文件等待响应的秒数（None=不限）；超时视为卡死，结束并重启该进程
+# =================================
+
+
+def base_command(exe: Path) -> List[str]:
+    """可执行文件 → 命令前缀；.py（如 converter_stub.py）用当前解释器启动。"""
+    exe = Path(exe)
+    if exe.suffix.lower() == ".py":
+        return [sys.executable, str(exe)]
+    return [str(exe)]
+
+
+def _read_lines(stream, lines: "queue.Queue[Optional[str]]") -> None:
+    """读线程：把转换器 stdout 的每一行放进队列；EOF（进程退出或被结束）时放入 None。"""
+    try:
+        for line in stream:
+            lines.put(line)
+    except (OSError, ValueError):
+        pass
+    lines.put(None)
+
+
+class _Worker:
+    def __init__(self, cmd: List[str], timeout: Optional[float] = CALL_TIMEOUT):
+        self.cmd = cmd
+        self.timeout = timeout
+        self.proc: Optional[subprocess.Popen] = None
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.dead = ""   # 非空：重启失败的原因，之后的请求直接按失败返回
+        self.seq = 0
+        self.start()
+
+    def start(self) -> None:
+        # stderr 直通控制台，避免管道写满导致死锁
+        self.proc = subprocess.Popen(
+            self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=None,
+            encoding="utf-8", errors="replace", bufsize=1,
+        )
+        # 每个进程一个读线程和一个新队列：旧进程残留的行不会串到新进程的响应里
+        self.lines = queue.Queue()
+        threading.Thread(target=_read_lines, args=(self.proc.stdout, self.lines), daemon=True).start()
+
+    def stop(self, kill: bool = False) -> None:
+        p, self.proc = self.proc, None
+        if p is None:
+            return
+        if not kill:
+            try:
+                p.stdin.close()
+            except Exception:
+                pass
+            try:
+                p.wait(timeout=5)
+                return
+            except Exception:
+                pass
+        p.kill()
+        try:
+            p.wait(timeout=5)
+        except Exception:
+            pass
+
+    def _restart(self, hung: bool) -> None:
+        self.stop(kill=hung)
+        try:
+            self.start()
+        except Exception as e:
+            self.proc = None
+            self.dead = f"{type(e).__name__}: {e}"
+
+    def _read_response(self) -> str:
+        try:
+            line = self.lines.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"{self.timeout:g}s 内没有响应") from None
+        if line is None:
+            raise RuntimeError(f"转换进程已退出 (code={self.proc.poll()})")
+        return line
+
+    def call(self, args: Sequence[str]) -> subprocess.CompletedProcess:
+        if self.dead:
+            return subprocess.CompletedProcess(list(args), -1, "", f"HOST: 转换进程无法重启（{self.dead}）")
+        self.seq += 1
+        req = json.dumps({"id": self.seq, "args": [str(a) for a in args]}, ensure_ascii=False)
+        try:
+            self.proc.stdin.write(req + "\n")
+            self.proc.stdin.flush()
+            resp = json.loads(self._read_response())
+            if resp.get("id") != self.seq:
+                raise RuntimeError(f"响应序号不匹配：期望 {self.seq}，收到 {resp.get('id')}")
+        except Exception as e:
+            # 进程状态未知：重启（卡死则直接结束），本次按失败返回，交给调用方的回退逻辑
+            self._restart(hung=isinstance(e, TimeoutError))
+            return subprocess.CompletedProcess(list(args), -1, "", f"HOST: {type(e).__name__}: {e}")
+        return subprocess.CompletedProcess(
+            list(args), int(resp.get("code", -1)), resp.get("stdout") or "", resp.get("stderr") or "")
+
+
+class ConverterHost:
+    """
+    N 个常驻转换进程；run() 线程安全，可直接在 ThreadPoolExecutor 的任务里调用。
+    用法：
+        with ConverterHost(EXE, 8) as host:
+            proc = host.run([str(uasset), "--usmap", str(usmap)])
+    """
+
+    def __init__(self, exe: Path, workers: int, serve_args: Sequence[str] = SERVE_ARGS,
+                 timeout: Optional[float] = CALL_TIMEOUT):
+        cmd = base_command(exe) + list(serve_args)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._all: List[_Worker] = []
+        self._lock = threading.Lock()
+        self.calls = 0
+        for _ in range(max(1, workers)):
+            w = _Worker(cmd, timeout)
+            self._all.append(w)
+            self._idle.put(w)
+
+    def run(self, args: Sequence[str]) -> subprocess.CompletedProcess:
+        w = self._idle.get()
+        try:
+            return w.call(args)
+        finally:
+            with self._lock:
+                self.calls += 1
+            self._idle.put(w)
+
+    def close(self) -> None:
+        for w in self._all:
+            w.stop()
+
+    def __enter__(self) -> "ConverterHost":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
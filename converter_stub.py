@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+模拟 UAssetDumpJson / UAssetGUI 的替身转换器，用于在没有 .NET 工具的环境（如 Linux）测试
+uasset2json / json2uasset / converter_host。
+- 单次模式（与真实工具命令行一致）：
+    python converter_stub.py <x.uasset> [--usmap <Mappings.usmap>]   → 写出 x.json
+    python converter_stub.py fromjson <x.json> <out.uasset>          → 写出 out.uasset + out.uexp
+- 常驻模式：python converter_stub.py --serve，按 converter_host 的 JSON Lines 协议逐行处理。
+- 故障注入：源文件内容包含 FAIL_USMAP 时带 usmap 转换失败（测试回退），包含 FAIL_ALL 时总是失败，
+  包含 CRASH 时常驻进程直接退出（测试自动重启），包含 HANG 时一直不返回（测试超时）。
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+
+def convert(args: List[str]) -> Tuple[int, str, str]:
+    """执行一次转换；返回 (code, stdout, stderr)。"""
+    if len(args) >= 3 and args[0] == "fromjson":
+        src, dst = Path(args[1]), Path(args[2])
+        if not src.exists():
+            return 2, "", f"not found: {src}"
+        raw = src.read_bytes()
+        if b"FAIL_ALL" in raw:
+            return 1, "", f"cannot rebuild {src}"
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_bytes(b"STUB-UASSET\n" + raw[:64])
+        dst.with_suffix(".uexp").write_bytes(raw)
+        return 0, f"wrote {dst}", ""
+
+    if not args:
+        return 2, "", "usage: <x.uasset> [--usmap <path>] | fromjson <x.json> <out>"
+    src = Path(args[0])
+    use_usmap = "--usmap" in args
+    if not src.exists():
+        return 2, "", f"not found: {src}"
+    raw = src.read_bytes()
+    if b"CRASH" in raw:
+        sys.exit(3)
+    if b"HANG" in raw:
+        while True:
+            time.sleep(60)
+    if b"FAIL_ALL" in raw or (use_usmap and b"FAIL_USMAP" in raw):
+        return 1, "", f"parse failed ({'usmap' if use_usmap else 'no-usmap'}): {src}"
+    uexp = src.with_suffix(".uexp")
+    doc = {
+        "Info": "converter_stub",
+        "Source": src.name,
+        "Usmap": use_usmap,
+        "Size": len(raw) + (uexp.stat().st_size if uexp.exists() else 0),
+    }
+    src.with_suffix(".json").write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0, f"dumped {src}", ""
+
+
+def serve() -> None:
+    sys.stdin.reconfigure(encoding="utf-8")
+    sys.stdout.reconfigure(encoding="utf-8")
+    out = sys.stdout
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        req = json.loads(line)
+        try:
+            code, so, se = convert(req.get("args") or [])
+        except SystemExit:
+            raise
+        except Exception as e:
+            code, so, se = 1, "", f"{type(e).__name__}: {e}"
+        out.write(json.dumps({"id": req.get("id"), "code": code, "stdout": so, "stderr": se},
+                             ensure_ascii=False) + "\n")
+        out.flush()
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    if args[:1] == ["--serve"]:
+        serve()
+        return
+    code, so, se = convert(args)
+    if so:
+        print(so)
+    if se:
+        print(se, file=sys.stderr)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
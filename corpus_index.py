@@ -0,0 +1,512 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 为 Skills / Core 等目录下的 UAssetAPI JSON 建立持久化“语料索引”（SQLite 单文件）。
+2) 以 路径 + 大小 + mtime 作为文件签名；刷新时只重新解析新增/变更的文件，并删除已不存在文件的记录。
+3) 每个文件只解析一次，记录：
+   - Export 的 ObjectName（带 export 序号，1 基）
+   - Import 的 ObjectName（带负索引）及 Import 原始对象
+   - NameMap 字符串
+   - SkillId / Id 数值（带所在 export 序号）
+   - BuffId / BuffIds 倒排表：buff_id -> (文件, export 序号, JSON 路径)，供 find_buffid 批量查询
+   - Tag（JH.Ability.*）与触发器（EAbilitySystemEventType::*），区分来自 Exports.Data 还是 NameMap
+4) search_funcNtagNtrigger / find_buffid / namemap_all_exporter / fuc_main2minor / search_GA_GE_path_C
+   打开 USE_CORPUS_INDEX 后直接从索引查询，不再逐个 json.load 全量解析。
+5) 直接运行本脚本：刷新 INDEX_ROOTS 下的索引并打印统计。
+"""
+
+import os
+import json
+import sqlite3
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import json_io
+
+# ============== 配置（按需修改） ==============
+# 索引文件位置（所有脚本共用同一份）
+INDEX_PATH = Path(r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles\corpus_index.sqlite")
+
+# 直接运行本脚本时要刷新的根目录
+INDEX_ROOTS = [
+    Path(r"D:\Unreal_tools\original_files\Wandering_Sword\Content\JH\Skills"),
+    Path(r"D:\Unreal_tools\original_files\Wandering_Sword\Content\JH\Core"),
+    Path(r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_XTZH\Wandering_Sword\Content\JH\Skills"),
+    Path(r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_1\Wandering_Sword\Content\JH\Skills"),
+]
+
+# 解析线程数
+MAX_WORKERS = min(32, (os.cpu_count() or 4) * 2)
+
+# 索引结构版本：结构变化时递增，旧索引会被自动清空重建
+SCHEMA_VERSION = 2
+# ===========================================
+
+# 记录种类
+K_EXPORT   = "export"     # Export.ObjectName，export_no = 1 基序号
+K_IMPORT   = "import"     # Import.ObjectName，export_no = 负索引（-1, -2, ...）
+K_NAMEMAP  = "namemap"    # NameMap 字符串，export_no = 0
+K_SKILLID  = "skillid"    # SkillId 整数（按深度优先出现顺序）
+K_ID       = "id"         # Name=="Id" 的整数（按深度优先出现顺序）
+K_ID_MAIN  = "id_main"    # Exports[2].Data 顶层 Name=="Id" 的整数（GE 的主 Id）
+K_TAG      = "tag"        # JH.Ability.*，export_no = 所在 export；来自 NameMap 时为 0
+K_DETECTOR = "detector"   # EAbilitySystemEventType::*，同上
+
+TAG_PREFIX = "JH.Ability."
+DETECTOR_PREFIX = "EAbilitySystemEventType::"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta(
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files(
+    id    INTEGER PRIMARY KEY,
+    path  TEXT UNIQUE NOT NULL,
+    size  INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    ok    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries(
+    file_id   INTEGER NOT NULL,
+    kind      TEXT NOT NULL,
+    value,
+    export_no INTEGER NOT NULL,
+    seq       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_kind_value ON entries(kind, value);
+CREATE INDEX IF NOT EXISTS ix_entries_file ON entries(file_id);
+CREATE TABLE IF NOT EXISTS imports(
+    file_id   INTEGER NOT NULL,
+    import_no INTEGER NOT NULL,
+    name      TEXT,
+    body      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_imports_file ON imports(file_id);
+CREATE TABLE IF NOT EXISTS buff_refs(
+    file_id   INTEGER NOT NULL,
+    buff_id   INTEGER NOT NULL,
+    export_no INTEGER NOT NULL,
+    json_path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_buff_refs_id ON buff_refs(buff_id);
+CREATE INDEX IF NOT EXISTS ix_buff_refs_file ON buff_refs(file_id);
+"""
+
+# (entries, imports, buff_refs)
+Record = Tuple[List[Tuple[str, Any, int]],
+               List[Tuple[int, Optional[str], str]],
+               List[Tuple[int, int, str]]]
+
+# ======================= 路径 / 签名 ==========================
+def norm_path(p) -> str:
+    return os.path.normpath(os.path.abspath(str(p)))
+
+def file_signature(path: str) -> Optional[Tuple[int, float]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+def iter_json_files(roots: Iterable[Path]) -> List[str]:
+    """递归列出所有 .json（去重，保持遇到顺序）。"""
+    seen: Set[str] = set()
+    out: List[str] = []
+    for root in roots:
+        if not root or not os.path.isdir(root):
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            for fn in filenames:
+                if fn.lower().endswith(".json"):
+                    fp = norm_path(os.path.join(dirpath, fn))
+                    if fp not in seen:
+                        seen.add(fp)
+                        out.append(fp)
+    return out
+
+# ======================= 单文件提取 ==========================
+def load_json_loose(path: str) -> Any:
+    return json_io.load_loose(path)
+
+def _top_list(data: dict, names: Sequence[str]) -> List[Any]:
+    """按大小写不敏感的键名取顶层列表。"""
+    for k in data.keys():
+        if isinstance(k, str) and k.lower() in names:
+            v = data[k]
+            if isinstance(v, list):
+                return v
+    return []
+
+def _is_int(v: Any) -> bool:
+    return isinstance(v, int) and not isinstance(v, bool)
+
+def _gather_strings(node: Any, out: List[str]) -> None:
+    if isinstance(node, str):
+        out.append(node)
+    elif isinstance(node, dict):
+        for v in node.values():
+            _gather_strings(v, out)
+    elif isinstance(node, list):
+        for v in node:
+            _gather_strings(v, out)
+
+def _fmt_path(path: List[str]) -> str:
+    return "$" + "".join(path)
+
+def _scan_ids(node: Any, export_no: int, path: List[str],
+              out: List[Tuple[str, Any, int]], refs: List[Tuple[int, int, str]]) -> None:
+    """
+    一次深度优先遍历，按出现顺序记录：
+      - BuffId：{"Name":"BuffId","Value":int} / {"BuffId":int}              -> refs
+      - BuffIds：{"Name":"BuffIds","Value":[{"Value":int}|int]} / {"BuffIds":[...]} -> refs
+      - SkillId：{"Name":"SkillId","Value":int} / {"SkillId":int}           -> out
+      - Id：{"Name":"Id","Value":int}                                       -> out
+    path 为当前节点的 JSON 路径片段栈（只在命中时拼接）。
+    """
+    if isinstance(node, dict):
+        name = node.get("Name")
+        val = node.get("Value")
+        lname = name.lower() if isinstance(name, str) else ""
+        if lname == "buffid":
+            if _is_int(val):
+                refs.append((val, export_no, _fmt_path(path)))
+        elif "BuffId" in node and _is_int(node["BuffId"]):
+            refs.append((node["BuffId"], export_no, _fmt_path(path) + ".BuffId"))
+        if lname == "buffids":
+            arr, key = val, "Value"
+        else:
+            arr, key = node.get("BuffIds"), "BuffIds"
+        if isinstance(arr, list):
+            for j, it in enumerate(arr):
+                v = it.get("Value") if isinstance(it, dict) else it
+                if _is_int(v):
+                    refs.append((v, export_no, f"{_fmt_path(path)}.{key}[{j}]"))
+        if name == "SkillId" and _is_int(val):
+            out.append((K_SKILLID, val, export_no))
+        if "SkillId" in node and _is_int(node["SkillId"]):
+            out.append((K_SKILLID, node["SkillId"], export_no))
+        if name == "Id" and _is_int(val):
+            out.append((K_ID, val, export_no))
+        for k, v in node.items():
+            if isinstance(v, (dict, list)):
+                path.append(f".{k}")
+                _scan_ids(v, export_no, path, out, refs)
+                path.pop()
+    elif isinstance(node, list):
+        for j, v in enumerate(node):
+            if isinstance(v, (dict, list)):
+                path.append(f"[{j}]")
+                _scan_ids(v, export_no, path, out, refs)
+                path.pop()
+
+def _tag_kind(s: str) -> Optional[str]:
+    if s.startswith(TAG_PREFIX):
+        return K_TAG
+    if s.startswith(DETECTOR_PREFIX):
+        return K_DETECTOR
+    return None
+
+def extract_record(data: Any) -> Record:
+    """从已解析的 JSON 中提取索引记录：(entries, imports, buff_refs)。"""
+    entries: List[Tuple[str, Any, int]] = []
+    imports: List[Tuple[int, Optional[str], str]] = []
+    refs: List[Tuple[int, int, str]] = []
+    if not isinstance(data, dict):
+        _scan_ids(data, 0, [], entries, refs)
+        return entries, imports, refs
+
+    # NameMap（字符串或 {Name/Value/String/Text}）
+    nm_seen: Set[str] = set()
+    for item in _top_list(data, ("namemap",)):
+        s = None
+        if isinstance(item, str):
+            s = item
+        elif isinstance(item, dict):
+            s = item.get("Name") or item.get("Value") or item.get("String") or item.get("Text")
+        if isinstance(s, str) and s not in nm_seen:
+            nm_seen.add(s)
+            entries.append((K_NAMEMAP, s, 0))
+            kind = _tag_kind(s)
+            if kind:
+                entries.append((kind, s, 0))
+
+    # Imports
+    for i, imp in enumerate(_top_list(data, ("imports", "import"))):
+        if not isinstance(imp, dict):
+            continue
+        on = imp.get("ObjectName")
+        if isinstance(on, str) and on:
+            entries.append((K_IMPORT, on, -(i + 1)))
+        imports.append((-(i + 1), on if isinstance(on, str) else None,
+                        json.dumps(imp, ensure_ascii=False)))
+
+    # Exports：ObjectName、Data 中的 Tag/触发器、Id 类数值
+    exports = _top_list(data, ("exports", "export"))
+    for i, exp in enumerate(exports):
+        export_no = i + 1
+        if not isinstance(exp, dict):
+            continue
+        on = exp.get("ObjectName")
+        if isinstance(on, str) and on:
+            entries.append((K_EXPORT, on, export_no))
+
+        data_list = exp.get("Data")
+        if isinstance(data_list, list):
+            pool: List[str] = []
+            for prop in data_list:
+                if isinstance(prop, dict):
+                    for key in ("Name", "Value", "String", "Text"):
+                        _gather_strings(prop.get(key), pool)
+                elif isinstance(prop, str):
+                    pool.append(prop)
+            for s in sorted(set(pool)):
+                kind = _tag_kind(s)
+                if kind:
+                    entries.append((kind, s, export_no))
+            if i == 2:
+                for item in data_list:
+                    if isinstance(item, dict) and item.get("Name") == "Id":
+                        if _is_int(item.get("Value")):
+                            entries.append((K_ID_MAIN, item["Value"], export_no))
+                        break
+
+    # 深度优先顺序与原脚本一致：按顶层键顺序遍历，Exports 内记录 export 序号
+    for k, v in data.items():
+        if not isinstance(v, (dict, list)):
+            continue
+        if v is exports:
+            for i, exp in enumerate(exports):
+                _scan_ids(exp, i + 1, [f".{k}[{i}]"], entries, refs)
+        else:
+            _scan_ids(v, 0, [f".{k}"], entries, refs)
+    return entries, imports, refs
+
+def parse_file(path: str) -> Optional[Record]:
+    data = load_json_loose(path)
+    if data is None:
+        return None
+    return extract_record(data)
+
+# ======================= 索引读写 ==========================
+def open_index(path: Path = INDEX_PATH) -> sqlite3.Connection:
+    """打开（必要时创建）索引；结构版本不符时清空重建。"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    row = conn.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()
+    if row is None or row[0] != str(SCHEMA_VERSION):
+        with conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM imports")
+            conn.execute("DELETE FROM buff_refs")
+            conn.execute("DELETE FROM files")
+            conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('schema_version', ?)",
+                         (str(SCHEMA_VERSION),))
+    return conn
+
+def _paths_under(conn: sqlite3.Connection, root: str) -> Dict[str, Tuple[int, int, float]]:
+    """索引中位于 root 下的文件：path -> (id, size, mtime)。"""
+    prefix = root.rstrip("\\/") + os.sep
+    rows = conn.execute(
+        "SELECT path, id, size, mtime FROM files WHERE substr(path, 1, ?) = ?",
+        (len(prefix), prefix),
+    )
+    return {p: (fid, size, mtime) for p, fid, size, mtime in rows}
+
+def _store(conn: sqlite3.Connection, path: str, sig: Tuple[int, float], rec: Optional[Record]) -> None:
+    row = conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+    if row is not None:
+        fid = row[0]
+        conn.execute("DELETE FROM entries WHERE file_id = ?", (fid,))
+        conn.execute("DELETE FROM imports WHERE file_id = ?", (fid,))
+        conn.execute("DELETE FROM buff_refs WHERE file_id = ?", (fid,))
+        conn.execute("UPDATE files SET size = ?, mtime = ?, ok = ? WHERE id = ?",
+                     (sig[0], sig[1], int(rec is not None), fid))
+    else:
+        cur = conn.execute("INSERT INTO files(path, size, mtime, ok) VALUES(?, ?, ?, ?)",
+                           (path, sig[0], sig[1], int(rec is not None)))
+        fid = cur.lastrowid
+    if rec is None:
+        return
+    entries, imports, refs = rec
+    conn.executemany(
+        "INSERT INTO entries(file_id, kind, value, export_no, seq) VALUES(?, ?, ?, ?, ?)",
+        ((fid, kind, value, export_no, seq) for seq, (kind, value, export_no) in enumerate(entries)),
+    )
+    conn.executemany(
+        "INSERT INTO imports(file_id, import_no, name, body) VALUES(?, ?, ?, ?)",
+        ((fid, no, name, body) for no, name, body in imports),
+    )
+    conn.executemany(
+        "INSERT INTO buff_refs(file_id, buff_id, export_no, json_path) VALUES(?, ?, ?, ?)",
+        ((fid, buff_id, export_no, jp) for buff_id, export_no, jp in refs),
+    )
+
+def _delete_paths(conn: sqlite3.Connection, ids: Iterable[int]) -> None:
+    for fid in ids:
+        conn.execute("DELETE FROM entries WHERE file_id = ?", (fid,))
+        conn.execute("DELETE FROM imports WHERE file_id = ?", (fid,))
+        conn.execute("DELETE FROM buff_refs WHERE file_id = ?", (fid,))
+        conn.execute("DELETE FROM files WHERE id = ?", (fid,))
+
+def refresh(conn: sqlite3.Connection,
+            roots: Iterable[Path],
+            file_filter: Optional[Callable[[str], bool]] = None,
+            *,
+            max_workers: Optional[int] = None,
+            verbose: bool = True) -> List[str]:
+    """
+    增量刷新 roots 下的索引，返回满足 file_filter(文件名) 的文件路径（遇到顺序）。
+    - 新增/签名变化的文件重新解析；
+    - 索引中存在但磁盘上已删除的文件，清除其记录。
+    """
+    t0 = time.perf_counter()
+    roots = [Path(r) for r in roots if r]
+    all_files = iter_json_files(roots)
+    wanted = [fp for fp in all_files if file_filter is None or file_filter(os.path.basename(fp))]
+
+    known: Dict[str, Tuple[int, int, float]] = {}
+    for r in roots:
+        known.update(_paths_under(conn, norm_path(r)))
+
+    present = set(all_files)
+    gone = [fid for p, (fid, _, _) in known.items() if p not in present]
+
+    stale: List[Tuple[str, Tuple[int, float]]] = []
+    for fp in wanted:
+        sig = file_signature(fp)
+        if sig is None:
+            continue
+        old = known.get(fp)
+        if old is None or old[1] != sig[0] or old[2] != sig[1]:
+            stale.append((fp, sig))
+
+    parsed: Dict[str, Optional[Record]] = {}
+    if stale:
+        with ThreadPoolExecutor(max_workers=max_workers or MAX_WORKERS) as ex:
+            futs = {ex.submit(parse_file, fp): fp for fp, _ in stale}
+            for fut in as_completed(futs):
+                try:
+                    parsed[futs[fut]] = fut.result()
+                except Exception:
+                    parsed[futs[fut]] = None
+
+    with conn:
+        _delete_paths(conn, gone)
+        for fp, sig in stale:
+            _store(conn, fp, sig, parsed.get(fp))
+
+    if verbose:
+        dt = time.perf_counter() - t0
+        print(f"[索引] {len(wanted)} 个文件；重新解析 {len(stale)}，移除 {len(gone)}，用时 {dt:.2f}s")
+    return wanted
+
+# ======================= 查询 ==========================
+def _chunks(seq: Sequence[Any], n: int = 900):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+def file_ids(conn: sqlite3.Connection, paths: Sequence[str]) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for chunk in _chunks(list(paths)):
+        q = "SELECT path, id FROM files WHERE path IN (%s)" % ",".join("?" * len(chunk))
+        out.update(conn.execute(q, chunk).fetchall())
+    return out
+
+def query_values(conn: sqlite3.Connection,
+                 paths: Sequence[str],
+                 kinds: Sequence[str]) -> Dict[str, List[Tuple[str, Any, int]]]:
+    """
+    返回 path -> [(kind, value, export_no), ...]（按文件内出现顺序）。
+    未解析成功的文件不出现在结果中。
+    """
+    ids = file_ids(conn, paths)
+    by_id = {fid: p for p, fid in ids.items()}
+    out: Dict[str, List[Tuple[str, Any, int]]] = {}
+    kinds = list(kinds)
+    kq = ",".join("?" * len(kinds))
+    for chunk in _chunks(list(by_id.keys()), 900 - len(kinds)):
+        q = ("SELECT file_id, kind, value, export_no FROM entries "
+             "WHERE file_id IN (%s) AND kind IN (%s) ORDER BY file_id, seq") % (",".join("?" * len(chunk)), kq)
+        for fid, kind, value, export_no in conn.execute(q, list(chunk) + kinds):
+            out.setdefault(by_id[fid], []).append((kind, value, export_no))
+    ok_rows = []
+    for chunk in _chunks(list(by_id.keys())):
+        q = "SELECT id FROM files WHERE ok = 1 AND id IN (%s)" % ",".join("?" * len(chunk))
+        ok_rows.extend(r[0] for r in conn.execute(q, chunk))
+    for fid in ok_rows:
+        out.setdefault(by_id[fid], [])
+    return out
+
+def files_with_value(conn: sqlite3.Connection, kind: str, value: Any,
+                     paths: Optional[Sequence[str]] = None) -> List[str]:
+    """含有 (kind, value) 的文件；给定 paths 时只在其中查找。"""
+    rows = conn.execute(
+        "SELECT DISTINCT f.path FROM entries e JOIN files f ON f.id = e.file_id "
+        "WHERE e.kind = ? AND e.value = ?",
+        (kind, value),
+    )
+    hits = [r[0] for r in rows]
+    if paths is not None:
+        allow = set(paths)
+        hits = [p for p in hits if p in allow]
+    return sorted(hits)
+
+def query_buff_refs(conn: sqlite3.Connection, buff_ids: Iterable[int],
+                    paths: Optional[Sequence[str]] = None) -> Dict[int, List[Tuple[str, int, str]]]:
+    """
+    BuffId 倒排查询：buff_id -> [(path, export_no, json_path), ...]（按路径、export 排序）。
+    给定 paths 时只保留其中的文件。
+    """
+    ids = sorted({int(b) for b in buff_ids})
+    allow = set(paths) if paths is not None else None
+    out: Dict[int, List[Tuple[str, int, str]]] = {b: [] for b in ids}
+    for chunk in _chunks(ids):
+        q = ("SELECT r.buff_id, f.path, r.export_no, r.json_path FROM buff_refs r "
+             "JOIN files f ON f.id = r.file_id WHERE r.buff_id IN (%s)") % ",".join("?" * len(chunk))
+        for buff_id, path, export_no, jp in conn.execute(q, chunk):
+            if allow is None or path in allow:
+                out[buff_id].append((path, export_no, jp))
+    for hits in out.values():
+        hits.sort()
+    return out
+
+def load_imports(conn: sqlite3.Connection, paths: Sequence[str]) -> Dict[str, List[dict]]:
+    """path -> 该文件 Imports 原始对象列表（原顺序）。"""
+    ids = file_ids(conn, paths)
+    by_id = {fid: p for p, fid in ids.items()}
+    out: Dict[str, List[dict]] = {}
+    for chunk in _chunks(list(by_id.keys())):
+        q = ("SELECT file_id, body FROM imports WHERE file_id IN (%s) "
+             "ORDER BY file_id, import_no DESC") % ",".join("?" * len(chunk))
+        for fid, body in conn.execute(q, chunk):
+            try:
+                out.setdefault(by_id[fid], []).append(json.loads(body))
+            except ValueError:
+                continue
+    return out
+
+# =========================== 主流程 ============================
+def main():
+    conn = open_index(INDEX_PATH)
+    try:
+        files = refresh(conn, INDEX_ROOTS)
+        n_entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        n_bad = conn.execute("SELECT COUNT(*) FROM files WHERE ok = 0").fetchone()[0]
+        print(f"[完成] 索引：{INDEX_PATH}")
+        print(f"  文件 {len(files)} 个；记录 {n_entries} 条；解析失败 {n_bad} 个")
+        for kind, cnt in conn.execute("SELECT kind, COUNT(*) FROM entries GROUP BY kind ORDER BY kind"):
+            print(f"  {kind:<9} {cnt}")
+        n_refs = conn.execute("SELECT COUNT(*) FROM buff_refs").fetchone()[0]
+        print(f"  {'buff_refs':<9} {n_refs}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
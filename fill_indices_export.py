@@ -16,11 +16,25 @@
 6) 终态修正：
     a) 同时在 JHExtendSettings 且被三类之一引用：确保 SBS/CBC 包含 [2]（追加，不清空），Outindex = 2
     b) 仅在 JHExtendSettings 出现、未被三类之一引用：SBS/CBC 直接置为 [2] ，Outindex = 2；UIData项独立处理。
+7) 每个文件只遍历一次 Exports（RefSites）：定位 JHExtendSettings / 三类结构 / BuffIds / UIData 的全部数组与引用位，
+   Name 重排、平移、收集、依赖图与回写都在这张表上进行，不再各阶段各自重走 Data。
+   引用关系用 CSR（array 存的偏移 + 邻接）一次建好：引用者 → 被引用者、被引用者 → 引用者（按 export 序号升序，天然去重）；
+   逐项明细（修改引用者 / 回填 / 终态修正块）只在报告开启（PRINT_DETAILS 或 WRITE_FULL_REPORT）时生成，
+   关闭时 process 只做回写并给出汇总计数。
+8) 平移先把位点展开成查表（ShiftRemap：差分累加得到 0..最大位点 的新值，更大的值统一加偏移），
+   再在引用位表上一遍查表改写；
+   SHIFT_PLAN / SHIFT_PLAN_JSON 可给多个文件各自指定位点，配合目录并行一次批量平移。
+9) 目录模式并行（PARALLEL）：文件在进程池（scan_pool）中处理，每个文件的告警、计数独立（不用模块级全局变量），
+   报告按完成顺序写入同一个 batch_report_时间.txt，控制台只打印汇总表（重排 / 平移 / 回填 / 弃用 / 警告 / 用时）。
 """
 
-import json, os, bisect, datetime
-from typing import Any, Dict, List, Set, DefaultDict, Tuple, Optional
-from collections import defaultdict
+import os, datetime, time
+from array import array
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple, Optional
+
+import json_io
+import scan_pool
 
 # ======== 路径与输出策略 ========
 INPUT_JSON = r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_XTZH\Wandering_Sword\Content\JH\Skills\JH_D_ZhiRen\JH_D_ZhiRen3\GE_ZhiRen3_BD.json"
@@ -46,25 +60,30 @@ ENABLE_SHIFT = True                 # True 开启平移；False 按原逻辑执
 # 正数 p 表示“在第 p 块前插入一块”；负数 -p 表示“删除第 p 块”
 # 例：在 1、5、7 前插入且删除第 3 块 -> [1, 5, 7, -3]
 SHIFT_POSITIONS: List[int] = []
+# 多文件平移计划：{"绝对路径或文件名": [位点...]}，非空时只平移计划中的文件（各用各的位点），SHIFT_POSITIONS 不再生效
+# 例：{"GE_ZhiRen3_BD.json": [5], r"D:\...\GE_ZhiRen3_1.json": [5, -9]}
+SHIFT_PLAN: Dict[str, List[int]] = {}
+SHIFT_PLAN_JSON = ""                # 计划也可写在 JSON 文件里（同上格式），与 SHIFT_PLAN 合并；留空不读
 # =====================================================
 
 # ======== 报告控制 ========
 WRITE_FULL_REPORT = False   # 新增：True 时自动写完整报告 TXT；False 时仅控制台预览前 5 条，不再询问 input()
+PRINT_DETAILS = True        # True 时控制台打印逐项明细；与 WRITE_FULL_REPORT 都为 False 时不生成明细字符串（批处理更快）
 # ==========================
 
-REF_ARRAY_NAMES = {"ExecutionPhases", "If_Req", "Then_Act", "Else_Act", "Requirements"}
+# ======== 并行批处理（目录模式） ========
+PARALLEL = True         # SCAN_RECURSIVE=True 且文件数 > 1 时用进程池并行；False 按原逻辑逐个处理并打印完整报告
+MAX_PROCESSES = 0       # 并行进程数；0/None = CPU 核数
+BATCH_REPORT = True     # 并行时各文件完整报告写入 OUTPUT_DIR 下同一个 batch_report_时间.txt；False 不生成明细（最快）
+# ======================================
 
-# 全局警告收集
-WARNINGS: List[str] = []
+REF_ARRAY_NAMES = {"ExecutionPhases", "If_Req", "Then_Act", "Else_Act", "Requirements"}
 
 def load_json(path: str) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_io.load(path)
 
 def dump_json(obj: Dict[str, Any], path: str) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
+    json_io.dump(obj, path)
 
 def _has_allowed_prefix(path: str) -> bool:
     if not FILENAME_PREFIXES:
@@ -76,12 +95,15 @@ def _has_allowed_prefix(path: str) -> bool:
         lower = name.lower()
         return any(lower.startswith(p.lower()) for p in FILENAME_PREFIXES)
 
-def _gather_input_files(file_path: str, dir_paths: List[str], recursive: bool) -> List[str]:
+def _gather_input_files(file_path: str, dir_paths: List[str], recursive: bool,
+                        warnings: Optional[List[str]] = None) -> List[str]:
     """
     新语义：
       - recursive == False -> 仅处理 file_path（必须为 .json 且满足前缀）
       - recursive == True  -> 忽略 file_path，递归处理 dir_paths 中的所有目录（.json 且满足前缀）
     """
+    if warnings is None:
+        warnings = []
     out: List[str] = []
     seen = set()
 
@@ -91,19 +113,19 @@ def _gather_input_files(file_path: str, dir_paths: List[str], recursive: bool) -
             if _has_allowed_prefix(file_path):
                 out.append(file_path)
             else:
-                WARNINGS.append(f"[过滤] 文件名不匹配前缀 {FILENAME_PREFIXES}: {file_path}")
+                warnings.append(f"[过滤] 文件名不匹配前缀 {FILENAME_PREFIXES}: {file_path}")
         else:
-            WARNINGS.append(f"[输入] 单文件无效或不是 .json：{file_path}")
+            warnings.append(f"[输入] 单文件无效或不是 .json：{file_path}")
         return out
 
     # recursive == True：只跑目录（含子目录）
     if not dir_paths:
-        WARNINGS.append("[输入] SCAN_RECURSIVE=True 但 INPUT_DIRS 为空，未找到可扫描目录。")
+        warnings.append("[输入] SCAN_RECURSIVE=True 但 INPUT_DIRS 为空，未找到可扫描目录。")
         return out
 
     for d in dir_paths:
         if not os.path.isdir(d):
-            WARNINGS.append(f"[输入] 目录不存在：{d}")
+            warnings.append(f"[输入] 目录不存在：{d}")
             continue
         for root, _, files in os.walk(d):
             for fn in files:
@@ -142,187 +164,168 @@ def _center_arrow_line(old_line: str, new_line: str, left_pad: int = 2) -> str:
     arrow_pos = max(0, (width // 2) - 1)
     return pad + (" " * arrow_pos) + "↓"
 
-# ---------- Name 重排（最前置执行） ----------
-def _renumber_object_array_names(entry: Dict[str, Any]) -> int:
+def _list_field(obj: Dict[str, Any], key: str) -> List[Any]:
+    v = obj.get(key)
+    return v if isinstance(v, list) else []
+
+def _backfill_block(title: str, s_before: List[int], s_after: List[int], c_before: List[int], c_after: List[int],
+                    oi_before: Any, oi_after: Any) -> str:
+    oi_before_str = f"[{oi_before}]" if oi_before is not None else "[]"
+    return "\n".join([
+        title,
+        f"     SBS        {_fmt_list_brackets(s_before)} -> {_fmt_list_brackets(s_after)}",
+        f"     CBC        {_fmt_list_brackets(c_before)} -> {_fmt_list_brackets(c_after)}",
+        f"     OuterIndex {oi_before_str} -> [{oi_after}]",
+    ])
+
+# ---------- 平移工具 ----------
+def _normalize_shift_positions(raw: List[int]) -> Tuple[List[int], List[int]]:
+    inserts = sorted({p for p in raw if isinstance(p, int) and p > 0 and p >= 1})
+    deletes = sorted({-p for p in raw if isinstance(p, int) and p < 0 and -p >= 1})
+    return inserts, deletes
+
+class ShiftRemap:
     """
-    若 entry 是 ArrayProperty(ObjectProperty) 且值为对象数组，则把每个元素的 Name 依次重排为 "0","1",...
-    返回本数组中发生改名的次数。
+    平移位点预先展开成查表：v < size 时新值为 table[v]，更大的 v 统一加 tail（全部插入数 - 全部删除数）。
+    命中删除位置的项为 0（平移后的正常值恒 ≥ 1，0 即“命中删除”）。
     """
-    if not (isinstance(entry, dict) and entry.get("$type","").endswith("ArrayPropertyData, UAssetAPI")):
-        return 0
-    if entry.get("ArrayType") != "ObjectProperty":
-        return 0
-    vals = entry.get("Value")
+
+    def __init__(self, raw_positions: List[int]):
+        inserts, deletes = _normalize_shift_positions(raw_positions)
+        self.inserts, self.deletes = inserts, deletes
+        top = max(inserts[-1:] + deletes[-1:], default=0)
+        # 差分：插入 p 影响 v >= p；删除 d 影响 v > d（v == d 不减）
+        delta = array("i", bytes(4 * (top + 2)))
+        for p in inserts:
+            delta[p] += 1
+        for d in deletes:
+            delta[d + 1] -= 1
+        table = array("i", bytes(4 * (top + 1)))
+        acc = 0
+        for v in range(1, top + 1):
+            acc += delta[v]
+            table[v] = v + acc
+        for d in deletes:
+            table[d] = 0
+        self.table = table
+        self.size = top + 1
+        self.tail = len(inserts) - len(deletes)
+
+    def __call__(self, v: int) -> int:
+        return self.table[v] if v < self.size else v + self.tail
+
+@lru_cache(maxsize=64)
+def _shift_remap(positions: Tuple[int, ...]) -> ShiftRemap:
+    """同一组位点只展开一次（批处理中多个文件共用同一平移计划时复用）。"""
+    return ShiftRemap(list(positions))
+
+def load_shift_plan() -> Dict[str, List[int]]:
+    """
+    多文件平移计划：SHIFT_PLAN 与 SHIFT_PLAN_JSON（{"路径或文件名": [位点...]}）合并，后者优先。
+    键为绝对路径时按规范化路径匹配，否则按文件名匹配。
+    """
+    plan: Dict[str, List[int]] = {}
+    raw: Dict[str, Any] = dict(SHIFT_PLAN)
+    if SHIFT_PLAN_JSON:
+        try:
+            extra = json_io.load(SHIFT_PLAN_JSON)
+            if isinstance(extra, dict):
+                raw.update(extra)
+            else:
+                print(f"[平移计划] {SHIFT_PLAN_JSON} 不是对象，已忽略")
+        except Exception as e:
+            print(f"[平移计划] 读取失败：{SHIFT_PLAN_JSON}：{e}")
+    for key, positions in raw.items():
+        if not isinstance(positions, list):
+            print(f"[平移计划] {key} 的位点不是列表，已忽略")
+            continue
+        k = os.path.normcase(os.path.abspath(key)) if os.path.isabs(key) else key
+        plan[k] = [p for p in positions if isinstance(p, int) and not isinstance(p, bool)]
+    return plan
+
+def plan_positions(plan: Dict[str, List[int]], path: str, default: List[int]) -> List[int]:
+    """文件的平移位点：计划为空时用 default；计划非空时只平移计划中的文件，其余不平移。"""
+    if not plan:
+        return default
+    hit = plan.get(os.path.normcase(os.path.abspath(path)))
+    if hit is None:
+        hit = plan.get(os.path.basename(path))
+    return hit or []
+
+# ---------- 引用位定位（一次遍历） ----------
+SITE_UI, SITE_JHEXT, SITE_TRI, SITE_BUFFIDS = 0, 1, 2, 3
+_JHEXT_ARRAYS = {"Requirements", "Actions"}
+
+def _renumber_names(vals: Any) -> int:
+    """把数组元素的 Name 依次重排为 "0","1",...；返回改名次数。"""
     if not isinstance(vals, list):
         return 0
     changed = 0
-    for i, objp in enumerate(vals):
-        if isinstance(objp, dict):
-            old = objp.get("Name")
+    for i, item in enumerate(vals):
+        if isinstance(item, dict):
             new = str(i)
-            if old != new:
-                objp["Name"] = new
+            if item.get("Name") != new:
+                item["Name"] = new
                 changed += 1
     return changed
 
-def _renumber_in_jhextend(exp1: Dict[str, Any]) -> Tuple[int, int]:
-    """
-    在 export[1] 的 JHExtendSettings 下，对内部的 Requirements / Actions（ObjectProperty 数组）执行 Name 重排。
-    返回：(被处理数组个数, 改名条数)
-    """
-    data = exp1.get("Data", [])
-    if not isinstance(data, list):
-        return 0, 0
-    arrs = 0; changed = 0
-    for entry in data:
-        if not (isinstance(entry, dict)
-                and entry.get("$type","").endswith("ArrayPropertyData, UAssetAPI")
-                and entry.get("ArrayType") == "StructProperty"
-                and entry.get("Name") == "JHExtendSettings"):
-            continue
-        structs = entry.get("Value", [])
-        if not isinstance(structs, list):
-            continue
-        for s in structs:
-            if not (isinstance(s, dict) and s.get("$type","").endswith("StructPropertyData, UAssetAPI")):
-                continue
-            inner_vals = s.get("Value", [])
-            if not isinstance(inner_vals, list):
-                continue
-            for inner in inner_vals:
-                if not (isinstance(inner, dict)
-                        and inner.get("$type","").endswith("ArrayPropertyData, UAssetAPI")
-                        and inner.get("ArrayType") == "ObjectProperty"
-                        and inner.get("Name") in {"Requirements", "Actions"}):
-                    continue
-                arrs += 1
-                changed += _renumber_object_array_names(inner)
-    return arrs, changed
-
-def _renumber_in_three_structs(exports: List[Any], start_idx: int = 1) -> Tuple[int, int]:
+class RefSites:
     """
-    对 Exports[start_idx..] 的三类结构（ExecutionPhases / If_Req / Then_Act / Else_Act / Requirements）
-    进行 Name 重排。注意 start_idx 默认从 1（即 export[2]）起；若希望包含 export[1] 的三类结构可改成 0。
-    返回：(被处理数组个数, 改名条数)
+    一次遍历 Exports 得到的引用位表；Name 重排、平移、收集、回写各阶段都在表上操作，不再各自重走 Data。
+      arrays：需要重排 Name 的数组 (类别, export 序号, 元素列表)：
+              SITE_JHEXT = export#2 JHExtendSettings 内的 Requirements/Actions；SITE_TRI = export#2 起的三类结构；
+              SITE_BUFFIDS = 任意 export 的 BuffIds（IntProperty 数组）。
+      refs：  引用位 (类别, export 序号, 持有 Value 的对象)，只收定位时为正整数的项：
+              SITE_UI = export#2 第一个 UIData；SITE_JHEXT 同上；SITE_TRI 取 export#3 起。顺序与原各阶段遍历顺序一致。
+      values：refs 对应的当前值（平移时同步更新）。
     """
-    total = len(exports)
-    arrs = 0; changed = 0
-    for idx in range(start_idx, total):
-        exp = exports[idx]
-        data = exp.get("Data", [])
-        if not isinstance(data, list):
-            continue
-        for entry in data:
-            if not (isinstance(entry, dict)
-                    and entry.get("$type","").endswith("ArrayPropertyData, UAssetAPI")
-                    and entry.get("ArrayType") == "ObjectProperty"
-                    and entry.get("Name") in REF_ARRAY_NAMES):
-                continue
-            arrs += 1
-            changed += _renumber_object_array_names(entry)
-    return arrs, changed
 
-def _renumber_buffids_anywhere(exports: List[Any]) -> Tuple[int, int]:
-    """
-    在所有 Exports[*].Data[*] 中查找：
-      ArrayPropertyData(ArrayType="IntProperty", Name="BuffIds")
-    将其 Value 数组内各 IntPropertyData 的 Name 重排为 "0","1","2",...
-    返回：(被处理数组个数, 改名条数)
-    """
-    arrs = 0
-    changed = 0
-    for exp in exports:
-        data = exp.get("Data", [])
-        if not isinstance(data, list):
-            continue
-        for entry in data:
-            if not (isinstance(entry, dict)
-                    and isinstance(entry.get("$type", ""), str)
-                    and entry.get("$type").endswith("ArrayPropertyData, UAssetAPI")
-                    and entry.get("ArrayType") == "IntProperty"
-                    and entry.get("Name") == "BuffIds"):
-                continue
-            vals = entry.get("Value")
-            if not isinstance(vals, list):
+    def __init__(self, exports: List[Any]):
+        self.arrays: List[Tuple[int, int, Any]] = []
+        self.refs: List[Tuple[int, int, Dict[str, Any]]] = []
+        self.values: List[int] = []
+        self.ui_entries: List[Dict[str, Any]] = []   # export#2 的全部 UIData 项（收集阶段用）
+        jh_refs: List[Tuple[int, int, Dict[str, Any]]] = []
+        for idx, exp in enumerate(exports):
+            data = exp.get("Data", [])
+            if not isinstance(data, list):
                 continue
-            arrs += 1
-            for i, intp in enumerate(vals):
-                if isinstance(intp, dict):
-                    old = intp.get("Name")
-                    new = str(i)
-                    if old != new:
-                        intp["Name"] = new
-                        changed += 1
-    return arrs, changed
-
-# ---------- 平移工具 ----------
-def _normalize_shift_positions(raw: List[int]) -> Tuple[List[int], List[int]]:
-    inserts = sorted({p for p in raw if isinstance(p, int) and p > 0 and p >= 1})
-    deletes = sorted({-p for p in raw if isinstance(p, int) and p < 0 and -p >= 1})
-    return inserts, deletes
-
-def _build_shift_func(raw_positions: List[int]):
-    if not raw_positions:
-        return (lambda v: v, lambda v: False)
-    inserts, deletes = _normalize_shift_positions(raw_positions)
-    def count_le(arr, x): return bisect.bisect_right(arr, x)
-    def count_lt(arr, x): return bisect.bisect_left(arr, x)
-    deleted_set = set(deletes)
-    def shift(v: int) -> int:
-        if not isinstance(v, int) or isinstance(v, bool) or v <= 0:
-            return v
-        inc = count_le(inserts, v)     # p <= v
-        dec = count_lt(deletes, v)     # d <  v（v==d 不减）
-        return v + inc - dec
-    def hit_deleted(v: int) -> bool:
-        return isinstance(v, int) and not isinstance(v, bool) and v in deleted_set
-    return shift, hit_deleted
-
-# ---------- export[1]：仅按两类结构收集 ----------
-def collect_export1_numbers(exp1: Dict[str, Any]) -> List[int]:
-    nums: List[int] = []
-    data = exp1.get("Data", [])
-    if not isinstance(data, list): return nums
-    for entry in data:
-        if not isinstance(entry, dict): continue
-        t = entry.get("$type", "")
-        if t.endswith("ObjectPropertyData, UAssetAPI") and entry.get("Name") == "UIData":
-            v = entry.get("Value");
-            if is_positive_int_no_bool(v): nums.append(v)
-            continue
-        if t.endswith("ArrayPropertyData, UAssetAPI") and entry.get("ArrayType")=="StructProperty" and entry.get("Name")=="JHExtendSettings":
-            structs = entry.get("Value", []);
-            if not isinstance(structs, list): continue
-            for s in structs:
-                if not (isinstance(s, dict) and s.get("$type","").endswith("StructPropertyData, UAssetAPI")): continue
-                inner_vals = s.get("Value", []);
-                if not isinstance(inner_vals, list): continue
-                for inner in inner_vals:
-                    if not isinstance(inner, dict): continue
-                    t2 = inner.get("$type","")
-                    if t2.endswith("ArrayPropertyData, UAssetAPI") and inner.get("ArrayType")=="ObjectProperty" and inner.get("Name") in {"Requirements","Actions"}:
-                        objs = inner.get("Value", [])
-                        if not isinstance(objs, list): continue
-                        for objp in objs:
-                            if isinstance(objp, dict):
-                                v2 = objp.get("Value")
-                                if is_positive_int_no_bool(v2): nums.append(v2)
-    return dedup_keep_order(nums)
-
-def collect_jhext_numbers_only(exp1: Dict[str, Any]) -> List[int]:
-    nums: List[int] = []
-    data = exp1.get("Data", [])
-    if not isinstance(data, list):
-        return nums
-    for entry in data:
-        if not (isinstance(entry, dict)
-                and entry.get("$type","").endswith("ArrayPropertyData, UAssetAPI")
-                and entry.get("ArrayType") == "StructProperty"
-                and entry.get("Name") == "JHExtendSettings"):
-            continue
+            export_no = idx + 1
+            for entry in data:
+                if not isinstance(entry, dict):
+                    continue
+                t = entry.get("$type", "")
+                if not isinstance(t, str):
+                    continue
+                if t.endswith("ArrayPropertyData, UAssetAPI"):
+                    at = entry.get("ArrayType")
+                    if at == "ObjectProperty":
+                        if idx < 1 or entry.get("Name") not in REF_ARRAY_NAMES:
+                            continue
+                        vals = entry.get("Value", [])
+                        self.arrays.append((SITE_TRI, export_no, vals))
+                        if idx >= 2 and isinstance(vals, list):
+                            for objp in vals:
+                                if isinstance(objp, dict) and is_positive_int_no_bool(objp.get("Value")):
+                                    self.refs.append((SITE_TRI, export_no, objp))
+                    elif at == "IntProperty":
+                        if entry.get("Name") == "BuffIds" and isinstance(entry.get("Value"), list):
+                            self.arrays.append((SITE_BUFFIDS, export_no, entry["Value"]))
+                    elif at == "StructProperty" and idx == 1 and entry.get("Name") == "JHExtendSettings":
+                        self._locate_jhext(entry, jh_refs)
+                elif idx == 1 and t.endswith("ObjectPropertyData, UAssetAPI") and entry.get("Name") == "UIData":
+                    self.ui_entries.append(entry)
+        # 平移顺序：UIData → JHExtendSettings → 三类结构
+        head: List[Tuple[int, int, Dict[str, Any]]] = []
+        if self.ui_entries and is_positive_int_no_bool(self.ui_entries[0].get("Value")):
+            head.append((SITE_UI, 2, self.ui_entries[0]))
+        self.refs[:0] = head + jh_refs
+        self.values = [holder["Value"] for _, _, holder in self.refs]
+
+    def _locate_jhext(self, entry: Dict[str, Any], jh_refs: List[Tuple[int, int, Dict[str, Any]]]) -> None:
         structs = entry.get("Value", [])
         if not isinstance(structs, list):
-            continue
+            return
         for s in structs:
             if not (isinstance(s, dict) and s.get("$type","").endswith("StructPropertyData, UAssetAPI")):
                 continue
@@ -333,140 +336,172 @@ def collect_jhext_numbers_only(exp1: Dict[str, Any]) -> List[int]:
                 if not (isinstance(inner, dict)
                         and inner.get("$type","").endswith("ArrayPropertyData, UAssetAPI")
                         and inner.get("ArrayType") == "ObjectProperty"
-                        and inner.get("Name") in {"Requirements","Actions"}):
+                        and inner.get("Name") in _JHEXT_ARRAYS):
                     continue
                 objs = inner.get("Value", [])
+                self.arrays.append((SITE_JHEXT, 2, objs))
                 if not isinstance(objs, list):
                     continue
                 for objp in objs:
-                    if isinstance(objp, dict):
-                        v = objp.get("Value")
-                        if isinstance(v, int) and not isinstance(v, bool) and v > 0:
-                            nums.append(v)
-    return dedup_keep_order(nums)
+                    if isinstance(objp, dict) and is_positive_int_no_bool(objp.get("Value")):
+                        jh_refs.append((SITE_JHEXT, 2, objp))
+
+    # --- Name 重排 ---
+    def renumber(self) -> Dict[int, Tuple[int, int]]:
+        """对全部数组执行 Name 重排；返回 {类别: (数组数, 改名条数)}。"""
+        out = {SITE_JHEXT: (0, 0), SITE_TRI: (0, 0), SITE_BUFFIDS: (0, 0)}
+        for kind, _, vals in self.arrays:
+            arrs, changed = out[kind]
+            out[kind] = (arrs + 1, changed + _renumber_names(vals))
+        return out
 
-def collect_ui_data_target(exp1: Dict[str, Any]) -> Optional[int]:
-    """
-    从 export[2]（变量名 exp1）读取 UIData 的正整数 Value；没有则返回 None。
-    """
-    data = exp1.get("Data", [])
-    if not isinstance(data, list):
-        return None
-    for entry in data:
-        if not isinstance(entry, dict):
-            continue
-        t = entry.get("$type", "")
-        if t.endswith("ObjectPropertyData, UAssetAPI") and entry.get("Name") == "UIData":
+    # --- 平移 ---
+    def apply_shift(self, remap: ShiftRemap,
+                    warnings: List[str]) -> Tuple[List[int], List[int], List[Tuple[int, int]]]:
+        """
+        一遍查表改写全部引用位；命中删除位置的置 0 并告警。
+        返回：(各类别改动数 [UIData, JHExt, 三类结构]，JHExt 命中删除的旧值，三类结构命中删除的 (export 序号, 旧值))。
+        UIData 命中删除也计入改动数（与原逻辑一致）。
+        """
+        changed = [0, 0, 0]
+        jh_hits: List[int] = []
+        tri_hits: List[Tuple[int, int]] = []
+        table, size, tail = remap.table, remap.size, remap.tail
+        values = self.values
+        for i, (kind, exp_no, holder) in enumerate(self.refs):
+            old = values[i]
+            new = table[old] if old < size else old + tail
+            if new == old:
+                continue
+            holder["Value"] = values[i] = new
+            if new:
+                changed[kind] += 1
+            elif kind == SITE_TRI:
+                tri_hits.append((exp_no, old))
+                warnings.append(f"[平移] export#{exp_no} 的三类结构引用命中已删除位置 {old} → 置0")
+            elif kind == SITE_JHEXT:
+                jh_hits.append(old)
+                warnings.append(f"[平移] JHExtendSettings 引用命中已删除位置 {old} → 置0")
+            else:
+                changed[kind] += 1
+                warnings.append(f"[平移] UIData 引用命中已删除位置 {old} → 置0")
+        return changed, jh_hits, tri_hits
+
+    # --- 收集 ---
+    def jhext_numbers(self) -> Set[int]:
+        """JHExtendSettings 中的正数引用。"""
+        return {v for (kind, _, _), v in zip(self.refs, self.values) if kind == SITE_JHEXT and v > 0}
+
+    def export1_numbers(self) -> Set[int]:
+        """export#2 的 UIData（全部 UIData 项）与 JHExtendSettings 中的正数引用。"""
+        nums = self.jhext_numbers()
+        for entry in self.ui_entries:
             v = entry.get("Value")
             if is_positive_int_no_bool(v):
-                return v
+                nums.add(v)
+        return nums
+
+    def ui_target(self) -> Optional[int]:
+        """export#2 第一个 UIData 的正整数 Value；没有则 None。"""
+        if not self.ui_entries:
             return None
-    return None
-
-# ---------- 三类引用结构提取 ----------
-def find_ref_indices_in_export(export_obj: Dict[str, Any]) -> List[int]:
-    refs: List[int] = []
-    data = export_obj.get("Data", [])
-    if not isinstance(data, list): return refs
-    for entry in data:
-        if not isinstance(entry, dict): continue
-        t = entry.get("$type", "")
-        if not (isinstance(t, str) and t.endswith("ArrayPropertyData, UAssetAPI")): continue
-        if entry.get("ArrayType") != "ObjectProperty": continue
-        if entry.get("Name") not in REF_ARRAY_NAMES: continue
-        values = entry.get("Value", [])
-        if not isinstance(values, list): continue
-        for obj_prop in values:
-            if isinstance(obj_prop, dict):
-                v = obj_prop.get("Value")
-                if is_positive_int_no_bool(v): refs.append(v)
-    return dedup_keep_order(refs)
-
-# ---------- 平移具体应用 ----------
-def _apply_shift_in_jhextend(exp1: Dict[str, Any], shift, hit_deleted) -> Tuple[int, List[int]]:
-    data = exp1.get("Data", [])
-    if not isinstance(data, list): return 0, []
-    changed = 0; dangling: List[int] = []
-    for entry in data:
-        if not (isinstance(entry, dict) and entry.get("$type","").endswith("ArrayPropertyData, UAssetAPI")): continue
-        if entry.get("ArrayType")!="StructProperty" or entry.get("Name")!="JHExtendSettings": continue
-        structs = entry.get("Value", []);
-        if not isinstance(structs, list): continue
-        for s in structs:
-            if not (isinstance(s, dict) and s.get("$type","").endswith("StructPropertyData, UAssetAPI")): continue
-            inner_vals = s.get("Value", []);
-            if not isinstance(inner_vals, list): continue
-            for inner in inner_vals:
-                if not (isinstance(inner, dict) and inner.get("$type","").endswith("ArrayPropertyData, UAssetAPI")): continue
-                if inner.get("ArrayType")!="ObjectProperty" or inner.get("Name") not in {"Requirements","Actions"}: continue
-                objs = inner.get("Value", []);
-                if not isinstance(objs, list): continue
-                for objp in objs:
-                    if isinstance(objp, dict) and is_positive_int_no_bool(objp.get("Value")):
-                        old = objp["Value"]
-                        if hit_deleted(old):
-                            # 命中删除：置 0 并警告
-                            objp["Value"] = 0
-                            dangling.append(old)
-                            WARNINGS.append(f"[平移] JHExtendSettings 引用命中已删除位置 {old} → 置0")
-                        else:
-                            newv = shift(old)
-                            if newv != old:
-                                objp["Value"] = newv; changed += 1
-    return changed, dangling
-
-def _apply_shift_in_ui_data(exp1: Dict[str, Any], shift, hit_deleted) -> Tuple[bool, Optional[int]]:
-    """对 exp1.UIData 应用平移；若命中删除则置0并告警。返回(是否改动, 命中删除的旧值或None)"""
-    data = exp1.get("Data", [])
-    if not isinstance(data, list): return False, None
-    for entry in data:
-        if not (isinstance(entry, dict) and entry.get("$type","").endswith("ObjectPropertyData, UAssetAPI") and entry.get("Name")=="UIData"):
-            continue
-        v = entry.get("Value")
-        if not is_positive_int_no_bool(v):
-            return False, None
-        if hit_deleted(v):
-            WARNINGS.append(f"[平移] UIData 引用命中已删除位置 {v} → 置0")
-            entry["Value"] = 0
-            return True, v
-        newv = shift(v)
-        if newv != v:
-            entry["Value"] = newv
-            return True, None
-        return False, None
-    return False, None
-
-def _apply_shift_in_three_structs(exports: List[Any], shift, hit_deleted, start_idx: int = 2) -> Tuple[int, List[Tuple[int,int]]]:
-    changed = 0; hits: List[Tuple[int,int]] = []
-    total = len(exports)
-    for idx in range(start_idx, total):
-        exp = exports[idx]; exp_no = idx + 1
-        data = exp.get("Data", []);
-        if not isinstance(data, list): continue
-        for entry in data:
-            if not (isinstance(entry, dict) and entry.get("$type","").endswith("ArrayPropertyData, UAssetAPI")): continue
-            if entry.get("ArrayType")!="ObjectProperty" or entry.get("Name") not in REF_ARRAY_NAMES: continue
-            vals = entry.get("Value", []);
-            if not isinstance(vals, list): continue
-            for objp in vals:
-                if isinstance(objp, dict) and is_positive_int_no_bool(objp.get("Value")):
-                    old = objp["Value"]
-                    if hit_deleted(old):
-                        # 命中删除：置 0 并警告
-                        objp["Value"] = 0
-                        hits.append((exp_no, old))
-                        WARNINGS.append(f"[平移] export#{exp_no} 的三类结构引用命中已删除位置 {old} → 置0")
-                    else:
-                        newv = shift(old)
-                        if newv != old:
-                            objp["Value"] = newv; changed += 1
-    return changed, hits
+        v = self.ui_entries[0].get("Value")
+        return v if is_positive_int_no_bool(v) else None
+
+    def outgoing(self) -> Iterator[Tuple[int, List[int]]]:
+        """export#3 起各引用者的被引用序号（保序去重），按 export 序号升序；没有引用的 export 不产出。"""
+        cur = 0
+        refs: List[int] = []
+        seen: Set[int] = set()
+        for (kind, exp_no, _), v in zip(self.refs, self.values):
+            if kind != SITE_TRI or v <= 0:
+                continue
+            if exp_no != cur:
+                if refs:
+                    yield cur, refs
+                cur, refs, seen = exp_no, [], set()
+            if v not in seen:
+                seen.add(v); refs.append(v)
+        if refs:
+            yield cur, refs
+
+# ---------- 依赖图（CSR） ----------
+class RefGraph:
+    """
+    export[2..] 三类引用结构的依赖图。
+      out_ptr/out_idx：引用者 export_no 的被引用序号为 out_idx[out_ptr[export_no]:out_ptr[export_no+1]]（保持首次出现顺序）
+      in_ptr/in_idx：  被引用者 target_no 的引用者为 in_idx[in_ptr[target_no]:in_ptr[target_no+1]]（升序、无重复）
+    序号超出 Exports 范围的被引用者只记在 targets / out_of_range 中，不进 in_*。
+    """
+
+    def __init__(self, total: int, outgoing: Iterable[Tuple[int, List[int]]]):
+        """outgoing：按 export 序号升序的 (引用者 export_no, 去重后的被引用序号)，见 RefSites.outgoing。"""
+        self.total = total
+        out_ptr = array("i", bytes(4 * (total + 2)))
+        out_idx = array("q")   # 越界序号也先记在这里，可能很大
+        in_cnt = array("i", bytes(4 * (total + 2)))
+        self.sources: List[int] = []      # 有引用的 export_no（升序）
+        self.targets: List[int] = []      # 被引用序号（按首次出现顺序，含越界）
+        self.out_of_range: Set[int] = set()
+        seen: Set[int] = set()
+        k = 0
+        for export_no, refs in outgoing:
+            while k <= export_no:
+                out_ptr[k] = len(out_idx); k += 1
+            self.sources.append(export_no)
+            out_idx.extend(refs)
+            for r in refs:
+                if r not in seen:
+                    seen.add(r); self.targets.append(r)
+                if r <= total:
+                    in_cnt[r] += 1
+                else:
+                    self.out_of_range.add(r)
+        while k <= total + 1:
+            out_ptr[k] = len(out_idx); k += 1
+        self.out_ptr, self.out_idx = out_ptr, out_idx
+        self.target_set = seen
+
+        # 计数排序得到反向邻接：引用者按 export_no 升序填入，每个引用者的 refs 已去重 → 列表天然无重复
+        in_ptr = array("i", bytes(4 * (total + 2)))
+        acc = 0
+        for t in range(total + 1):
+            in_ptr[t] = acc
+            acc += in_cnt[t]
+        in_ptr[total + 1] = acc
+        in_idx = array("i", bytes(4 * acc))
+        fill = array("i", in_ptr)
+        for export_no in self.sources:
+            for r in out_idx[out_ptr[export_no]:out_ptr[export_no + 1]]:
+                if r <= total:
+                    in_idx[fill[r]] = export_no
+                    fill[r] += 1
+        self.in_ptr, self.in_idx = in_ptr, in_idx
+
+    def outgoing(self, export_no: int) -> List[int]:
+        return self.out_idx[self.out_ptr[export_no]:self.out_ptr[export_no + 1]].tolist()
+
+    def referrers(self, target_no: int) -> List[int]:
+        return self.in_idx[self.in_ptr[target_no]:self.in_ptr[target_no + 1]].tolist()
 
 # ---------- 主处理 ----------
-def process(doc: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+def process(doc: Dict[str, Any], report: bool = True, warnings: Optional[List[str]] = None,
+            shift_positions: Optional[List[int]] = None,
+            stats: Optional[Dict[str, int]] = None) -> Tuple[List[str], List[str]]:
     """
     返回： (普通日志 lines, 回填块 backfill_blocks)
+    report=False 时不生成逐项明细：backfill_blocks 为空，lines 只含汇总行。
+    warnings：本文件的告警收集列表；shift_positions：平移位点（None = 按 ENABLE_SHIFT / SHIFT_POSITIONS）；
+    stats 给定时写入计数：renamed（重排改名）/ shifted（平移改动）/ backfilled（回填与终态修正）/ deprecated（弃用）。
+    不读写任何模块级状态，可在多个进程中并行调用。
     """
+    if warnings is None:
+        warnings = []
+    if shift_positions is None:
+        shift_positions = SHIFT_POSITIONS if ENABLE_SHIFT else []
+    if stats is None:
+        stats = {}
+    stats.update(renamed=0, shifted=0, backfilled=0, deprecated=0)
     lines: List[str] = []
     backfill_blocks: List[str] = []
 
@@ -477,20 +512,23 @@ def process(doc: Dict[str, Any]) -> Tuple[List[str], List[str]]:
 
     total = len(exports)
 
+    # 一次定位全部引用位，之后各阶段都在引用位表上操作
+    sites = RefSites(exports)
+
     # === 0) Name 重排（放在一切之前执行，无开关） ===
-    jh_cnt, jh_changes = _renumber_in_jhextend(exports[1])
-    tri_cnt, tri_changes = _renumber_in_three_structs(exports, start_idx=1)
+    renum = sites.renumber()
+    (jh_cnt, jh_changes), (tri_cnt, tri_changes) = renum[SITE_JHEXT], renum[SITE_TRI]
     lines.append(f"[重排] 规范 Name 序号：JHExtendSettings 数组数={jh_cnt}，改名={jh_changes}；三类结构数组数={tri_cnt}，改名={tri_changes}")
-    buf_cnt, buf_changes = _renumber_buffids_anywhere(exports)
+    buf_cnt, buf_changes = renum[SITE_BUFFIDS]
     lines.append(f"[重排] BuffIds 数组数={buf_cnt}，改名={buf_changes}")
+    stats["renamed"] = jh_changes + tri_changes + buf_changes
 
     # === 1) 可选：索引平移阶段（在重排之后、其他逻辑之前） ===
-    if ENABLE_SHIFT and SHIFT_POSITIONS:
-        shift, hit_deleted = _build_shift_func(SHIFT_POSITIONS)
-        c_ui, _ = _apply_shift_in_ui_data(exports[1], shift, hit_deleted)
-        c1, d1 = _apply_shift_in_jhextend(exports[1], shift, hit_deleted)
-        c2, d2 = _apply_shift_in_three_structs(exports, shift, hit_deleted, 2)
-        inserts, deletes = _normalize_shift_positions(SHIFT_POSITIONS)
+    if shift_positions:
+        remap = _shift_remap(tuple(shift_positions))
+        (c_ui, c1, c2), d1, d2 = sites.apply_shift(remap, warnings)
+        stats["shifted"] = c_ui + c1 + c2
+        inserts, deletes = remap.inserts, remap.deletes
         lines.append(f"[平移] 启用。插入位点={inserts}；删除位点={deletes}；UIData改动={int(c_ui)}；JHExtendSettings改动={c1}；三类结构改动={c2}")
         if d1 or d2:
             preview = d2[:10]
@@ -498,24 +536,13 @@ def process(doc: Dict[str, Any]) -> Tuple[List[str], List[str]]:
     else:
         lines.append("[平移] 关闭。按原逻辑执行")
 
-    # === 2) 第一遍：汇总 outgoing 与 referenced_by ===
-    outgoing_refs: Dict[int, List[int]] = {}
-    referenced_by: DefaultDict[int, List[int]] = defaultdict(list)
-
-    for idx in range(2, total):
-        export_no = idx + 1
-        refs = find_ref_indices_in_export(exports[idx])
-        if refs:
-            outgoing_refs[export_no] = refs
-            for r in refs:
-                lst = referenced_by[r]
-                if export_no not in lst:
-                    lst.append(export_no)
+    # === 2) 第一遍：建依赖图（引用者 → 被引用者 / 被引用者 → 引用者） ===
+    graph = RefGraph(total, sites.outgoing())
 
     # === 3) export[1]：先清理正数，再填升序正数（方括号 + 箭头） ===
     exp1 = exports[1]
-    jhext_only_set = set(collect_jhext_numbers_only(exp1))  # 仅统计 JHExtendSettings 里的正数
-    collected = collect_export1_numbers(exp1)
+    jhext_only_set = sites.jhext_numbers()  # 仅统计 JHExtendSettings 里的正数
+    collected = sites.export1_numbers()
     collected_sorted = sorted(collected)
     cbsd = ensure_list_field(exp1, "CreateBeforeSerializationDependencies")
     before_cbsd = list(cbsd)
@@ -530,92 +557,73 @@ def process(doc: Dict[str, Any]) -> Tuple[List[str], List[str]]:
     lines.append(_center_arrow_line(old_line, new_line, left_pad=2))
     lines.append("  " + new_line)
 
-    # === 4) 第二遍：按汇总结果覆盖写入 ===
+    # === 4) 第二遍：按依赖图覆盖写入 ===
     # 4a) 覆盖所有“引用者”的 CBSD（与回填相同块样式）
-    for export_no, refs in outgoing_refs.items():
+    for export_no in graph.sources:
         exp = exports[export_no - 1]
-        before = list(exp.get("CreateBeforeSerializationDependencies", [])) if isinstance(exp.get("CreateBeforeSerializationDependencies"), list) else []
-        exp["CreateBeforeSerializationDependencies"] = list(refs)
-
-        block = []
-        block.append(f" - 修改引用者 export#{export_no}:")
-        block.append(f"     CBSD      {_fmt_list_brackets(before)} -> {_fmt_list_brackets(refs)}")
-        lines.append("\n".join(block))
+        refs = graph.outgoing(export_no)
+        if report:
+            before = _list_field(exp, "CreateBeforeSerializationDependencies")
+            lines.append(f" - 修改引用者 export#{export_no}:\n"
+                         f"     CBSD      {_fmt_list_brackets(before)} -> {_fmt_list_brackets(refs)}")
+        exp["CreateBeforeSerializationDependencies"] = refs
 
     # 4b) 覆盖所有“被引用者”的 SBS / CBC，并设置 OuterIndex
-    for target_no, referrers in referenced_by.items():
-        if not (1 <= target_no <= total):
-            lines.append(f"  - 警告：被引用目标越界 target_no={target_no}/{total}")
+    n_fixed = 0
+    for target_no in graph.targets:
+        if target_no in graph.out_of_range:
+            lines.append(f"  - 警告：被引用目标越界 target_no={target_no}/{graph.total}")
             continue
         tgt = exports[target_no - 1]
-
-        s_before = list(tgt.get("SerializationBeforeSerializationDependencies", [])) if isinstance(
-            tgt.get("SerializationBeforeSerializationDependencies"), list) else []
-        c_before = list(tgt.get("CreateBeforeCreateDependencies", [])) if isinstance(
-            tgt.get("CreateBeforeCreateDependencies"), list) else []
-        oi_before = tgt.get("OuterIndex", None)
-
-        ref_after = list(referrers)  # 原始引用者列表（保序去重已在上游完成）
+        ref_after = graph.referrers(target_no)  # 升序、无重复
+        if report:
+            s_before = _list_field(tgt, "SerializationBeforeSerializationDependencies")
+            c_before = _list_field(tgt, "CreateBeforeCreateDependencies")
+            oi_before = tgt.get("OuterIndex", None)
 
         tgt["SerializationBeforeSerializationDependencies"] = ref_after
         tgt["CreateBeforeCreateDependencies"] = ref_after
-        uniq = dedup_keep_order(ref_after)
-        tgt["OuterIndex"] = uniq[0] if len(uniq) == 1 else 2
+        tgt["OuterIndex"] = ref_after[0] if len(ref_after) == 1 else 2
 
-        oi_before_str = f"[{oi_before}]" if oi_before is not None else "[]"
-        oi_after_str = f"[{tgt.get('OuterIndex')}]"
-
-        block = []
-        block.append(f" - 回填到被引用 export#{target_no}:")
-        block.append(
-            f"     SBS        {_fmt_list_brackets(s_before)} -> {_fmt_list_brackets(tgt['SerializationBeforeSerializationDependencies'])}")
-        block.append(
-            f"     CBC        {_fmt_list_brackets(c_before)} -> {_fmt_list_brackets(tgt['CreateBeforeCreateDependencies'])}")
-        block.append(f"     OuterIndex {oi_before_str} -> {oi_after_str}")
-        backfill_blocks.append('\n'.join(block))
+        if report:
+            backfill_blocks.append(_backfill_block(f" - 回填到被引用 export#{target_no}:",
+                                                   s_before, ref_after, c_before, ref_after,
+                                                   oi_before, tgt["OuterIndex"]))
+        else:
+            n_fixed += 1
 
     # 5) 终态修正：若某 export 同时“出现在 JHExtendSettings”且“被三类结构引用” → 确保含2 & OI=2
-    hits = sorted(set(referenced_by.keys()) & set(jhext_only_set))
+    hits = sorted(graph.target_set & jhext_only_set)
     for tno in hits:
         if not (1 <= tno <= total):
             lines.append(f"  - 警告：命中JHExt但目标越界 target_no={tno}/{total}")
             continue
 
         tgt = exports[tno - 1]
-        s_before = tgt.get("SerializationBeforeSerializationDependencies", [])
-        c_before = tgt.get("CreateBeforeCreateDependencies", [])
-        s_before = list(s_before) if isinstance(s_before, list) else []
-        c_before = list(c_before) if isinstance(c_before, list) else []
+        s_before = _list_field(tgt, "SerializationBeforeSerializationDependencies")
+        c_before = _list_field(tgt, "CreateBeforeCreateDependencies")
         oi_before = tgt.get("OuterIndex", None)
 
-        s_after = list(s_before)
-        c_after = list(c_before)
-        if 2 not in s_after:
-            s_after.append(2)
-        if 2 not in c_after:
-            c_after.append(2)
+        s_after = s_before if 2 in s_before else s_before + [2]
+        c_after = c_before if 2 in c_before else c_before + [2]
 
         tgt["SerializationBeforeSerializationDependencies"] = s_after
         tgt["CreateBeforeCreateDependencies"] = c_after
         tgt["OuterIndex"] = 2
 
-        if s_after != s_before or c_after != c_before or oi_before != 2:
-            oi_before_str = f"[{oi_before}]" if oi_before is not None else "[]"
-            block = []
-            block.append(f" - 终态修正 export#{tno}（命中JHExt，强制含2 & OI=2）:")
-            block.append(f"     SBS        {_fmt_list_brackets(s_before)} -> {_fmt_list_brackets(s_after)}")
-            block.append(f"     CBC        {_fmt_list_brackets(c_before)} -> {_fmt_list_brackets(c_after)}")
-            block.append(f"     OuterIndex {oi_before_str} -> [2]")
-            backfill_blocks.append('\n'.join(block))
+        if s_after is not s_before or c_after is not c_before or oi_before != 2:
+            if report:
+                backfill_blocks.append(_backfill_block(f" - 终态修正 export#{tno}（命中JHExt，强制含2 & OI=2）:",
+                                                       s_before, s_after, c_before, c_after, oi_before, 2))
+            else:
+                n_fixed += 1
 
     # 5B) 终态修正 UIData：若 UIData 指向的 export 其 SBS/CBC/OuterIndex 不是“只等于2” → 设为[2]/[2]/2
-    ui_target = collect_ui_data_target(exp1)  # 可能为 None
+    ui_target = sites.ui_target()  # 可能为 None
     if ui_target is not None and 1 <= ui_target <= total:
         tgt = exports[ui_target - 1]
-        s_before = tgt.get("SerializationBeforeSerializationDependencies", [])
-        c_before = tgt.get("CreateBeforeCreateDependencies", [])
-        s_before = list(s_before) if isinstance(s_before, list) else []
-        c_before = list(c_before) if isinstance(c_before, list) else []
+        s_before = _list_field(tgt, "SerializationBeforeSerializationDependencies")
+        c_before = _list_field(tgt, "CreateBeforeCreateDependencies")
         oi_before = tgt.get("OuterIndex", None)
 
         need_fix = (s_before != [2]) or (c_before != [2]) or (oi_before != 2)
@@ -624,57 +632,75 @@ def process(doc: Dict[str, Any]) -> Tuple[List[str], List[str]]:
             tgt["CreateBeforeCreateDependencies"] = [2]
             tgt["OuterIndex"] = 2
 
-            oi_before_str = f"[{oi_before}]" if oi_before is not None else "[]"
-            block = []
-            block.append(f" - 终态修正 export#{ui_target}（UIData 引用，设为[2] & OI=2）:")
-            block.append(f"     SBS        {_fmt_list_brackets(s_before)} -> [2]")
-            block.append(f"     CBC        {_fmt_list_brackets(c_before)} -> [2]")
-            block.append(f"     OuterIndex {oi_before_str} -> [2]")
-            backfill_blocks.append('\n'.join(block))
+            if report:
+                backfill_blocks.append(_backfill_block(f" - 终态修正 export#{ui_target}（UIData 引用，设为[2] & OI=2）:",
+                                                       s_before, [2], c_before, [2], oi_before, 2))
+            else:
+                n_fixed += 1
 
     # 6) JHEx-Only：仅在 JHEx 出现、且未被三类结构引用（并排除已被 UIData 引用的序号）
-    refed_set = set(referenced_by.keys())
+    refed_set = graph.target_set
     ui_exclude = {ui_target} if (ui_target is not None) else set()
-    jhex_only_targets = sorted((set(jhext_only_set) - refed_set) - ui_exclude)
+    jhex_only_targets = sorted((jhext_only_set - refed_set) - ui_exclude)
     for tno in jhex_only_targets:
         if not (2 <= tno <= total):
             continue
         tgt = exports[tno - 1]
+        if report:
+            s_before = _list_field(tgt, "SerializationBeforeSerializationDependencies")
+            c_before = _list_field(tgt, "CreateBeforeCreateDependencies")
+            oi_before = tgt.get("OuterIndex", None)
 
-        s_before = tgt.get("SerializationBeforeSerializationDependencies", [])
-        c_before = tgt.get("CreateBeforeCreateDependencies", [])
-        s_before = list(s_before) if isinstance(s_before, list) else []
-        c_before = list(c_before) if isinstance(c_before, list) else []
-        oi_before = tgt.get("OuterIndex", None)
-
-        s_after = [2]
-        c_after = [2]
-        tgt["SerializationBeforeSerializationDependencies"] = s_after
-        tgt["CreateBeforeCreateDependencies"] = c_after
+        tgt["SerializationBeforeSerializationDependencies"] = [2]
+        tgt["CreateBeforeCreateDependencies"] = [2]
         tgt["OuterIndex"] = 2
 
-        oi_before_str = f"[{oi_before}]" if oi_before is not None else "[]"
-        block = []
-        block.append(f" - 终态修正 export#{tno}（仅JHExt，设为[2] & OI=2）:")
-        block.append(f"     SBS        {_fmt_list_brackets(s_before)} -> {_fmt_list_brackets(s_after)}")
-        block.append(f"     CBC        {_fmt_list_brackets(c_before)} -> {_fmt_list_brackets(c_after)}")
-        block.append(f"     OuterIndex {oi_before_str} -> [2]")
-        backfill_blocks.append('\n'.join(block))
+        if report:
+            backfill_blocks.append(_backfill_block(f" - 终态修正 export#{tno}（仅JHExt，设为[2] & OI=2）:",
+                                                   s_before, [2], c_before, [2], oi_before, 2))
+        else:
+            n_fixed += 1
 
     # 7) 弃用统计：从 export#3 起，既不被三类引用、也不在 JHEx、也不是 UIData 指向 → 仅打印
     all_candidates = set(range(3, total + 1))  # 从 export#3 起统计
-    deprecated = sorted(all_candidates - refed_set - set(jhext_only_set) - ui_exclude)
+    deprecated = sorted(all_candidates - refed_set - jhext_only_set - ui_exclude)
     if deprecated:
         lines.append(f"[弃用] 未被三类引用且不在JHExt（从export#3起）：{deprecated}")
+    stats["backfilled"] = len(backfill_blocks) if report else n_fixed
+    stats["deprecated"] = len(deprecated)
+    if not report:
+        lines.append(f"[回写] 引用者 {len(graph.sources)} 个，回填/终态修正 {n_fixed} 个（报告关闭，未生成明细）")
 
     return lines, backfill_blocks
 
+
+def _report_lines(lines: List[str], backfills: List[str], warnings: List[str],
+                  preview: Optional[int] = None, report: bool = True) -> List[str]:
+    """报告文本（控制台与 TXT 同格式）；preview 给定时回填块只取前 preview 个。"""
+    out = ["=== 处理报告 ==="]
+    out.extend(lines)
+    if backfills:
+        if preview is None:
+            out.append(f"[回填统计] 共 {len(backfills)} 个")
+            out.extend(backfills)
+        else:
+            out.append(f"[回填统计] 共 {len(backfills)} 个（仅显示前 {preview} 个）")
+            out.extend(backfills[:preview])
+    elif preview is not None and report:
+        out.append("[回填统计] 0 个")
+    out.append("\n=== 警告汇总 ===")
+    out.extend(warnings if warnings else ["无警告"])
+    return out
+
+def _report_path(out_dir: str, prefix: str) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(out_dir, f"{prefix}_{ts}.txt")
+
 def _maybe_write_full_report(all_lines: List[str], out_dir: str) -> str:
     """把完整报告写到指定目录 TXT（与打印同格式），返回文件路径；失败返回空串。"""
     try:
-        os.makedirs(out_dir, exist_ok=True)
-        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        path = os.path.join(out_dir, f"report_{ts}.txt")
+        path = _report_path(out_dir, "report")
         with open(path, "w", encoding="utf-8") as f:
             f.write("\n".join(all_lines))
         return path
@@ -682,72 +708,144 @@ def _maybe_write_full_report(all_lines: List[str], out_dir: str) -> str:
         print(f"[写报告失败] {e}")
         return ""
 
+def process_doc(doc: Dict[str, Any], shift_positions: Optional[List[int]] = None) -> Dict[str, int]:
+    """在内存中处理一个已载入的 JSON，并打印报告（可选写完整报告 TXT）；不落盘。返回 process 的计数。"""
+    warnings: List[str] = []  # 每个文件独立告警
+    stats: Dict[str, int] = {}
+    report = PRINT_DETAILS or WRITE_FULL_REPORT
+    lines, backfills = process(doc, report=report, warnings=warnings, shift_positions=shift_positions, stats=stats)
+
+    # 控制台打印（回填块仅预览前 5 个）
+    for ln in _report_lines(lines, backfills, warnings, preview=5, report=report):
+        print(ln)
+
+    # 写入完整报告（如果开启） —— 一文件一报告
+    if WRITE_FULL_REPORT:
+        path = _maybe_write_full_report(_report_lines(lines, backfills, warnings), OUTPUT_DIR)
+        if path:
+            print(f"\n[已写入完整报告] {path}")
+        else:
+            print("\n[写入失败] 未生成完整报告文件")
+    return stats
+
+def _output_path(in_path: str, replace_source: bool, output_dir: str) -> str:
+    return in_path if replace_source else os.path.join(output_dir, os.path.basename(in_path))
+
+def process_file(in_path: str) -> str:
+    """处理单个 JSON：重排/平移/回填、打印报告、按开关落盘；返回实际写入的路径。"""
+    doc = load_json(in_path)
+    process_doc(doc, plan_positions(load_shift_plan(), in_path, SHIFT_POSITIONS) if ENABLE_SHIFT else [])
+
+    # 输出 JSON：由开关控制路径（对每个输入分别落盘）
+    out_path = _output_path(in_path, REPLACE_SOURCE, OUTPUT_DIR)
+    dump_json(doc, out_path)
+    print(f"\n已写入：{out_path}")
+    return out_path
+
+# ---------- 并行批处理 ----------
+def _batch_settings() -> Dict[str, Any]:
+    """主进程的开关打包传给子进程（Windows 下子进程重新导入本模块，看不到运行时改过的全局变量）。"""
+    return {
+        "replace_source": REPLACE_SOURCE,
+        "output_dir": OUTPUT_DIR,
+        "shift_positions": list(SHIFT_POSITIONS) if ENABLE_SHIFT else [],
+        "shift_plan": load_shift_plan() if ENABLE_SHIFT else {},
+        "report": BATCH_REPORT,
+    }
+
+def run_file(in_path: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """子进程：处理并写出一个文件；不打印、不读写模块级状态。返回计数、用时，报告开启时附完整报告文本。"""
+    t0 = time.perf_counter()
+    warnings: List[str] = []
+    stats: Dict[str, Any] = {}
+    doc = load_json(in_path)
+    positions = plan_positions(settings["shift_plan"], in_path, settings["shift_positions"])
+    lines, backfills = process(doc, report=settings["report"], warnings=warnings,
+                               shift_positions=positions, stats=stats)
+    out_path = _output_path(in_path, settings["replace_source"], settings["output_dir"])
+    dump_json(doc, out_path)
+    stats["warnings"] = len(warnings)
+    stats["out"] = out_path
+    stats["report"] = "\n".join(_report_lines(lines, backfills, warnings)) if settings["report"] else ""
+    stats["secs"] = time.perf_counter() - t0
+    return stats
+
+def run_batch(inputs: List[str]) -> None:
+    """进程池并行处理 inputs；各文件报告按完成顺序写入同一个 TXT，最后打印汇总表。"""
+    settings = _batch_settings()
+    workers = max(1, min(MAX_PROCESSES or os.cpu_count() or 1, len(inputs)))
+    sink = None
+    if settings["report"]:
+        try:
+            sink = open(_report_path(OUTPUT_DIR, "batch_report"), "w", encoding="utf-8")
+        except OSError as e:
+            print(f"[写报告失败] {e}；本次不生成明细")
+            settings["report"] = False
+    print(f"[并行] {workers} 个进程；报告：{sink.name if sink else '关闭'}")
+
+    t0 = time.perf_counter()
+    results: Dict[str, Dict[str, Any]] = {}
+    failed: List[Tuple[str, str]] = []
+    try:
+        for i, (path, res, err) in enumerate(scan_pool.scan_map(run_file, inputs, mode="process", workers=workers,
+                                                                 args=(settings,)), 1):
+            if err:
+                failed.append((path, err))
+                print(f"[{i}/{len(inputs)}] 失败：{path}：{err}")
+                continue
+            results[path] = res
+            if sink:
+                sink.write(f"{'=' * 80}\n[{i}/{len(inputs)}] {path}\n{res['report']}\n\n")
+    finally:
+        if sink:
+            sink.close()
+    wall = time.perf_counter() - t0
+
+    # 汇总表（按输入顺序）
+    cols = ("renamed", "shifted", "backfilled", "deprecated", "warnings")
+    print(f"\n{'文件':<40}{'重排':>6}{'平移':>6}{'回填':>6}{'弃用':>6}{'警告':>6}{'用时(ms)':>10}")
+    sums = dict.fromkeys(cols, 0)
+    for path in inputs:
+        res = results.get(path)
+        if res is None:
+            continue
+        for c in cols:
+            sums[c] += res[c]
+        name = os.path.basename(path)
+        print(f"{name[:39]:<40}" + "".join(f"{res[c]:>6}" for c in cols) + f"{res['secs'] * 1000:>10.1f}")
+    print(f"{f'合计 {len(results)} 个':<40}" + "".join(f"{sums[c]:>6}" for c in cols) + f"{wall * 1000:>10.1f}")
+    print(f"\n[完成] 成功 {len(results)} / 失败 {len(failed)} / 共 {len(inputs)}，"
+          f"用时 {wall:.2f}s（{len(inputs) / max(wall, 1e-9):.1f} 文件/s）")
+    if sink:
+        print(f"[已写入完整报告] {sink.name}")
+
 def main():
-    inputs = _gather_input_files(INPUT_JSON, INPUT_DIRS, SCAN_RECURSIVE)
+    input_warnings: List[str] = []
+    inputs = _gather_input_files(INPUT_JSON, INPUT_DIRS, SCAN_RECURSIVE, input_warnings)
+    for w in input_warnings:
+        print(w)
     if not inputs:
         print(f"[错误] 未找到可处理的 JSON。"
               f"{'请检查 INPUT_DIRS（递归目录模式）' if SCAN_RECURSIVE else '请检查 INPUT_JSON（单文件模式）'}")
         return
 
+    plan = load_shift_plan() if ENABLE_SHIFT else {}
+    if plan:
+        keys = {os.path.normcase(os.path.abspath(p)) for p in inputs} | {os.path.basename(p) for p in inputs}
+        missing = [k for k in plan if k not in keys]
+        print(f"[平移计划] {len(plan)} 项" + (f"；未在输入中找到：{missing[:10]}" if missing else ""))
+
     total_files = len(inputs)
     print(f"[提示] 模式={'目录递归' if SCAN_RECURSIVE else '单文件'}，本次处理 {total_files} 个文件。")
 
+    if SCAN_RECURSIVE and PARALLEL and total_files > 1:
+        run_batch(inputs)
+        return
+
     for i, in_path in enumerate(inputs, 1):
-        WARNINGS.clear()  # 每个文件独立告警
         print("\n" + "=" * 80)
         print(f"[{i}/{total_files}] 处理：{in_path}")
-
-        doc = load_json(in_path)
-        lines, backfills = process(doc)
-
-        # 预组合完整报告文本（用于可选落盘；格式与打印一致）
-        full_report = []
-        full_report.append("=== 处理报告 ===")
-        full_report.extend(lines)
-        if backfills:
-            full_report.append(f"[回填统计] 共 {len(backfills)} 个")
-            full_report.extend(backfills)
-
-        # 控制台打印（与 full_report 同格式）
-        print("=== 处理报告 ===")
-        for ln in lines:
-            print(ln)
-
-        if backfills:
-            print(f"[回填统计] 共 {len(backfills)} 个（仅显示前 5 个）")
-            preview = backfills[:5]
-            for blk in preview:
-                print(blk)
-        else:
-            print("[回填统计] 0 个")
-
-        # 警告汇总
-        print("\n=== 警告汇总 ===")
-        if WARNINGS:
-            for w in WARNINGS:
-                print(w)
-        else:
-            print("无警告")
-
-        # 写入完整报告（如果开启） —— 一文件一报告
-        if WRITE_FULL_REPORT:
-            all_lines = []
-            all_lines.extend(full_report)
-            all_lines.append("\n=== 警告汇总 ===")
-            if WARNINGS:
-                all_lines.extend(WARNINGS)
-            else:
-                all_lines.append("无警告")
-            path = _maybe_write_full_report(all_lines, OUTPUT_DIR)
-            if path:
-                print(f"\n[已写入完整报告] {path}")
-            else:
-                print("\n[写入失败] 未生成完整报告文件")
-
-        # 输出 JSON：由开关控制路径（对每个输入分别落盘）
-        out_path = in_path if REPLACE_SOURCE else os.path.join(OUTPUT_DIR, os.path.basename(in_path))
-        dump_json(doc, out_path)
-        print(f"\n已写入：{out_path}")
+        process_file(in_path)
 
     print("\n[完成] 所有文件已处理。")
 
@@ -2,21 +2,42 @@
 """
 功能：
 在所有文件夹及其子文件夹搜索指定的BuffID。
+USE_CORPUS_INDEX=True 时改为查询共享语料索引（corpus_index），只增量解析变更文件。
+EXECUTOR="process" 时全量扫描改用进程池（scan_pool）多核解析，子进程只回传是否命中。
+索引模式：
+  python find_buffid.py --build-index            只建立/刷新 BuffId 倒排索引
+  python find_buffid.py 2025910,2025900-2025966  批量查询（清单或闭区间），输出 文件 / export / JSON 路径
 """
 import os
+import re
 import sys
 import json
 from pathlib import Path
-from typing import Any, Iterable, List, Set, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Iterable, List, Optional, Set, Dict
+
+import json_io
+import scan_pool
 
 # ========= 顶部配置（你主要改这里） =========
 TARGET_BUFF_ID: int = 202572455         # 目标 buffid（命令行第1参可覆盖）
 TOP_N_PRINT: int = 11               # 控制台仅打印前 N 条（命令行第2参可覆盖）
 SAVE_OUTPUT: bool = False            # ←← 开关：是否把“全部命中列表”保存成 JSON 文件
 
+# 批量查询：逗号分隔的 ID 或闭区间，如 "2025910,2025911,2025900-2025966"（命令行第1参可覆盖）
+# 非空时进入批量模式（始终走语料索引：一次扫描，之后每个 ID 都是索引查找）
+BATCH_BUFF_IDS: str = ""
+# 单个区间最多展开的 ID 个数（防止手误如 2025900-20259660 展开上千万个 ID）；超出的区间报错并忽略
+MAX_ID_RANGE: int = 10000
+
 # 并行线程数（I/O 密集）
 MAX_WORKERS = min(32, (os.cpu_count() or 4) * 2)
+# 执行模式："thread" 线程池（原行为）；"process" 进程池（json 解析受 GIL 限制，多核时明显更快）
+EXECUTOR = "thread"
+# 进程模式的进程数；None = CPU 核数
+MAX_PROCESSES = None
+
+# True：使用共享语料索引（corpus_index.INDEX_PATH）查询；False：逐文件全量扫描
+USE_CORPUS_INDEX = False
 
 # 搜索目录（递归）
 SEARCH_DIRS: List[Path] = [
@@ -33,13 +54,20 @@ OUT_DIR = Path(r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles")
 
 
 # ---------- 参数解析 ----------
+BUILD_INDEX_ONLY = False  # 命令行 --build-index 打开
+
+
 def parse_args(argv: List[str]) -> None:
-    global TARGET_BUFF_ID, TOP_N_PRINT
+    global TARGET_BUFF_ID, TOP_N_PRINT, BATCH_BUFF_IDS, BUILD_INDEX_ONLY
+    if "--build-index" in argv:
+        BUILD_INDEX_ONLY = True
+        argv = [a for a in argv if a != "--build-index"]
     if len(argv) >= 2:
         try:
             TARGET_BUFF_ID = int(argv[1])
         except ValueError:
-            pass
+            # 不是单个整数就按批量清单处理；非法片段由 main 逐条报告
+            BATCH_BUFF_IDS = argv[1]
     if len(argv) >= 3:
         try:
             TOP_N_PRINT = max(1, int(argv[2]))
@@ -47,6 +75,43 @@ def parse_args(argv: List[str]) -> None:
             pass
 
 
+_ID_PART_RE = re.compile(r"^(-?\d+)(?:\s*-\s*(-?\d+))?$")
+
+
+def parse_id_spec(spec: str, errors: Optional[List[str]] = None) -> List[int]:
+    """
+    '1,2,10-12' -> [1, 2, 10, 11, 12]（去重保序）。
+    忽略的片段（格式不对、含负数、区间超过 MAX_ID_RANGE 个）把原因追加到 errors。
+    """
+    ids: List[int] = []
+    seen: Set[int] = set()
+    if errors is None:
+        errors = []
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        m = _ID_PART_RE.match(part)
+        if m is None:
+            errors.append(f"“{part}”不是 ID 或 起-止 区间")
+            continue
+        lo = int(m.group(1))
+        hi = int(m.group(2)) if m.group(2) is not None else lo
+        if lo < 0 or hi < 0:
+            errors.append(f"“{part}”含负数（BuffId 为非负整数）")
+            continue
+        if hi < lo:
+            lo, hi = hi, lo
+        if hi - lo + 1 > MAX_ID_RANGE:
+            errors.append(f"“{part}”区间含 {hi - lo + 1} 个 ID，超过上限 {MAX_ID_RANGE}（MAX_ID_RANGE），请检查是否手误")
+            continue
+        for v in range(lo, hi + 1):
+            if v not in seen:
+                seen.add(v)
+                ids.append(v)
+    return ids
+
+
 # ---------- 文件枚举 ----------
 def file_matches_prefixes(p: Path) -> bool:
     if not FILENAME_PREFIXES:
@@ -72,15 +137,7 @@ def iter_target_json_files(dirs: Iterable[Path]) -> List[Path]:
 
 # ---------- JSON 加载 ----------
 def load_json_loose(path: Path) -> Any:
-    try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        try:
-            with path.open("r", encoding="utf-8", errors="ignore") as f:
-                return json.loads(f.read())
-        except Exception:
-            return None
+    return json_io.load_loose(path)
 
 
 # ---------- BuffId/BuffIds 提取（仅凭这两个键） ----------
@@ -182,25 +239,78 @@ def file_contains_buffid(path: Path, target: int) -> bool:
     return node_contains_target_buff(obj, target)
 
 
+# ---------- 语料索引查询 ----------
+def query_index(buff_ids: Iterable[int]) -> Dict[int, List[tuple]]:
+    """刷新索引（只解析变更文件）后批量查询：buff_id -> [(path, export_no, json_path), ...]。"""
+    import corpus_index as ci
+    conn = ci.open_index()
+    try:
+        paths = ci.refresh(conn, SEARCH_DIRS, lambda fn: fn.endswith(FILE_EXT) and file_matches_prefixes(Path(fn)))
+        return ci.query_buff_refs(conn, buff_ids, paths)
+    finally:
+        conn.close()
+
+def search_with_index(target: int) -> List[Path]:
+    hits = query_index([target]).get(target, [])
+    return [Path(p) for p in sorted({h[0] for h in hits})]
+
+def run_batch(buff_ids: List[int]) -> None:
+    """批量模式：一次刷新索引，逐个 ID 打印命中（文件 / export 序号 / JSON 路径）。"""
+    result = query_index(buff_ids)
+    found = [b for b in buff_ids if result.get(b)]
+    print(f"批量查询 {len(buff_ids)} 个 buffid，命中 {len(found)} 个。")
+    for b in buff_ids:
+        hits = result.get(b, [])
+        if not hits:
+            print(f"\n[{b}] 未找到")
+            continue
+        n_files = len({h[0] for h in hits})
+        print(f"\n[{b}] {len(hits)} 处 / {n_files} 个文件（前 {TOP_N_PRINT} 处）：")
+        for i, (path, export_no, jp) in enumerate(hits[:TOP_N_PRINT], 1):
+            print(f"  {i}. {path}  export#{export_no}  {jp}")
+
+    if SAVE_OUTPUT and found:
+        OUT_DIR.mkdir(parents=True, exist_ok=True)
+        out_path = OUT_DIR / f"buffid_batch_{buff_ids[0]}_{buff_ids[-1]}_matches.json"
+        obj = {str(b): [{"file": p, "export": e, "path": jp} for p, e, jp in result[b]] for b in found}
+        with out_path.open("w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+        print(f"\n已写出全部命中到：{out_path}")
+
+
 # ---------- 主流程 ----------
 def main():
     parse_args(sys.argv)
 
+    if BUILD_INDEX_ONLY:
+        query_index([])
+        print("索引已刷新。")
+        return
+
+    if BATCH_BUFF_IDS:
+        errors: List[str] = []
+        batch_ids = parse_id_spec(BATCH_BUFF_IDS, errors)
+        for msg in errors:
+            print(f"[错误] 忽略片段：{msg}")
+        if not batch_ids:
+            print("[错误] 批量清单中没有有效的 ID。")
+            return
+        run_batch(batch_ids)
+        return
+
     files = iter_target_json_files(SEARCH_DIRS)
     if not files:
         print("未找到匹配的 JSON 文件。")
         return
 
     matches: List[Path] = []
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
-        fut_map = {ex.submit(file_contains_buffid, fp, TARGET_BUFF_ID): fp for fp in files}
-        for fut in as_completed(fut_map):
-            fp = fut_map[fut]
-            ok = False
-            try:
-                ok = fut.result()
-            except Exception:
-                ok = False
+    if USE_CORPUS_INDEX:
+        matches = search_with_index(TARGET_BUFF_ID)
+    else:
+        # 目标 ID 显式传入：命令行覆盖的 TARGET_BUFF_ID 在 Windows 子进程里看不到
+        workers = MAX_PROCESSES if EXECUTOR == "process" else MAX_WORKERS
+        for fp, ok, _ in scan_pool.scan_map(file_contains_buffid, files, mode=EXECUTOR, workers=workers,
+                                            args=(TARGET_BUFF_ID,)):
             if ok:
                 matches.append(fp)
 
@@ -8,7 +8,10 @@
 4) 修正 Exports[3:]：ClassIndex、TemplateIndex、SerializationBeforeCreateDependencies 指向正确的 Import 负索引。
 5) 最后一步再补齐 NameMap：
    - 追加所有 Import 的 (ObjectName / ClassPackage / ClassName)；
-   - 同时对照 namemap_all.txt，将“总表里有、文件中出现但 NameMap 没有”的条目补到末尾。
+   - 同时对照 namemap_all.txt，将“总表里有、文件中出现但 NameMap 没有”的条目补到末尾；
+     总表用 namemap_table 编译成 .nmt 后 mmap 载入，目录模式下所有文件共用一份，.txt 改动后自动重编译；
+     “文件中出现”只看会进 NameMap 的字段（Name / StructType / ArrayType / EnumType / ObjectName / 软引用路径 /
+     $type 中的 Property 类型 / NameProperty 等的值），不再收集整份文档的所有字符串（TARGETED_NAME_SCAN）。
 6) 若选择写回源文件且启用备份，则在写回前生成原文件 .bak。
 7) 文件夹功能：
     A) 目录遍历（可配多个根目录，递归子目录）。
@@ -16,13 +19,15 @@
     C) 开关：ENABLE_DIR_TRAVERSAL=True 时仅目录模式；False 时保持原单文件模式。
 """
 
-import json
 import os
 import re
 from copy import deepcopy
 from typing import Any, Dict, List, Tuple, Optional, Set, Union, Iterable
 from pathlib import Path
 
+import json_io
+import namemap_table
+
 # ======================================================================
 # 配置
 # ======================================================================
@@ -56,6 +61,10 @@ NAMEMAP_TXT = Path(r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles
 # 仅用于 Import.OuterIndex 归一化 的目标函数名前缀
 TARGET_PREFIXES = ("JHGEExtAct_", "JHExecutionPhase_", "JHGEExtReq_")
 
+# NameMap 总表对比时：True 只看可能进入 NameMap 的字段（collect_name_candidates）；
+# False 按旧方式收集文件中所有键和字符串值，并对每个字符串做 Property 记号正则（collect_all_strings）
+TARGETED_NAME_SCAN = True
+
 # ======================================================================
 # 基本 I/O
 # ======================================================================
@@ -63,13 +72,10 @@ TARGET_PREFIXES = ("JHGEExtAct_", "JHExecutionPhase_", "JHGEExtReq_")
 def load_json(path: str) -> Dict[str, Any]:
     if not os.path.isfile(path):
         raise FileNotFoundError(f"找不到输入文件：{path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_io.load(path)
 
 def save_json(obj: Any, out_path: str) -> None:
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
+    json_io.dump(obj, out_path)
 
 # ======================================================================
 # Imports / Exports 解析
@@ -178,11 +184,14 @@ def unify_import_outerindex(imports: List[Dict[str, Any]], target_neg_index: int
             changed_names.append(name)
     return changed, changed_names
 
-def collect_used_main_functions(exports: List[Dict[str, Any]]) -> Set[str]:
-    """从 Exports[3:] 统计本文件用到的“主函数基名”集合。"""
+def collect_used_main_functions(exports: List[Any]) -> Set[str]:
+    """
+    从 Exports[3:] 统计本文件用到的“主函数基名”集合。
+    只看 ObjectName：元素可以是 dict，也可以是 uasset_model.Document.load_lazy 的 Export（不解析 Data）。
+    """
     used: Set[str] = set()
     for exp in exports[3:]:
-        obj_name = exp.get("ObjectName")
+        obj_name = exp.get("ObjectName") if isinstance(exp, dict) else getattr(exp, "object_name", None)
         if not isinstance(obj_name, str) or not obj_name:
             continue
         base = base_from_object_name(obj_name)
@@ -195,8 +204,7 @@ def load_main_imports_map(path: str) -> Dict[str, List[Dict[str, Any]]]:
     """读取上游生成的 { pure_main_fn: [main_import_obj, default_import_obj, ...] }。"""
     if not os.path.isfile(path):
         raise FileNotFoundError(f"找不到主函数 Imports 映射文件：{path}")
-    with open(path, "r", encoding="utf-8") as f:
-        obj = json.load(f)
+    obj = json_io.load(path)
     return obj if isinstance(obj, dict) else {}
 
 def append_missing_imports_for_mains(
@@ -266,10 +274,7 @@ def ensure_strings_in_namemap(data: Dict[str, Any], strings: List[str]) -> int:
             added += 1
     return added
 
-def canon_property(s: str) -> str:
-    if not isinstance(s, str): return s
-    s = s.strip()
-    return re.sub(r'PropertyData$', 'Property', s) if s else s
+canon_property = namemap_table.canon_property
 
 _prop_token_re = re.compile(r'[A-Za-z_][A-Za-z0-9_]*Property(?:Data)?')
 
@@ -277,6 +282,82 @@ def extract_property_like_tokens(text: str) -> Set[str]:
     if not isinstance(text, str): return set()
     return set(_prop_token_re.findall(text))
 
+# 值为 FName（会进 NameMap）的字段；$type 另行从中取出 XxxProperty 记号
+NAME_FIELDS = ("Name", "StructType", "ArrayType", "EnumType", "InnerType", "KeyType", "ValueType",
+               "ObjectName", "ClassPackage", "ClassName", "PackageName",   # Exports / Imports
+               "AssetPathName", "AssetName",                               # 软引用路径
+               "Delegate")                                                 # FDelegate 的函数名
+# 这些属性的 Value 本身是 FName（或 FName 列表）
+NAME_VALUE_TYPES = ("NamePropertyData", "EnumPropertyData", "BytePropertyData", "GameplayTagContainerPropertyData")
+# 这些结构的 Path 是 FName 列表（FieldPathPropertyData.Value，GE Modifier 的 GameplayAttribute 属性名）
+NAME_PATH_TYPES = ("FFieldPath",)
+# 这些 StrProperty 的 Value 与 NameMap 中的 FName 同名（GameplayAttribute.AttributeName 与 FieldPath 成对出现）
+NAME_STR_PROPS = ("AttributeName",)
+
+_NAME_FIELD_SET = frozenset(NAME_FIELDS)
+_NAME_STR_PROP_SET = frozenset(NAME_STR_PROPS)
+_CANON_CACHE: Dict[str, str] = {}                            # 规范化结果全程缓存（跨文件复用）
+_TYPE_CACHE: Dict[str, Tuple[frozenset, bool, bool, bool]] = {}
+# $type -> (其中 Property 记号的规范形, Value 是否为 FName, Path 是否为 FName 列表, 是否 StrProperty)
+
+def _type_info(t: str) -> Tuple[frozenset, bool, bool, bool]:
+    info = _TYPE_CACHE.get(t)
+    if info is None:
+        toks = frozenset(canon_property(tok) for tok in extract_property_like_tokens(t))
+        short = t.split(",", 1)[0].rsplit(".", 1)[-1]
+        info = _TYPE_CACHE[t] = (toks, short in NAME_VALUE_TYPES, short in NAME_PATH_TYPES, short == "StrPropertyData")
+    return info
+
+def collect_name_candidates(obj: JSONType) -> Set[str]:
+    """
+    只取可能进入 NameMap 的字段（NAME_FIELDS、$type 中的 Property 记号、FName 类属性的 Value、
+    FFieldPath 的 Path、NAME_STR_PROPS 的 StrProperty 值），
+    直接返回规范形集合；与 collect_all_strings + 逐串正则相比不碰其它字符串，
+    遍历时只收原始字符串，最后对去重后的字符串规范化（带缓存）。
+    """
+    raw: Set[str] = set()
+    types: Set[str] = set()
+    fields = _NAME_FIELD_SET
+    stack = [obj]
+    push, pop = stack.append, stack.pop
+    while stack:
+        o = pop()
+        if type(o) is dict:
+            t = o.get("$type")
+            name_value = name_path = False
+            if type(t) is str:
+                types.add(t)
+                _, name_value, name_path, is_str = _type_info(t)
+                if is_str and o.get("Name") in _NAME_STR_PROP_SET:
+                    name_value = True
+            for k, v in o.items():
+                tv = type(v)
+                if tv is str:
+                    if k in fields or (name_value and k == "Value"):
+                        raw.add(v)
+                elif tv is dict:
+                    push(v)
+                elif tv is list:
+                    if (name_value and k == "Value") or (name_path and k == "Path"):
+                        raw.update(x for x in v if type(x) is str)
+                    push(v)
+        else:
+            for x in o:
+                tx = type(x)
+                if tx is dict or tx is list:
+                    push(x)
+
+    found: Set[str] = set()
+    for t in types:
+        found |= _type_info(t)[0]
+    cache = _CANON_CACHE
+    for s in raw:
+        cs = cache.get(s)
+        if cs is None:
+            cs = cache[s] = canon_property(s)
+        found.add(cs)
+    return found
+
 def collect_all_strings(obj: JSONType) -> Set[str]:
     """抽取 JSON 中出现过的所有字符串（键、值、嵌套）"""
     found: Set[str] = set()
@@ -301,18 +382,50 @@ def load_lines(path: Path) -> List[str]:
                 lines.append(s)
     return lines
 
+def table_entries_to_add(data: Dict[str, Any],
+                         nm_lines: Union[List[str], namemap_table.NameTable],
+                         targeted: Optional[bool] = None) -> List[str]:
+    """
+    “总表里有、文件中出现但 NameMap 没有”的条目（按总表顺序，同一规范形只取一条）；不修改 data。
+    targeted 为 None 时按 TARGETED_NAME_SCAN。
+    """
+    # 生成“文件内出现过的字符串”的标准化集合
+    if TARGETED_NAME_SCAN if targeted is None else targeted:
+        all_json_canon: Set[str] = collect_name_candidates(data)
+    else:
+        all_json_canon = set()
+        for s in collect_all_strings(data):
+            all_json_canon.add(canon_property(s))
+            for tok in extract_property_like_tokens(s):
+                all_json_canon.add(canon_property(tok))
+
+    _, nm_list = get_namemap_key_and_list(data)
+    existing_canon: Set[str] = {canon_property(s) for s in nm_list if isinstance(s, str)}
+
+    if isinstance(nm_lines, namemap_table.NameTable):
+        # 只对文件里出现过的规范形查哈希索引，结果与下面的逐行比较相同
+        return nm_lines.missing_for(all_json_canon, existing_canon)
+    out: List[str] = []
+    for s in nm_lines:
+        cs = canon_property(s)
+        if cs in all_json_canon and cs not in existing_canon:
+            out.append(s)
+            existing_canon.add(cs)
+    return out
+
 # ======================================================================
 # 单文件处理逻辑封装（保持原流程不变）
 # ======================================================================
 
-def process_one_json_file(input_path: str) -> str:
+def fix_document(data: Dict[str, Any],
+                 main_imports_map: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 nm_lines: Optional[Union[List[str], namemap_table.NameTable]] = None) -> None:
     """
-    处理单个 JSON 文件；完全沿用原 main() 的顺序与逻辑。
-    返回：实际写入的输出路径（或源路径）。
+    在内存中对已载入的 JSON 执行全部修正步骤（不读写文件）。
+    main_imports_map 为 None 时按配置路径现读；批量处理时可预先载入后传入，避免每个文件重读。
+    nm_lines 为 None 时取 NAMEMAP_TXT 的编译总表（namemap_table，进程内共享，.txt 变了自动重编译）；
+    也可传入总表行列表（逐行比较，与旧行为相同）。
     """
-    # 读取 JSON
-    data = load_json(input_path)
-
     # -------- Exports & Imports 基础 -------
     exports = get_exports_list(data)
     if not exports:
@@ -323,11 +436,12 @@ def process_one_json_file(input_path: str) -> str:
     print(f"[扫描] 本文件用到的主函数种类：{len(used_mains)}")
 
     # (2) 从映射补齐缺失 Imports（主库→Default）
-    try:
-        main_imports_map = load_main_imports_map(MAIN_IMPORTS_MAP_PATH)
-    except FileNotFoundError as e:
-        main_imports_map = {}
-        print(f"[警告] {e}；跳过 Import 补齐。")
+    if main_imports_map is None:
+        try:
+            main_imports_map = load_main_imports_map(MAIN_IMPORTS_MAP_PATH)
+        except FileNotFoundError as e:
+            main_imports_map = {}
+            print(f"[警告] {e}；跳过 Import 补齐。")
 
     if main_imports_map:
         added = append_missing_imports_for_mains(data, used_mains, main_imports_map)
@@ -402,37 +516,28 @@ def process_one_json_file(input_path: str) -> str:
     added1 = ensure_strings_in_namemap(data, nm_from_imports)
 
     # (NM-2) 再按 namemap_all.txt 与“文件出现过的字符串”对比补齐
-    try:
-        nm_lines = load_lines(NAMEMAP_TXT)
-    except Exception as e:
-        nm_lines = []
-        print(f"[NameMap] 加载总表失败（{e}），跳过总表对比阶段。")
-
-    # 生成“文件内出现过的字符串”的标准化集合
-    all_json_strings: Set[str] = collect_all_strings(data)
-    all_json_canon: Set[str] = set()
-    for s in all_json_strings:
-        all_json_canon.add(canon_property(s))
-        for tok in extract_property_like_tokens(s):
-            all_json_canon.add(canon_property(tok))
-
-    # 仅把“总表里有、文件中出现但 NameMap 没有”的条目追加
-    _, nm_list = get_namemap_key_and_list(data)
-    existing_exact: Set[str] = {s for s in nm_list if isinstance(s, str)}
-    existing_canon: Set[str] = {canon_property(s) for s in existing_exact}
-
-    to_add_from_table: List[str] = []
-    for s in nm_lines:
-        cs = canon_property(s)
-        if cs in all_json_canon and cs not in existing_canon:
-            to_add_from_table.append(s)
-            existing_canon.add(cs)
-
+    if nm_lines is None:
+        try:
+            nm_lines = namemap_table.load_table(NAMEMAP_TXT)
+        except Exception as e:
+            nm_lines = []
+            print(f"[NameMap] 加载总表失败（{e}），跳过总表对比阶段。")
+
+    to_add_from_table = table_entries_to_add(data, nm_lines)
     added2 = ensure_strings_in_namemap(data, to_add_from_table)
 
     print(f"[NameMap] 追加（from imports）: {added1} 条；追加（from total table）: {added2} 条。")
 
-    # ====================== 写回 / 备份 ======================
+def write_result(data: Dict[str, Any], input_path: str, out_path: Optional[str] = None) -> str:
+    """
+    写回 / 备份：out_path 给定时直接写到该路径（如目录镜像）；
+    否则按 WRITE_TO_SOURCE 覆盖源文件（可备份）或写到 FIXED_OUTPUT_DIR/文件名。
+    """
+    if out_path is not None:
+        save_json(data, out_path)
+        print(f"[完成] 已写出：{out_path}")
+        return out_path
+
     basename = os.path.basename(input_path)
     if WRITE_TO_SOURCE:
         # 备份
@@ -456,6 +561,15 @@ def process_one_json_file(input_path: str) -> str:
     print(f"[完成] 已写回：{out_path}")
     return out_path
 
+def process_one_json_file(input_path: str, out_path: Optional[str] = None) -> str:
+    """
+    处理单个 JSON 文件；完全沿用原 main() 的顺序与逻辑。
+    返回：实际写入的输出路径（或源路径）。
+    """
+    data = load_json(input_path)
+    fix_document(data)
+    return write_result(data, input_path, out_path)
+
 # ======================================================================
 # 目录遍历工具
 # ======================================================================
@@ -494,7 +608,6 @@ def _calc_output_path_for_mirroring(src_path: str, root_dir: str) -> str:
 # ======================================================================
 
 def main():
-    global WRITE_TO_SOURCE
     if ENABLE_DIR_TRAVERSAL:
         # -------- 目录模式：只处理目录，忽略单文件 INPUT_PATH --------
         print("[模式] 目录遍历：启用")
@@ -505,34 +618,14 @@ def main():
             print(f"\n[处理] {json_path}")
             # 单次输出路径策略：
             # - WRITE_TO_SOURCE=True: 就地覆盖（与单文件逻辑一致）
-            # - WRITE_TO_SOURCE=False: 按 root_dir 镜像到 FIXED_OUTPUT_DIR
+            # - WRITE_TO_SOURCE=False: 按 root_dir 镜像到 FIXED_OUTPUT_DIR（一次读、一次写）
             if WRITE_TO_SOURCE:
                 _ = process_one_json_file(json_path)
                 done += 1
             else:
-                # 临时改写 save 目的地：通过临时切换全局 FIXED_OUTPUT_DIR 的使用点来实现镜像输出
-                # 为保持“单文件逻辑不改”，这里采用：处理完后再把结果写到镜像路径
-                # 具体做法：直接在处理函数中按“单文件模式（False）”生成结果到 FIXED_OUTPUT_DIR/文件名，
-                # 但为了严格镜像，我们这里再读回并写到镜像路径。
-                # ——为减少 I/O，我们直接在此处实现“镜像写回”版本：
                 try:
-                    data = load_json(json_path)  # 读源
-                    # 复用完整处理流水线，但不写盘；为保持最小侵入，这里简单复制 process_one_json_file 的主体：
-                    # ------- 以下直接调用主体代码（简化：把 process_one_json_file 拆分将很侵入，这里复用并重写输出）-------
-                    # 为不重复逻辑，这里再调用一次，但把最终写回交给我们：
-                    # 实际更优方案是把“处理”和“写回”分离；为满足“不改变既有逻辑”，我们尽量少动。
-                    # 简洁起见：直接调用处理函数产生到默认 FIXED_OUTPUT_DIR/basename，然后再移动到镜像路径。
-                    # 但移动需要知道那个默认路径名：
-                    basename = os.path.basename(json_path)
-                    # 暂时保留现场配置
-                    old_write = WRITE_TO_SOURCE
-                    WRITE_TO_SOURCE = False
-                    tmp_out = process_one_json_file(json_path)  # 写到 FIXED_OUTPUT_DIR / basename
-                    WRITE_TO_SOURCE = old_write
-                    # 读取临时输出，写到镜像路径
-                    tmp_data = load_json(tmp_out)
                     mirror_out = _calc_output_path_for_mirroring(json_path, root_dir)
-                    save_json(tmp_data, mirror_out)
+                    process_one_json_file(json_path, out_path=mirror_out)
                     print(f"[镜像输出] {mirror_out}")
                     done += 1
                 except Exception as e:
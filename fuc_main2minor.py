@@ -3,11 +3,17 @@
 功能（当前版本）：
 1) 扫描主→次函数“次要函数结构块”(dict)
 2) 功能等价去重（忽略 Value 等易变字段；策略：keep_first / keep_last / empty_value）
-3) 学习“常用次序记忆”（统计相对先后），可选地累计到 fc_order_memory.json（由 ENABLE_MEMORY 控制）
+3) 学习“常用次序记忆”（统计相对先后），可选地累计到 fc_order_memory.fom（由 ENABLE_MEMORY 控制）；
+   统计与 Copeland 排序由 order_stats.OrderStats 完成（键驻留为整数编号 + 计数矩阵，装有 NumPy 时整块运算）；
+   记忆为紧凑二进制（共用键表 + 稀疏计数，zlib 压缩），旧版 fc_order_memory.json 在首次运行时自动迁移并修复损坏的键
 4) 导出主→次“完整模板”：fc_main2minor.json
    - 在扫描过程中为每个主函数“自主拷贝”其遇到的第一个 NormalExport 作为模板
    - 仅替换该模板的 Data 为“记忆排序后的全部次要函数块”（其它字段原样保留）
 5) 导出主函数对应的 Imports（含 Default 库）：fc_main_imports.json
+6) USE_CORPUS_INDEX=True 时借助共享语料索引：只解析含主函数 Export 的文件，Imports 直接从索引读取
+7) EXECUTOR="process" 时用进程池（scan_pool）多核解析；未启用文件缓存时子进程只回传主函数清单内的结果
+8) USE_FILE_CACHE=True 时逐文件缓存解析结果（scan_cache，SQLite）：条目带结果格式版本与去重策略标签并做结构检查，
+   过期条目按未命中重新解析；只写回本次重新解析的文件
 """
 
 import os
@@ -15,8 +21,12 @@ import re
 import json
 import sys
 import copy
-from typing import Any, Dict, List, Set, Iterable, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set, Iterable, Tuple
+
+import json_io
+import scan_cache
+import scan_pool
+from order_stats import OrderStats, load_memory, save_memory
 
 # ======================================================================
 #                                配置区（自定义优先，聚类排布）
@@ -42,13 +52,18 @@ MAIN_FUNCTIONS_TXT = r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfil
 OUTPUT_TO_SPECIFIED_DIR = True # True：输出在指定目录；False：脚本目录
 SPECIFIED_OUTPUT_DIR = r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles"
 OUT_JSON_NAME      = "fc_main2minor.json"        # 主→次：完整模板（每主函数恰好一个）
-OUT_CACHE_NAME     = "fc_scan_cache.json"        # 扫描缓存（可选）
-ORDER_MEMORY_NAME  = "fc_order_memory.json"      # 顺序记忆（可选）
+OUT_CACHE_NAME     = "fc_scan_cache.sqlite"      # 扫描缓存（可选，逐文件）
+CACHE_FORMAT       = 8                           # parse_file_build_index 结果格式版本：结构变化时递增，旧条目自动失效
+ORDER_MEMORY_NAME  = "fc_order_memory.fom"       # 顺序记忆（可选，二进制）
+LEGACY_MEMORY_NAME = "fc_order_memory.json"      # 旧版顺序记忆：新文件不存在时自动迁移（原文件保留）
 OUT_IMPORTS_NAME   = "fc_main_imports.json"      # 主/Default Imports
 
 # ——【运行模式 / 性能】———————————————————————————————————————
 USE_FILE_CACHE = False           # True: 启用文件级缓存（未变更文件复用）
+USE_CORPUS_INDEX = False         # True: 用共享语料索引预筛文件、读取 Imports（corpus_index.INDEX_PATH）
 MAX_WORKERS = None               # 并行线程数（None=自动）
+EXECUTOR = "thread"              # "thread"：线程池；"process"：进程池（解析受 GIL 限制，多核时明显更快）
+MAX_PROCESSES = None             # 进程模式的进程数（None=CPU 核数）
 DEDUP_STRATEGY = 'keep_first'    # keep_first / keep_last / empty_value
 
 # ——【内部常量】———————————————————————————————————————————————
@@ -123,15 +138,7 @@ def sanitize(s: str) -> str:
     return QUOTE_RE.sub("", s)
 
 def load_json_loose(path: str) -> Any:
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                return json.loads(f.read())
-        except Exception:
-            return None
+    return json_io.load_loose(path)
 
 def extract_exports(obj: Any) -> List[dict]:
     """提取 Exports 列表。"""
@@ -223,66 +230,41 @@ def collect_minor_structs_from_data(data_list: Any) -> Tuple[List[dict], List[tu
 # 顺序记忆（可选）
 # ======================================================================
 
-def update_order_stats(stats: Dict[str, Dict[str, int]], seq: List[tuple]) -> None:
-    sseq = [fk_to_str(k) for k in seq]
-    n = len(sseq)
-    for i in range(n):
-        ki = sseq[i]
-        row = stats.setdefault(ki, {})
-        for j in range(i + 1, n):
-            kj = sseq[j]
-            row[kj] = row.get(kj, 0) + 1
-
-def derive_order_from_stats(stats: Dict[str, Dict[str, int]]) -> List[str]:
-    keys = list(stats.keys())
-    for a in keys:
-        for b in keys:
-            if a == b: continue
-            stats.setdefault(a, {}).setdefault(b, 0)
-            stats.setdefault(b, {}).setdefault(a, 0)
-    copeland: Dict[str, int] = {}
-    avg_rank: Dict[str, float] = {}
-    for a in keys:
-        wins = losses = 0
-        rank_sum = total = 0
-        for b in keys:
-            if a == b: continue
-            wa = stats[a].get(b, 0)
-            wb = stats[b].get(a, 0)
-            if wa > wb: wins += 1
-            elif wa < wb: losses += 1
-            if wa + wb > 0:
-                rank_sum += (wb / (wa + wb))
-                total += 1
-        copeland[a] = wins - losses
-        avg_rank[a] = (rank_sum / total) if total > 0 else 0.5
-    keys.sort(key=lambda k: (-copeland[k], avg_rank[k], k))
-    return keys
-
 def load_json(path: str) -> Dict[str, Any]:
     if os.path.isfile(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+        data = json_io.load_loose(path)
+        return data if data is not None else {}
     return {}
 
 def save_json(path: str, data: Dict[str, Any]) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    json_io.dump(data, path)
 
 # ======================================================================
 # 单文件解析（返回：去重块、首次顺序、以及“首个模板”）
 # ======================================================================
 
-def parse_file_build_index(path: str) -> Dict[str, Any]:
+def cache_tag() -> str:
+    """缓存条目的结果标签：格式版本 + 会改变单文件结果的配置（去重策略）。"""
+    return f"{CACHE_FORMAT}:{DEDUP_STRATEGY}"
+
+def is_valid_file_index(res: Any) -> bool:
+    """parse_file_build_index 结果的结构检查（旧版缓存里是“主函数 -> 字段名列表”，在这里被拒绝）。"""
+    if not isinstance(res, dict):
+        return False
+    for obj in res.values():
+        if not (isinstance(obj, dict) and isinstance(obj.get("blocks"), dict) and isinstance(obj.get("orders"), list)
+                and all(isinstance(seq, list) for seq in obj["orders"])
+                and (obj.get("first_template") is None or isinstance(obj["first_template"], dict))):
+            return False
+    return True
+
+def parse_file_build_index(path: str, keep: Optional[Set[str]] = None) -> Dict[str, Any]:
     """
     返回：{ pure_fn: { "blocks": {key_str: block},
                       "orders": [ [key_str,...], ... ],
                       "first_template": dict or None } }
     - first_template：该文件内该主函数“遇到的第一个 NormalExport”（深拷贝）
+    - keep：只保留这些纯净名（None=全部）；进程模式下减少回传量
     """
     obj = load_json_loose(path)
     if obj is None:
@@ -297,7 +279,7 @@ def parse_file_build_index(path: str) -> Dict[str, Any]:
 
     for ex in exports:
         pure = purify_func_name(ex.get("ObjectName", ""))
-        if not pure:
+        if not pure or (keep is not None and pure not in keep):
             continue
 
         # 先记录首个模板（只要纯净名匹配、且还没存过）
@@ -358,6 +340,52 @@ def collect_main_imports(files: List[str], main_set: Set[str]) -> Dict[str, List
                 seen.add(want)
     return result
 
+def collect_main_imports_from_index(files: List[str], main_set: Set[str], imports_by_file: Dict[str, List[dict]]) -> Dict[str, List[dict]]:
+    """与 collect_main_imports 相同的规则，但 Imports 来自语料索引。"""
+    result: Dict[str, List[dict]] = {m: [] for m in main_set}
+    seen_by_main: Dict[str, Set[str]] = {m: set() for m in main_set}
+    for fp in files:
+        imports = imports_by_file.get(os.path.normpath(os.path.abspath(fp)))
+        if not imports:
+            continue
+        idx: Dict[str, dict] = {}
+        for imp in imports:
+            if isinstance(imp, dict) and "ObjectName" in imp:
+                idx.setdefault(imp["ObjectName"], imp)
+        for m in main_set:
+            for want in (m, f"Default__{m}"):
+                imp = idx.get(want)
+                if not imp:
+                    continue
+                seen = seen_by_main[m]
+                if want in seen:
+                    continue
+                result[m].append(imp)
+                seen.add(want)
+    return result
+
+def query_corpus_index(files: List[str], main_set: Set[str]) -> Tuple[Set[str], Dict[str, List[dict]]]:
+    """
+    从语料索引得到：
+      - 含主函数 Export 的文件集合（其余文件解析结果与主函数无关，可跳过）
+      - 各文件的 Imports 原始对象
+    """
+    import corpus_index as ci
+    conn = ci.open_index()
+    try:
+        ci.refresh(conn, SEARCH_DIRS, lambda fn: fn.lower().endswith(FILE_EXT) and file_matches_prefixes(fn, FILENAME_PREFIXES))
+        paths = [os.path.normpath(os.path.abspath(fp)) for fp in files]
+        rows_by_file = ci.query_values(conn, paths, (ci.K_EXPORT,))
+        imports_by_file = ci.load_imports(conn, paths)
+    finally:
+        conn.close()
+    relevant: Set[str] = set()
+    for fp, norm in zip(files, paths):
+        rows = rows_by_file.get(norm)
+        if rows is None or any(purify_func_name(v) in main_set for _, v, _ in rows):
+            relevant.add(fp)  # 索引解析失败的文件照常交给 parse_file_build_index
+    return relevant, imports_by_file
+
 # ======================================================================
 # 交互（命令行 / GUI）
 # ======================================================================
@@ -509,42 +537,43 @@ def main():
             sys.exit(0)
 
         # ——缓存与签名（可选）——
-        cache = load_json(cache_path) if USE_FILE_CACHE else {}
-        cache_index: Dict[str, Any] = cache.get("index", {}) if isinstance(cache, dict) else {}
-        cache_sig: Dict[str, Any] = cache.get("signatures", {}) if isinstance(cache, dict) else {}
-
-        to_parse: List[str] = []
-        new_signatures: Dict[str, List[float]] = {}
-        for fp in files:
-            st = os.stat(fp); sig = [st.st_size, st.st_mtime]
-            new_signatures[fp] = sig
-            if not USE_FILE_CACHE or cache_sig.get(fp) != sig:
-                to_parse.append(fp)
+        relevant: Set[str] = set(files)
+        imports_by_file: Dict[str, List[dict]] = {}
+        if USE_CORPUS_INDEX:
+            relevant, imports_by_file = query_corpus_index(files, main_set)
+            print(f"[索引] 含主函数的文件：{len(relevant)} / {len(files)}")
+
+        # 不在 relevant 里的文件不查也不写：缓存里不能留下依赖主函数清单的空结果
+        signatures = {fp: scan_cache.file_signature(fp) for fp in files if fp in relevant}
+        perfile_index: Dict[str, Dict[str, Any]] = {}
+        cache = None
+        if USE_FILE_CACHE:
+            cache = scan_cache.ScanCache(cache_path, tag=cache_tag(), validate=is_valid_file_index)
+            perfile_index = cache.get_many({fp: sig for fp, sig in signatures.items() if sig is not None})
+            print(f"[缓存] 命中 {len(perfile_index)} / {len(signatures)}" + (f"（过期 {cache.stale}）" if cache.stale else ""))
+        to_parse = [fp for fp in files if fp in signatures and fp not in perfile_index]
 
         # ——解析（并行）——
-        perfile_index: Dict[str, Dict[str, Any]] = {}
         if to_parse:
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
-                futs = {ex.submit(parse_file_build_index, fp): fp for fp in to_parse}
-                for fut in as_completed(futs):
-                    fp = futs[fut]
-                    try:
-                        perfile_index[fp] = fut.result() or {}
-                    except Exception:
-                        perfile_index[fp] = {}
-        if USE_FILE_CACHE:
-            for fp in files:
-                if fp not in perfile_index:
-                    old = cache_index.get(fp)
-                    if isinstance(old, dict):
-                        perfile_index[fp] = old
+            # 缓存的单文件结果不能依赖主函数清单，启用缓存时不过滤
+            keep = None if USE_FILE_CACHE else frozenset(main_set)
+            workers = MAX_PROCESSES if EXECUTOR == "process" else MAX_WORKERS
+            for fp, res, _ in scan_pool.scan_map(parse_file_build_index, to_parse, mode=EXECUTOR,
+                                                 workers=workers, args=(keep,)):
+                perfile_index[fp] = res or {}
+        if cache is not None:
+            # 只写回本次重新解析的文件；读不到签名（解析期间被删）的不写
+            cache.put_many((fp, signatures[fp], perfile_index[fp]) for fp in to_parse if signatures[fp] is not None)
+            cache.close()
 
         # ——顺序统计：本次与历史（由 ENABLE_MEMORY 控制是否累计保存）——
-        order_memory = load_json(order_mem_path) if ENABLE_MEMORY else {}
-        total_pairs_before = sum(sum(row.values()) for v in order_memory.values() for row in v.get("pairwise", {}).values()) if ENABLE_MEMORY else 0
+        if ENABLE_MEMORY:
+            mem_stats, mem_orders = load_memory(order_mem_path, legacy_json=os.path.join(out_dir, LEGACY_MEMORY_NAME))
+        else:
+            mem_stats, mem_orders = {}, {}
 
         global_key2blk: Dict[str, Dict[str, dict]] = {m: {} for m in main_set}
-        pairwise_stats_now: Dict[str, Dict[str, Dict[str, int]]] = {}
+        seqs_now: Dict[str, List[List[str]]] = {}
         global_first_template: Dict[str, dict] = {}
 
         for fp in files:
@@ -570,33 +599,20 @@ def main():
                     else:
                         bucket[k_str] = blk
 
-                # 3) 本次顺序统计
-                orders_list = obj.get("orders", [])
-                stats = pairwise_stats_now.setdefault(pure_fn, {})
-                for sseq in orders_list:
+                # 3) 本次顺序（先收集，相同序列在统计引擎里合并计数）
+                seqs = seqs_now.setdefault(pure_fn, [])
+                for sseq in obj.get("orders", []):
                     filtered = [k for k in sseq if k in bucket]
                     if len(filtered) >= 2:
-                        update_order_stats(stats, [str_to_fk(k) for k in filtered])
+                        seqs.append(filtered)
 
-        # ——合并历史记忆（可选）——
-        pairwise_stats_final: Dict[str, Dict[str, int]] = {}
-        for pure_fn, stats_now in pairwise_stats_now.items():
-            if ENABLE_MEMORY:
-                mem_entry = order_memory.get(pure_fn, {})
-                stats_mem = mem_entry.get("pairwise", {})
-                # 累计保存
-                for a_str, row in stats_now.items():
-                    grow = stats_mem.setdefault(a_str, {})
-                    for b_str, cnt in row.items():
-                        grow[b_str] = grow.get(b_str, 0) + cnt
-                order_memory[pure_fn] = {"pairwise": stats_mem}
-                pairwise_stats_final[pure_fn] = stats_mem
-            else:
-                # 不保存到文件，只使用“本次”的统计排序
-                merged: Dict[str, Dict[str, int]] = {}
-                for a_str, row in stats_now.items():
-                    merged[a_str] = dict(row)
-                pairwise_stats_final[pure_fn] = merged
+        # ——统计 + 合并历史记忆（可选）——
+        pairwise_stats_final: Dict[str, OrderStats] = {}
+        for pure_fn, seqs in seqs_now.items():
+            # 记忆关闭时 mem_stats 为空：不保存到文件，只使用“本次”的统计排序
+            stats = mem_stats.get(pure_fn) or OrderStats()
+            stats.add_sequences(seqs)
+            pairwise_stats_final[pure_fn] = stats
 
         # ——推导记忆顺序并产出“仅结构块”的映射（中间产物）——
         final_map_blocks: Dict[str, List[dict]] = {}
@@ -605,14 +621,15 @@ def main():
             if not bucket:
                 final_map_blocks[pure_fn] = []
                 continue
-            stats_final = pairwise_stats_final.get(pure_fn, {})
+            stats_final = pairwise_stats_final.setdefault(pure_fn, OrderStats())
             # 确保当前键都在统计里
             for k in bucket.keys():
-                stats_final.setdefault(k, {})
-            order_list = derive_order_from_stats(stats_final) if stats_final else []
+                stats_final.intern(k)
+            order_list = stats_final.order()
             if ENABLE_MEMORY:
                 # 仅在记忆开启时记录模板信息（非必要）
-                order_memory.setdefault(pure_fn, {})["order"] = order_list
+                mem_stats[pure_fn] = stats_final
+                mem_orders[pure_fn] = order_list
             order_pos = {k: i for i, k in enumerate(order_list)}
             def sort_key(k: str) -> Tuple[int, str]:
                 return (order_pos.get(k, 10**9), k)
@@ -620,8 +637,17 @@ def main():
             final_map_blocks[pure_fn] = [bucket[k] for k in sorted_keys]
             applied_items += len(sorted_keys)
 
+        if ENABLE_MEMORY:
+            for pure_fn, stats_final in pairwise_stats_final.items():
+                if not global_key2blk.get(pure_fn):
+                    mem_stats[pure_fn] = stats_final
+                    mem_orders.pop(pure_fn, None)
+
         # ——导出 Imports——
-        imports_map = collect_main_imports(files, main_set)
+        if USE_CORPUS_INDEX:
+            imports_map = collect_main_imports_from_index(files, main_set, imports_by_file)
+        else:
+            imports_map = collect_main_imports(files, main_set)
         out_imports_path = os.path.join(get_output_dir(), OUT_IMPORTS_NAME)
         save_json(out_imports_path, imports_map)
 
@@ -637,12 +663,10 @@ def main():
         full_out_path = os.path.join(get_output_dir(), OUT_JSON_NAME)
         save_json(full_out_path, final_full_templates)
 
-        # ——缓存与记忆落盘（记忆可选）——
-        if USE_FILE_CACHE:
-            save_json(cache_path, {"index": perfile_index, "signatures": new_signatures, "version": 7})
+        # ——记忆落盘（可选）——
         if ENABLE_MEMORY:
-            save_json(order_mem_path, order_memory)
-            total_pairs_after = sum(sum(row.values()) for v in order_memory.values() for row in v.get("pairwise", {}).values())
+            save_memory(order_mem_path, mem_stats, mem_orders)
+            total_pairs_after = sum(st.total() for st in mem_stats.values())
         else:
             total_pairs_after = 0
 
@@ -670,17 +694,12 @@ def main():
 
 def load_json(path: str) -> Dict[str, Any]:
     if os.path.isfile(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+        data = json_io.load_loose(path)
+        return data if data is not None else {}
     return {}
 
 def save_json(path: str, data: Dict[str, Any]) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    json_io.dump(data, path)
 
 # 兼容性的正则编译
 import os as _os, re as _re
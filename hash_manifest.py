@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 内容哈希清单：记录每个资源“源文件哈希 → 产物哈希”，供 uasset2json / json2uasset 的 SKIP_POLICY="hash" 使用。
+   只有源内容（.uasset+.uexp+usmap / .json）或产物确实变化时才重新转换；复制、解压导致的 mtime 变化不再触发全量重跑。
+2) 资源键取 Content 之后的相对路径（如 JH/Tables/Buffs），因此 _1 / _2 / _XTZH 等工作副本可共用同一份清单：
+   某副本里内容相同、产物也相同的资源直接跳过。
+3) 哈希算法：装了 xxhash 用 xxh3_128，否则用标准库 blake2b；摘要带算法前缀，换算法后旧记录自然失效。
+4) 另按 绝对路径 + 大小 + mtime 缓存单文件哈希，未变的文件不重复读盘。
+5) 清单为单个 JSON 文件，保存时与磁盘上的最新内容合并后原子替换，两个转换脚本可同时使用。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+try:
+    import xxhash  # 可选
+except ImportError:
+    xxhash = None
+
+# ============== 配置 ==============
+# 放在各工作副本的上级目录，供 _1 / _2 / _XTZH 共用
+MANIFEST_PATH = Path(r"D:\Unreal_tools\yijian\convert_manifest.json")
+READ_BLOCK = 1 << 20
+# =================================
+
+ALGO = "xxh3" if xxhash is not None else "b2"
+
+
+def _new_hasher():
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def hash_file(path: Path) -> str:
+    h = _new_hasher()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(READ_BLOCK)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+
+def content_key(path: Path) -> str:
+    """Content 之后的相对路径（去后缀、小写、/ 分隔）；路径中没有 Content 时退回完整路径。"""
+    parts = Path(path).with_suffix("").parts
+    lowered = [p.lower() for p in parts]
+    if "content" in lowered:
+        i = len(lowered) - 1 - lowered[::-1].index("content")
+        parts = parts[i + 1:]
+    return "/".join(parts).lower()
+
+
+class HashManifest:
+    """
+    section 区分用途（"uasset2json" / "json2uasset"），同一文件内互不干扰。
+    线程安全：可在 ThreadPoolExecutor 的任务里直接调用。
+    """
+
+    def __init__(self, section: str, path: Path = MANIFEST_PATH):
+        self.path = Path(path)
+        self.section = section
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._stat: Dict[str, list] = {}
+        self._dirty: Dict[str, dict] = {}
+        self._dirty_stat: Dict[str, list] = {}
+        self.hashed_bytes = 0
+        doc = self._read_disk()
+        self._entries = dict(doc.get(section, {}))
+        self._stat = dict(doc.get("_stat", {}))
+
+    def _read_disk(self) -> dict:
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                doc = json.load(f)
+            return doc if isinstance(doc, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    # ---------- 哈希 ----------
+    def file_digest(self, path: Path) -> Optional[str]:
+        """单文件哈希（带 大小+mtime 缓存）；文件不存在返回 None。"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        k = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            c = self._stat.get(k)
+        if c and c[0] == st.st_size and c[1] == st.st_mtime_ns and c[2].startswith(ALGO + ":"):
+            return c[2]
+        d = f"{ALGO}:{hash_file(Path(path))}"
+        rec = [st.st_size, st.st_mtime_ns, d]
+        with self._lock:
+            self._stat[k] = rec
+            self._dirty_stat[k] = rec
+            self.hashed_bytes += st.st_size
+        return d
+
+    def digest(self, paths: Iterable[Path]) -> Optional[str]:
+        """多文件组合摘要（按给定顺序；不存在的文件记为 '-'）；全部不存在返回 None。"""
+        parts = [self.file_digest(p) for p in paths]
+        if all(p is None for p in parts):
+            return None
+        if len(parts) == 1:
+            return parts[0]
+        h = _new_hasher()
+        for p in parts:
+            h.update((p or "-").encode("ascii"))
+            h.update(b"|")
+        return f"{ALGO}:{h.hexdigest()}"
+
+    # ---------- 判定 / 记录 ----------
+    def is_fresh(self, key: str, src_digest: Optional[str], out_paths: Iterable[Path]) -> bool:
+        with self._lock:
+            e = self._entries.get(key)
+        if not e or src_digest is None or e.get("src") != src_digest:
+            return False
+        return self.digest(out_paths) == e.get("out")
+
+    def record(self, key: str, src_digest: Optional[str], out_paths: Iterable[Path]) -> None:
+        if src_digest is None:
+            return
+        out = self.digest(out_paths)
+        if out is None:
+            return
+        rec = {"src": src_digest, "out": out}
+        with self._lock:
+            self._entries[key] = rec
+            self._dirty[key] = rec
+
+    def save(self) -> None:
+        """与磁盘上的最新清单合并（本次更新的键覆盖），再原子替换。"""
+        with self._lock:
+            if not self._dirty and not self._dirty_stat:
+                return
+            doc = self._read_disk()
+            doc.setdefault(self.section, {}).update(self._dirty)
+            doc.setdefault("_stat", {}).update(self._dirty_stat)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(doc, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._dirty.clear()
+            self._dirty_stat.clear()
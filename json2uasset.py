@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 """
 批量把 UAssetAPI 导出的 JSON 还原为 .uasset（或 .umap）。
+USE_CONVERTER_HOST=True 时通过 converter_host 保持常驻 UAssetGUI 进程，逐个下发文件。
+调度：convert_scheduler 按 JSON 大小从大到小下发、限制在途任务数，并可按吞吐自动调整并发，结束时打印吞吐汇总。
+SKIP_POLICY="hash" 时按内容哈希清单（hash_manifest）判定：json 与产物 .uasset+.uexp 都未变才跳过。
 """
 
 # ===== 1) 配置（仅改这里） =====
@@ -10,7 +13,9 @@ EXE = Path(r"D:\Unreal_tools\UAssetGUI.exe")  # UAssetGUI 可执行文件
 
 # "all"全文件夹还原 or "single"单个文件还原
 MODE = "all"
-SKIP_POLICY = "mtime"            # "none" 全部重建；"exists" 目标存在即跳过；"mtime" JSON 更新才重建
+SKIP_POLICY = "mtime"            # "none" 全部重建；"exists" 目标存在即跳过；"mtime" JSON 更新才重建；"hash" 内容变化才重建
+# SKIP_POLICY="hash" 的哈希清单（放在各工作副本上级目录，_1/_2/_XTZH 共用）
+MANIFEST_PATH = Path(r"D:\Unreal_tools\yijian\convert_manifest.json")
 
 # 主文件夹路径
 ROOT_DIR = Path(r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_2\Wandering_Sword\Content\JH\Tables")
@@ -26,7 +31,10 @@ USE_OUTDIR = False  # False=就地输出；True=镜像输出到 OUT_ROOT
 OUT_ROOT = Path(r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles")
 
 DEFAULT_OUTPUT_EXT = ".uasset"   # 需要 .umap 时改为 ".umap"
-MAX_WORKERS = 8                  # 并行数
+MAX_WORKERS = 8                  # 起始并行数
+AUTO_TUNE_WORKERS = True         # 按吞吐自动调整并行数（1 ~ MAX_WORKERS_LIMIT）；False 时固定 MAX_WORKERS
+MAX_WORKERS_LIMIT = 16
+USE_CONVERTER_HOST = False       # 常驻转换进程（需 EXE 支持 --serve 协议，见 converter_host；测试可指向 converter_stub.py）
 
 WRITE_ERROR_LOG = True
 ERROR_LOG_PATH = Path.cwd() / f"json2uasset_errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
@@ -36,7 +44,13 @@ ERROR_FILES_TXT = Path.cwd() / f"json2uasset_error_files_{datetime.now().strftim
 
 # ===== 2) 运行与路径工具 =====
 import subprocess
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import convert_scheduler
+import converter_host
+import hash_manifest
+
+HOST: converter_host.ConverterHost | None = None  # 常驻模式下由 main 设置
+MANIFEST: hash_manifest.HashManifest | None = None  # SKIP_POLICY="hash" 时由 main 设置
 
 def run_utf8(cmd: list[str]) -> subprocess.CompletedProcess:
     try:
@@ -46,6 +60,12 @@ def run_utf8(cmd: list[str]) -> subprocess.CompletedProcess:
         p.stdout = p.stdout.decode("utf-8", "replace"); p.stderr = p.stderr.decode("utf-8", "replace")
         return p
 
+def run_converter(args: list[str]) -> subprocess.CompletedProcess:
+    """执行一次转换命令：常驻模式走进程池，否则单独启动一个进程。"""
+    if HOST is not None:
+        return HOST.run(args)
+    return run_utf8(converter_host.base_command(EXE) + args)
+
 def resolve_single_json(given: Path) -> tuple[Path | None, str]:
     tries = [given] + ([given.with_suffix(".json")] if given.suffix.lower() != ".json" else [])
     for c in tries:
@@ -96,15 +116,21 @@ def need_process(json_path: Path) -> tuple[bool, str, Path]:
         if uexp.exists():
             dst_m = max(dst_m, uexp.stat().st_mtime)
         return (src_m > dst_m, "SKIP up-to-date: " + str(out_asset), out_asset)
+    if SKIP_POLICY == "hash" and MANIFEST is not None:
+        fresh = MANIFEST.is_fresh(hash_manifest.content_key(json_path), MANIFEST.digest([json_path]),
+                                  [out_asset, out_asset.with_suffix(".uexp")])
+        return (not fresh, "SKIP unchanged: " + str(out_asset), out_asset)
     return True, "", out_asset  # 容错
 
 def try_convert(json_path: Path, out_asset: Path) -> tuple[bool, str, str]:
     if not EXE.exists():
         return False, f"ERR: UAssetGUI 不存在 {EXE}", f"ERR: UAssetGUI 不存在 {EXE}"
-    cmd = [str(EXE), "fromjson", str(json_path), str(out_asset)]
-    proc = run_utf8(cmd)
+    proc = run_converter(["fromjson", str(json_path), str(out_asset)])
     ok = (proc.returncode == 0) and out_asset.exists()
     if ok:
+        if MANIFEST is not None:
+            MANIFEST.record(hash_manifest.content_key(json_path), MANIFEST.digest([json_path]),
+                            [out_asset, out_asset.with_suffix(".uexp")])
         return True, f"OK: {json_path} -> {out_asset}", ""
     detail = [f"ERR: {json_path} -> {out_asset} (code={proc.returncode})"]
     if proc.stdout: detail += ["--- STDOUT ---", proc.stdout.strip()]
@@ -122,6 +148,7 @@ def convert_one(json_path: Path) -> tuple[bool, str, str]:
 
 # ===== 4) 主流程（总结果 + 错误名按规则输出/写入） =====
 def main():
+    global HOST, MANIFEST
     # 初始化失败时，仅输出一次性错误
     missing = []
     if not EXE.exists(): missing.append(f"UAssetGUI 不存在: {EXE}")
@@ -141,11 +168,18 @@ def main():
     error_files: list[Path] = []
 
     workers = (total if MAX_WORKERS in (None, 0) else MAX_WORKERS)
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        futures = {ex.submit(convert_one, f): f for f in files}
-        for fut in as_completed(futures):
-            src = futures[fut]
-            ok, brief, detail = fut.result()
+    sched = convert_scheduler.ConvertScheduler(
+        start_workers=min(workers, total),
+        max_workers=min(max(workers, MAX_WORKERS_LIMIT) if AUTO_TUNE_WORKERS else workers, total),
+        autotune=AUTO_TUNE_WORKERS,
+    )
+    if USE_CONVERTER_HOST:
+        HOST = converter_host.ConverterHost(EXE, sched.max_workers)
+    if SKIP_POLICY == "hash":
+        MANIFEST = hash_manifest.HashManifest("json2uasset", MANIFEST_PATH)
+    try:
+        results = sched.run(files, convert_one, is_work=lambda r: not r[1].startswith("SKIP"))
+        for src, (ok, brief, detail) in results:
             if brief.startswith("SKIP"):
                 skipped += 1
                 continue
@@ -155,9 +189,22 @@ def main():
                 failures += 1
                 error_details.append(detail)
                 error_files.append(src)
+    finally:
+        if HOST is not None:
+            HOST.close()
+            HOST = None
+        if MANIFEST is not None:
+            try:
+                MANIFEST.save()
+            except Exception as e:
+                # 不打断收尾，但要说明：清单没写进去，下次会把这些文件全部重新转换
+                print(f"[警告] 哈希清单保存失败（{type(e).__name__}: {e}）：{MANIFEST_PATH}；下次运行将重新转换。")
+            MANIFEST = None
 
     # 总结果
     print(f"完成：成功 {successes} / 失败 {failures} / 跳过 {skipped} / 共 {total}")
+    if successes or failures:
+        print(sched.summary())
 
     # 错误文件名输出策略
     if failures > 0:
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 各脚本共用的 JSON 读写层：装了 orjson（或 msgspec，仅用于解析）就用它，否则退回标准库 json。
+2) 写出与 json.dump(obj, f, ensure_ascii=False, indent=2)（文本模式写文件）逐字节一致，UAssetGUI 可直接读回：
+   - 键顺序按原样保留（$type 仍在最前），不排序；
+   - 浮点数按 Python repr 输出（1e-05、1e+16、2.25），orjson 的 1e-5 / 1e16 写法会被改回；
+   - 换行与文本模式一致（Windows 下为 \\r\\n）；
+   - orjson 不能原样输出的内容（NaN/Infinity、超 64 位整数、非字符串键、indent≠2 等）自动整份交给标准库；
+     程序里算出来的 NaN/Infinity 是普通 float，orjson 会静默写成 null，写出前先检查。
+3) 读取时的编码回退统一在这里：UTF-8（自动去 BOM）→ GB18030；load_loose 再以 UTF-8 替换非法字节兜底，失败返回 None。
+"""
+
+import json
+import marshal
+import math
+import os
+import re
+from typing import Any, Optional, Sequence, Union
+
+try:
+    import orjson  # 可选
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec  # 可选，仅用于解析
+except ImportError:
+    msgspec = None
+
+# ============== 配置 ==============
+ENCODINGS: Sequence[str] = ("utf-8", "gb18030")   # 依次尝试的编码（UTF-8 的 BOM 会先去掉）
+# =================================
+
+BACKEND = "orjson" if orjson is not None else ("msgspec" if msgspec is not None else "json")
+
+_BOM = b"\xef\xbb\xbf"
+_NEWLINE = os.linesep.encode("ascii")
+
+# orjson 与 repr 只在两类浮点上写法不同：带指数的（1e-6 / 1e16）与 0.0000x（repr 为 x e-05）。
+# 缩进输出中标量值独占一行末尾，字符串里不可能出现真正的换行，所以“后跟 ,? 换行”的一定是数值。
+# 两个模式都以字面字符开头，re 可以快速跳过，不必逐字节尝试整个数值模式。
+_EXP_TAIL = re.compile(rb"e[-+]?\d+(?=,?\n|\Z)")
+_SMALL_HEAD = re.compile(rb"0\.0000\d+(?=,?\n|\Z)")
+_NUM_BYTES = b"0123456789.-"
+
+# marshal 第 2 版把精确 float 写成 b"g" + 8 字节小端 double；NaN/±Infinity 的指数位全 1，
+# 即第 7 字节高 4 位全 1、第 8 字节为 0x7F 或 0xFF。
+# 字符串内容可能碰巧命中，命中后再逐项确认；没命中就一定没有。
+_NON_FINITE_MARSHAL = re.compile(rb"g.{6}[\xf0-\xff][\x7f\xff]", re.S)
+
+
+class _NonFinite(float):
+    """标准库解析出的 NaN / Infinity；orjson 不认识 float 子类，写出时会整份交给标准库（保持 NaN 原样）。"""
+
+
+def _parse_constant(name: str) -> float:
+    return _NonFinite(name)
+
+
+# ---------- 解析 ----------
+def _fast_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    if msgspec is not None:
+        return msgspec.json.decode(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """解析 UTF-8 字节或字符串；快速后端不接受的写法（NaN、超大整数等）交给标准库。"""
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    if data.startswith(_BOM):
+        data = data[len(_BOM):]
+    try:
+        return _fast_loads(data)
+    except Exception:
+        if BACKEND == "json":
+            raise
+    return json.loads(data.decode("utf-8"), parse_constant=_parse_constant)
+
+
+def load(path: Union[str, os.PathLike]) -> Any:
+    """读取 JSON 文件；按 ENCODINGS 依次尝试。内容本身不是合法 JSON 时抛出 ValueError。"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw.startswith(_BOM):
+        raw = raw[len(_BOM):]
+    try:
+        return loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        first_err = e
+    for enc in ENCODINGS:
+        try:
+            text = raw.decode(enc)
+        except UnicodeDecodeError:
+            continue
+        if enc == "utf-8":
+            raise first_err   # 编码没问题，是 JSON 本身有误
+        return json.loads(text, parse_constant=_parse_constant)
+    raise first_err
+
+
+def load_loose(path: Union[str, os.PathLike]) -> Optional[Any]:
+    """宽松读取：编码全部失败时以 UTF-8 替换非法字节再试；任何失败都返回 None。"""
+    try:
+        return load(path)
+    except Exception:
+        pass
+    try:
+        with open(path, "rb") as f:
+            text = f.read().decode("utf-8", errors="replace")
+        return json.loads(text.lstrip("﻿"), parse_constant=_parse_constant)
+    except Exception:
+        return None
+
+
+# ---------- 写出 ----------
+def _walk_non_finite(obj: Any) -> bool:
+    stack = [obj]
+    pop, push = stack.pop, stack.extend
+    while stack:
+        o = pop()
+        t = type(o)
+        if t is dict:
+            push(o.values())
+        elif t is list or t is tuple:
+            push(o)
+        elif t is float and not math.isfinite(o):
+            return True
+    return False
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """obj 中是否有 NaN/Infinity 普通浮点（orjson 会写成 null，标准库写 NaN/Infinity）。"""
+    try:
+        raw = marshal.dumps(obj, 2)   # C 实现，比逐项遍历快约一倍
+    except ValueError:                # marshal 不支持的类型或嵌套过深：逐项检查
+        return _walk_non_finite(obj)
+    return _NON_FINITE_MARSHAL.search(raw) is not None and _walk_non_finite(obj)
+
+
+def _fix_floats(out: bytes) -> bytes:
+    """把 orjson 输出中与 Python repr 写法不同的浮点改回 repr。"""
+    spans = set()
+    for m in _EXP_TAIL.finditer(out):
+        s = m.start()
+        while s > 0 and out[s - 1] in _NUM_BYTES:
+            s -= 1
+        if s < m.start() and out[s - 1:s] == b" ":
+            spans.add((s, m.end()))
+    for m in _SMALL_HEAD.finditer(out):
+        s = m.start()
+        if out[s - 1:s] == b"-":
+            s -= 1
+        if out[s - 1:s] == b" ":
+            spans.add((s, m.end()))
+    if not spans:
+        return out
+    parts = []
+    pos = 0
+    for s, e in sorted(spans):
+        parts.append(out[pos:s])
+        parts.append(repr(float(out[s:e])).encode("ascii"))
+        pos = e
+    parts.append(out[pos:])
+    return b"".join(parts)
+
+
+def dumps(obj: Any, indent: Optional[int] = 2) -> bytes:
+    """
+    序列化为 UTF-8 字节（换行为 \\n），与 json.dumps(obj, ensure_ascii=False, indent=indent) 一致。
+    """
+    if orjson is not None and indent == 2:
+        try:
+            out = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            out = None
+        if out is not None and not _has_non_finite(obj):
+            return _fix_floats(out)
+    return json.dumps(obj, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def dump(obj: Any, path: Union[str, os.PathLike], indent: Optional[int] = 2, makedirs: bool = True) -> None:
+    """写文件，结果与 open(path, "w", encoding="utf-8") + json.dump(..., ensure_ascii=False, indent=indent) 相同。"""
+    data = dumps(obj, indent)
+    if _NEWLINE != b"\n":
+        data = data.replace(b"\n", _NEWLINE)
+    if makedirs:
+        parent = os.path.dirname(os.fspath(path))
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
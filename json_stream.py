@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 流式读取 Buffs.json / Skills.json / Quests.json 这类大表 JSON，不再 json.load 整个文件。
+2) 按块读入文本，用正则只跳跃扫描 字符串 / 括号；遇到 "StructType" 属于目标集合的对象时，
+   直接从该对象起点 raw_decode（C 实现）解析这一个对象并跳过它，逐条 yield —— 内存峰值约等于“一行”的大小。
+   对象跨越已读入的块时，改为逐记号配对括号，读完后再整体解析。
+3) 调用方 break（如碰到结束ID）即停止读盘，后面的内容不再解析。
+4) 可顺带取回顶层的若干键（如 NameMap），UAssetAPI 输出中 NameMap 位于 Exports 之前。
+5) 块边界：有换行时只处理到最后一个换行（JSON 字符串里不会有裸换行）；压缩成一行的 JSON 没有换行，
+   改为切在最后一个位于字符串之外的 , } ] 之后，内存仍按块有界。只有单个字符串长过一块时才会继续累积。
+
+约定：UAssetAPI 写出 StructPropertyData 时 "StructType" 总在 "Value" 等嵌套容器之前；
+对象在出现第一个嵌套容器之前仍未见到 StructType，即判定为非目标，不再缓存它的文本。
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Tuple
+
+# ============== 配置 ==============
+CHUNK_SIZE = 1 << 20   # 每次读入的字符数（约 1MB）
+# =================================
+
+_STR = r'"(?:[^"\\]|\\.)*"'
+# 顺序：StructType 键值对 → 普通键（仅在需要顶层键时）→ 其它字符串（跳过）→ 括号
+_TOKEN = re.compile(
+    r'"StructType"\s*:\s*"(?P<sv>(?:[^"\\]|\\.)*)"|' + _STR + r'|(?P<b>[{}\[\]])'
+)
+_TOKEN_WITH_KEYS = re.compile(
+    r'"StructType"\s*:\s*"(?P<sv>(?:[^"\\]|\\.)*)"|"(?P<k>(?:[^"\\]|\\.)*)"\s*:|' + _STR + r'|(?P<b>[{}\[\]])'
+)
+
+# 从安全位置（字符串之外）起扫描：完整字符串整体跳过；遇到不完整的字符串（块尾截断）只匹配到单个引号
+_CUT = re.compile(r'"(?:[^"\\]|\\.)*"|(?P<c>[,}\]])|"')
+
+_UNDECIDED, _NO, _TARGET = 0, 1, 2
+_DECODER = json.JSONDecoder()
+
+
+def _safe_cut(text: str) -> int:
+    """text 以字符串之外的位置开头；返回最后一个位于字符串之外的 , } ] 之后的位置（没有则 0）。"""
+    cut = 0
+    for m in _CUT.finditer(text):
+        if m.group("c") is not None:
+            cut = m.end()
+        elif m.end() - m.start() == 1:
+            break   # 未闭合的字符串：其后的内容都可能在字符串里
+    return cut
+
+
+def iter_structs(path, struct_types: Iterable[str], top_keys: Iterable[str] = (),
+                 chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    流式产出 (tag, obj)：
+      - StructType ∈ struct_types 的对象：tag = StructType，按文件出现顺序；
+      - 顶层键 ∈ top_keys 的值（如 NameMap 列表）：tag = 键名。
+    目标对象内部不再嵌套匹配（与外层一起整体返回）。
+    """
+    types = set(struct_types)
+    keys = set(top_keys)
+    pat = _TOKEN_WITH_KEYS if keys else _TOKEN
+
+    stack: List[list] = []   # 每个打开的容器：[绝对起始偏移, 状态, tag]
+    capturing = 0            # 处于目标对象内部的层数
+    last_key = None          # 根对象下最近的键
+    buf, base = "", 0        # buf[0] 对应文件中的绝对偏移 base
+    pending = ""
+
+    with open(path, "r", encoding="utf-8-sig") as f:
+        eof = False
+        while not eof:
+            data = f.read(chunk_size)
+            if data:
+                pending += data
+                # JSON 字符串里不会出现裸换行：只处理到最后一个换行，保证记号不被块边界截断；
+                # 没有换行（压缩成一行）时切在字符串之外的最后一个 , } ] 之后
+                cut = pending.rfind("\n") + 1 or _safe_cut(pending)
+                if cut == 0:
+                    continue
+                seg, pending = pending[:cut], pending[cut:]
+            else:
+                eof = True
+                seg, pending = pending, ""
+
+            pos = len(buf)
+            buf += seg
+            while True:
+                m = pat.search(buf, pos)
+                if m is None:
+                    break
+                pos = m.end()
+                ch = m.group("b")
+                frame = None
+                if ch is None:
+                    sv = m.group("sv")
+                    if sv is not None:
+                        if stack and not capturing and stack[-1][1] == _UNDECIDED:
+                            if sv in types:
+                                frame = stack[-1]
+                                frame[1] = _TARGET
+                                frame[2] = sv
+                                capturing += 1
+                            else:
+                                stack[-1][1] = _NO
+                    elif keys and len(stack) == 1:
+                        k = m.group("k")
+                        if k is not None:
+                            last_key = k
+                    if frame is None:
+                        continue
+                elif ch == "{" or ch == "[":
+                    if stack and stack[-1][1] == _UNDECIDED:
+                        stack[-1][1] = _NO
+                    new = [base + m.start(), _NO, None]
+                    if not capturing:
+                        if len(stack) == 1 and last_key in keys:
+                            new[1] = _TARGET
+                            new[2] = last_key
+                            capturing += 1
+                            frame = new
+                        elif ch == "{" and types:
+                            new[1] = _UNDECIDED
+                    stack.append(new)
+                    if frame is None:
+                        continue
+                else:
+                    if not stack:
+                        raise ValueError(f"JSON 括号不匹配：{path} @ {base + m.start()}")
+                    done = stack.pop()
+                    if done[1] == _TARGET:
+                        capturing -= 1
+                        yield done[2], json.loads(buf[done[0] - base:pos])
+                    continue
+
+                # 刚确定为目标：对象若已完整读入，直接整体解析并跳到其末尾
+                try:
+                    obj, end = _DECODER.raw_decode(buf, frame[0] - base)
+                except ValueError:
+                    continue  # 跨块：继续逐记号配对，读完后在出栈处解析
+                stack.pop()
+                capturing -= 1
+                pos = end
+                yield frame[2], obj
+
+            # 丢弃不再需要的文本：只保留仍可能成为目标 / 正在捕获的对象
+            keep = min((fr[0] for fr in stack if fr[1] != _NO), default=base + len(buf))
+            buf = buf[keep - base:]
+            base = keep
+
+
+def iter_struct_values(path, struct_type: str) -> Iterator[Any]:
+    """只要某一种 StructType 时的便捷写法：逐个产出对象本身。"""
+    for _, obj in iter_structs(path, (struct_type,)):
+        yield obj
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 名称模糊查询索引：对一组名称（函数 / JH.Ability.* Tag / EAbilitySystemEventType:: 触发器）建立
+   - 前缀索引：按小写排好序的键数组 + 二分（压平的前缀树），查询 O(log n + 命中数)；
+   - 分段前缀：名称在 . / :: / _ 之后的每一段也作为键登记，输入 "State.Stun"、"AddBuff"、"Hit" 也能命中；
+   - (trigram, 位置) 倒排：输入有错字/漏字时取候选，再按“前缀编辑距离”（只打了一部分不算错）排序。
+2) search(q) 返回按相关度排序的 (名称, 匹配方式, 编辑距离)：
+   完全一致（忽略大小写）> 整名前缀 > 分段前缀 > 编辑距离近似（距离上限为输入长度的 1/4，至少 1）。
+3) 近似匹配先假设错字在“与已有名称的最长公共前缀”之后，只在该前缀对应的键区间里找：
+   - 区间里不同的前缀组不超过 FUZZY_SCAN 组就逐组直接比较；
+   - 否则只统计区间内、位置相近的 trigram（倒排表按键序号有序，二分截取），稀有的先算，
+     累计到 CANDIDATE_BUDGET 项为止，取得分最高的 FUZZY_RERANK 个再算编辑距离；
+   - 区间内一个都没有（错字在开头）才放开到全部键。
+   编辑距离用按位并行算法，8k+ 名称下单次查询在 1 ms 以内；trigram 倒排在第一次近似查询时才建。
+4) 直接运行：载入来源表（name_sources.json）建索引，对若干查询计时。
+用法：
+    idx = NameIndex(src_map.keys())
+    for name, how, dist in idx.search("JHGEExtAct_Add"):
+        ...
+    python name_index.py [name_sources.json] [查询 ...]
+"""
+
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ============== 配置 ==============
+SEPARATORS = (".", "::", "_")   # 分段前缀的分隔符
+GRAM_SPAN = 32                  # 每个键只对前 N 个字符建 trigram 倒排
+CANDIDATE_BUDGET = 2000         # 模糊匹配时最多累计的倒排项数
+FUZZY_RERANK = 16               # trigram 得分最高的前 N 个候选再算编辑距离
+FUZZY_SCAN = 48                 # 公共前缀区间内不同前缀不超过 N 组时直接逐组比较
+# =================================
+
+# 匹配方式（同时是排序先后）
+M_EXACT = "exact"
+M_PREFIX = "prefix"
+M_SEGMENT = "segment"
+M_FUZZY = "fuzzy"
+_RANK = {M_EXACT: 0, M_PREFIX: 1, M_SEGMENT: 2, M_FUZZY: 3}
+
+
+def _segment_starts(low: str) -> List[int]:
+    """分隔符之后的位置（不含 0）。"""
+    starts = set()
+    for sep in SEPARATORS:
+        i = low.find(sep)
+        while i >= 0:
+            j = i + len(sep)
+            if j < len(low):
+                starts.add(j)
+            i = low.find(sep, j)
+    return sorted(starts)
+
+
+def _pattern_masks(q: str) -> Dict[str, int]:
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(q):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def prefix_distance(q: str, s: str, limit: int, peq: Dict[str, int] = None) -> int:
+    """
+    q 与 s 的某个前缀之间的最小编辑距离（输入只打了一部分也不算错）；超过 limit 时返回 limit + 1。
+    按位并行（Myers / Hyyrö）：一整列 DP 用一个整数表示，每个字符只需十来次整数运算。
+    """
+    m = len(q)
+    if m == 0:
+        return 0
+    if peq is None:
+        peq = _pattern_masks(q)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    best = m
+    for ch in s:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        if score < best:
+            best = score
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return best if best <= limit else limit + 1
+
+
+class NameIndex:
+    """只读索引；名称集合变化后重新构建即可。trigram 倒排在第一次模糊查询时才建。"""
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = sorted(set(n for n in names if n))
+        self._exact: Dict[str, List[int]] = {}
+        keys: List[Tuple[str, int, bool]] = []   # (小写键, 名称序号, 是否分段)
+        for i, name in enumerate(self.names):
+            low = name.lower()
+            self._exact.setdefault(low, []).append(i)
+            keys.append((low, i, False))
+            for j in _segment_starts(low):
+                keys.append((low[j:], i, True))
+        keys.sort()
+        self._keys = [k for k, _, _ in keys]
+        self._key_ids = [(i, seg) for _, i, seg in keys]
+        self._grams: Optional[Dict[Tuple[str, int], List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _gram_index(self) -> Dict[Tuple[str, int], List[int]]:
+        """(trigram, 位置) -> 键序号；只取每个键的前 GRAM_SPAN 个字符（输入按前缀比较，后面用不到）。"""
+        if self._grams is None:
+            grams: Dict[Tuple[str, int], List[int]] = {}
+            for k, key in enumerate(self._keys):
+                s = "\x02" + key[:GRAM_SPAN]
+                for p in range(len(s) - 2):
+                    grams.setdefault((s[p:p + 3], p), []).append(k)
+            self._grams = grams
+        return self._grams
+
+    @staticmethod
+    def _put(out: Dict[int, Tuple[str, int]], i: int, how: str, d: int):
+        old = out.get(i)
+        if old is None or (_RANK[how], d) < (_RANK[old[0]], old[1]):
+            out[i] = (how, d)
+
+    def _prefix(self, low: str, limit: int, out: Dict[int, Tuple[str, int]]):
+        keys, ids = self._keys, self._key_ids
+        pos = bisect_left(keys, low)
+        while pos < len(keys) and keys[pos].startswith(low) and len(out) < limit * 4:
+            i, seg = ids[pos]
+            self._put(out, i, M_SEGMENT if seg else M_PREFIX, 0)
+            pos += 1
+
+    def _prefix_range(self, low: str) -> Tuple[int, int, int]:
+        """与 low 公共前缀最长的键所在区间：(公共前缀长度, 起, 止)。有序数组里它必是 low 插入点的两个邻居之一。"""
+        keys = self._keys
+        pos = bisect_left(keys, low)
+        n = 0
+        for k in (pos - 1, pos):
+            if 0 <= k < len(keys):
+                key = keys[k]
+                m = 0
+                while m < len(low) and m < len(key) and low[m] == key[m]:
+                    m += 1
+                n = max(n, m)
+        if n == 0:
+            return 0, 0, len(keys)
+        head = low[:n]
+        return n, bisect_left(keys, head), bisect_left(keys, head + "\U0010ffff")
+
+    def _fuzzy_in(self, low: str, skip: int, lo: int, hi: int, max_dist: int, limit: int,
+                  out: Dict[int, Tuple[str, int]]):
+        """在键区间 [lo, hi) 内取候选；前 skip 个字符区间内的键都相同，这部分 trigram 不再计数。"""
+        grams = self._gram_index()
+        s = "\x02" + low[:GRAM_SPAN]
+        postings = []
+        for p in range(max(0, skip - 1), len(s) - 2):
+            g = s[p:p + 3]
+            for q in range(max(0, p - max_dist), p + max_dist + 1):
+                lst = grams.get((g, q))
+                if not lst:
+                    continue
+                if lo > 0 or hi < len(self._keys):   # 倒排表按键序号递增，二分截出区间内的部分
+                    lst = lst[bisect_left(lst, lo):bisect_left(lst, hi)]
+                    if not lst:
+                        continue
+                postings.append(lst)
+        postings.sort(key=len)
+        hits = Counter()
+        budget = CANDIDATE_BUDGET
+        for lst in postings:
+            if budget <= 0:
+                break
+            budget -= len(lst)
+            hits.update(lst)
+        # 同位置附近共有 trigram 最多的若干个键再算编辑距离
+        peq = _pattern_masks(low)
+        width = len(low) + max_dist   # 再往后的字符只会让距离超过 max_dist
+        for k, _ in hits.most_common(max(FUZZY_RERANK, limit)):
+            d = prefix_distance(low, self._keys[k][:width], max_dist, peq)
+            if d <= max_dist:
+                self._put(out, self._key_ids[k][0], M_FUZZY, d)
+
+    def _scan_range(self, low: str, lo: int, hi: int, max_dist: int, limit: int,
+                    out: Dict[int, Tuple[str, int]]) -> bool:
+        """
+        逐个比较区间内的键；前 len(low)+max_dist 个字符相同的键距离也相同，按这段前缀成组（二分跳过），
+        每组只算一次。组数超过 FUZZY_SCAN 时不比较，返回 False。
+        """
+        keys, ids = self._keys, self._key_ids
+        width = len(low) + max_dist
+        groups = []
+        k = lo
+        while k < hi:
+            if len(groups) >= FUZZY_SCAN:
+                return False
+            head = keys[k][:width]
+            end = bisect_left(keys, head + "\U0010ffff", k, hi) if len(head) == width else k + 1
+            groups.append((head, k, end))
+            k = end
+        peq = _pattern_masks(low)
+        for head, k, end in groups:
+            d = prefix_distance(low, head, max_dist, peq)
+            if d <= max_dist:
+                for j in range(k, min(end, k + limit)):
+                    self._put(out, ids[j][0], M_FUZZY, d)
+        return True
+
+    def _fuzzy(self, low: str, limit: int, out: Dict[int, Tuple[str, int]]):
+        """
+        先假设输错的位置在“与已有名称的最长公共前缀”之后，只在该前缀的键区间里找：
+        区间里不同的前缀不多就直接逐组比较，否则用 trigram 取候选；一个都没有再放开到全部键（错字在开头）。
+        """
+        max_dist = max(1, len(low) // 4)
+        n, lo, hi = self._prefix_range(low)
+        if hi - lo < len(self._keys):
+            before = len(out)
+            if not self._scan_range(low, lo, hi, max_dist, limit, out):
+                self._fuzzy_in(low, n, lo, hi, max_dist, limit, out)
+            if len(out) > before:
+                return
+        self._fuzzy_in(low, 0, 0, len(self._keys), max_dist, limit, out)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, str, int]]:
+        """按相关度返回至多 limit 个 (名称, 匹配方式, 编辑距离)。"""
+        low = query.strip().lower()
+        if not low or limit <= 0:
+            return []
+        out: Dict[int, Tuple[str, int]] = {}
+        for i in self._exact.get(low, ()):
+            out[i] = (M_EXACT, 0)
+        self._prefix(low, limit, out)
+        if len(out) < limit and len(low) >= 3:
+            self._fuzzy(low, limit, out)
+        ranked = sorted(out.items(), key=lambda kv: (_RANK[kv[1][0]], kv[1][1], len(self.names[kv[0]]), self.names[kv[0]]))
+        return [(self.names[i], how, d) for i, (how, d) in ranked[:limit]]
+
+
+def main():
+    import json_io
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("name_sources.json")
+    queries = sys.argv[2:] or ["JHGEExtAct_Add", "JHGEExtAct_AdBuf", "State.Stun", "Hit", "JH.Abilty.Stat"]
+    names = list(json_io.load(path))
+    t0 = time.perf_counter()
+    idx = NameIndex(names)
+    t1 = time.perf_counter()
+    idx._gram_index()
+    t2 = time.perf_counter()
+    print(f"[索引] {len(idx)} 个名称，前缀索引 {(t1 - t0) * 1000:.1f} ms，trigram 倒排 {(t2 - t1) * 1000:.1f} ms")
+    for q in queries:
+        t0 = time.perf_counter()
+        res = idx.search(q)
+        el = (time.perf_counter() - t0) * 1000
+        print(f"\n{q!r}：{len(res)} 个候选，{el:.3f} ms")
+        for name, how, d in res:
+            print(f"  [{how}{'' if not d else ' d=%d' % d}] {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,17 @@
 """
 功能：
 输出NameMap总表，便于补充新文件缺失的NameMap。
+USE_CORPUS_INDEX=True 时从共享语料索引（corpus_index）读取各文件 NameMap，只增量解析变更文件。
+EXECUTOR="process" 时用进程池（scan_pool）多核解析，各文件只回传 NameMap 字符串集合。
 """
 
 import os
 import re
-import json
 from pathlib import Path
 from typing import Iterable, Set, Union, Optional, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import json_io
+import scan_pool
 
 # ============== 配置（按需修改） ==============
 # 主文件夹（必遍历）
@@ -35,6 +38,13 @@ OUTPUT_FILENAME = "namemap_all_GA.txt"  # 统一输出到一个文件
 
 # 并行线程数（I/O密集，适当偏大）
 MAX_WORKERS = max(8, (os.cpu_count() or 8) * 4)
+# 执行模式："thread" 线程池（原行为）；"process" 进程池（json 解析受 GIL 限制，多核时明显更快）
+EXECUTOR = "thread"
+# 进程模式的进程数；None = CPU 核数
+MAX_PROCESSES = None
+
+# True：使用共享语料索引（corpus_index.INDEX_PATH）；False：逐文件全量解析
+USE_CORPUS_INDEX = False
 # ===========================================
 
 
@@ -85,19 +95,8 @@ def find_namemap_in_obj(obj: Union[dict, list, str, int, float, None]) -> Iterab
 
 
 def read_json_safely(path: Path):
-    try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except UnicodeDecodeError:
-        for enc in ("utf-8-sig", "gb18030"):
-            try:
-                with path.open("r", encoding=enc) as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return None
-    except Exception:
-        return None
+    """编码回退（utf-8 / utf-8-sig / gb18030）由 json_io 负责；失败返回 None。"""
+    return json_io.load_loose(path)
 
 
 def matches_prefix(filename: str) -> bool:
@@ -122,17 +121,37 @@ def collect_json_files(root: Path) -> List[Path]:
 
 def process_file(file_path: Path) -> Set[str]:
     """读取并提取该 JSON 文件中的 NameMap（按 normalize_name 处理），并过滤纯数字项。"""
-    out: Set[str] = set()
     data = read_json_safely(file_path)
     if data is None:
-        return out
-    for raw in find_namemap_in_obj(data):
+        return set()
+    return normalize_names(find_namemap_in_obj(data))
+
+
+def normalize_names(raw_names: Iterable[str]) -> Set[str]:
+    """按 normalize_name 处理并过滤纯数字项。"""
+    out: Set[str] = set()
+    for raw in raw_names:
         norm = normalize_name(raw)
         if norm and not is_numeric_only(norm):  # 过滤整行仅数字（含正负号）
             out.add(norm)
     return out
 
 
+def collect_from_index(roots: List[Path]) -> Set[str]:
+    """从语料索引读取 roots 下（满足前缀过滤）各文件的 NameMap。"""
+    import corpus_index as ci
+    conn = ci.open_index()
+    try:
+        paths = ci.refresh(conn, roots, matches_prefix)
+        rows_by_file = ci.query_values(conn, paths, (ci.K_NAMEMAP,))
+    finally:
+        conn.close()
+    final_set: Set[str] = set()
+    for rows in rows_by_file.values():
+        final_set |= normalize_names(value for _, value, _ in rows)
+    return final_set
+
+
 def write_txt(lines: Iterable[str], out_path: Path):
     out_path.write_text("\n".join(sorted(lines)), encoding="utf-8")
 
@@ -158,24 +177,27 @@ def main():
 
     # 收集所有 JSON 文件
     json_files: List[Path] = []
+    valid_roots: List[Path] = []
     for _, root_path in roots:
         if not root_path.exists() or not root_path.is_dir():
             print(f"[跳过] 找不到目录：{root_path}")
             continue
+        valid_roots.append(root_path)
+        if USE_CORPUS_INDEX:
+            continue
         jfs = collect_json_files(root_path)
         json_files.extend(jfs)
         print(f"[扫描] {root_path} -> JSON {len(jfs)} 个（前缀过滤={'开' if ENABLE_PREFIX_FILTER else '关'}）")
 
-    # 并行处理所有文件
+    # 并行处理所有文件（或直接查询语料索引）
     final_set: Set[str] = set()
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
-        futures = {ex.submit(process_file, fp): fp for fp in json_files}
-        for fut in as_completed(futures):
-            fp = futures[fut]
-            try:
-                names = fut.result()
-            except Exception as e:
-                print(f"[错误] 处理失败：{fp} -> {e}")
+    if USE_CORPUS_INDEX:
+        final_set = collect_from_index(valid_roots)
+    else:
+        workers = MAX_PROCESSES if EXECUTOR == "process" else MAX_WORKERS
+        for fp, names, err in scan_pool.scan_map(process_file, json_files, mode=EXECUTOR, workers=workers):
+            if err is not None:
+                print(f"[错误] 处理失败：{fp} -> {err}")
                 continue
             final_set.update(names)
 
@@ -50,6 +50,11 @@ def json_hashable(v):
     except TypeError:
         return str(v)
 
+def array_duplicates(values):
+    """数组中出现多次的元素（按序列化结果比较），返回 [(元素, 次数)]，按首次出现顺序。"""
+    cnt = Counter(json_hashable(v) for v in values)
+    return [(it, n) for it, n in cnt.items() if n > 1]
+
 def report_for_namemap(value, path):
     print(f"\n=== 命中 NameMap 位置: {path} ===")
     if is_pairs_object(value):
@@ -77,9 +82,7 @@ def report_for_namemap(value, path):
 
     elif isinstance(value, list):
         # NameMap 是数组（你的例子就是这种）
-        items = [json_hashable(v) for v in value]
-        cnt = Counter(items)
-        dups = [(it, n) for it, n in cnt.items() if n > 1]
+        dups = array_duplicates(value)
         if dups:
             print("[数组重复元素]")
             for it, n in dups:
@@ -5,13 +5,14 @@
 """
 import json, argparse, sys
 
+import json_io
+
 # 默认路径（可直接双击/运行用）
 DEFAULT_SRC = r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_XTZH\Wandering_Sword\Content\JH\Skills\JH_N_XuanTaiZaoHua\GE_JH_N_XuanzDao.json"
 DEFAULT_DST = r"D:\Unreal_tools\original_files\Wandering_Sword\Content\JH\Skills\SL_J_DaMoJian\GE_DaMo.json"
 
 def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_io.load(path)
 
 def extract_namemap(obj):
     # 兼容常见命名和结构（列表 = 直接当作名字集合；字典 = 用 key 作为名字集合）
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 把 NameMap 总表（namemap_all.txt，每行一个条目）编译成紧凑的二进制文件（默认与 .txt 同名、后缀 .nmt），
+   之后各脚本用 mmap 只读映射，载入只需读一个文件头（微秒级），多个进程共享同一份页缓存。
+2) 文件布局（小端，按 8 字节对齐）：
+   - 文件头：魔数 / 版本 / 源 .txt 的大小与 mtime_ns / 条目数；
+   - 偏移表：uint32 × (n+1)，第 i 条为 blob[off[i]:off[i+1]]（UTF-8）；
+   - 规范形哈希索引：uint64 × n（按 (哈希, 行号) 排序）+ 对应行号 uint32 × n；
+     规范形 = canon_property（去首尾空白，结尾 PropertyData → Property），哈希取 blake2b 前 8 字节（跨进程稳定）；
+   - 字符串 blob。
+3) load_table(txt) 发现 .txt 的大小或修改时间与文件头记录不同（或编译文件缺失/版本不符）时自动重新编译；
+   同一进程内按路径缓存，每次调用只 stat 一次 .txt。编译文件写不进去（只读目录、Windows 下被其它进程映射）时在内存中使用。
+4) NameTable.missing_for(文件规范形集合, NameMap 已有规范形集合)：
+   等价于 fix_indices_namemap 原来的逐行扫描（“总表里有、文件中出现但 NameMap 没有”，同一规范形取总表中最靠前的一条，
+   按总表顺序返回），但只对文件里出现过的规范形查哈希索引，不再每个文件把 8k+ 行重新规范化一遍。
+5) 直接运行：编译/载入总表并与逐行扫描对比耗时。
+用法：
+    table = namemap_table.load_table(NAMEMAP_TXT)
+    to_add = table.missing_for(all_json_canon, existing_canon)
+    python namemap_table.py [namemap_all.txt]
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+
+# ============== 配置 ==============
+COMPILED_SUFFIX = ".nmt"   # 编译文件后缀（与 .txt 同目录同名）
+# =================================
+
+_MAGIC = b"NMT1"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQqQ")   # 魔数、版本、源大小、源 mtime_ns、条目数
+_PROPERTY_DATA_RE = re.compile(r'PropertyData$')
+
+PathLike = Union[str, os.PathLike]
+
+
+def canon_property(s: str) -> str:
+    if not isinstance(s, str): return s
+    s = s.strip()
+    return _PROPERTY_DATA_RE.sub('Property', s) if s else s
+
+
+def canon_hash(cs: str) -> int:
+    return int.from_bytes(hashlib.blake2b(cs.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "little")
+
+
+def read_lines(path: PathLike) -> List[str]:
+    """与 fix_indices_namemap.load_lines 相同：去行尾换行，跳过空白行。"""
+    lines: List[str] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for ln in f:
+            s = ln.rstrip("\n\r")
+            if s.strip():
+                lines.append(s)
+    return lines
+
+
+def compiled_path(txt: PathLike) -> Path:
+    return Path(txt).with_suffix(COMPILED_SUFFIX)
+
+
+def _pad8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+# ---------- 编译 ----------
+def compile_lines(lines: List[str], src_size: int = 0, src_mtime_ns: int = 0) -> bytes:
+    blobs = [s.encode("utf-8", "surrogatepass") for s in lines]
+    offsets = array("I", [0])
+    pos = 0
+    for b in blobs:
+        pos += len(b)
+        offsets.append(pos)
+    order = sorted((canon_hash(canon_property(s)), i) for i, s in enumerate(lines))
+    hashes = array("Q", (h for h, _ in order))
+    ids = array("I", (i for _, i in order))
+    if sys.byteorder != "little":
+        for arr in (offsets, hashes, ids):
+            arr.byteswap()
+
+    parts = [_HEADER.pack(_MAGIC, _VERSION, src_size, src_mtime_ns, len(lines))]
+    size = _HEADER.size
+    for arr in (offsets, hashes, ids):
+        raw = arr.tobytes()
+        pad = _pad8(size) - size
+        parts.append(b"\0" * pad)
+        parts.append(raw)
+        size += pad + len(raw)
+    parts.append(b"".join(blobs))
+    return b"".join(parts)
+
+
+def compile_file(txt: PathLike, out: Optional[PathLike] = None) -> bytes:
+    """编译 txt；out 给定时原子写出（先写临时文件再替换）。返回编译结果。"""
+    st = os.stat(txt)
+    data = compile_lines(read_lines(txt), st.st_size, st.st_mtime_ns)
+    if out is not None:
+        tmp = f"{os.fspath(out)}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        try:
+            os.replace(tmp, out)
+        except OSError:
+            os.remove(tmp)
+            raise
+    return data
+
+
+# ---------- 读取 ----------
+class NameTable:
+    """编译后的总表；buf 为 mmap 或 bytes。可按序号取条目、迭代（总表顺序）、按规范形查询。"""
+
+    def __init__(self, buf, source: str = ""):
+        magic, version, self.src_size, self.src_mtime_ns, n = _HEADER.unpack_from(buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("不是可识别的 NameMap 总表编译文件")
+        self.source = source
+        self._buf = buf
+        self._n = n
+        mv = memoryview(buf)
+        pos = _pad8(_HEADER.size)
+        self._off = mv[pos:pos + 4 * (n + 1)].cast("I")
+        pos = _pad8(pos + 4 * (n + 1))
+        self._hashes = mv[pos:pos + 8 * n].cast("Q")
+        pos += 8 * n
+        self._ids = mv[pos:pos + 4 * n].cast("I")
+        self._blob = pos + 4 * n
+        if sys.byteorder != "little":   # 罕见：大端机器上转成本机字节序的副本
+            self._off, self._hashes, self._ids = (self._swapped(a) for a in (self._off, self._hashes, self._ids))
+
+    @staticmethod
+    def _swapped(view: memoryview) -> array:
+        arr = array(view.format, view.tobytes())
+        arr.byteswap()
+        return arr
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, i: int) -> str:
+        if not -self._n <= i < self._n:
+            raise IndexError(i)
+        if i < 0:
+            i += self._n
+        a = self._blob + self._off[i]
+        b = self._blob + self._off[i + 1]
+        return self._buf[a:b].decode("utf-8", "surrogatepass")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._n):
+            yield self[i]
+
+    def is_stale(self, txt: PathLike) -> bool:
+        try:
+            st = os.stat(txt)
+        except OSError:
+            return False   # 源文件不在了就继续用编译结果
+        return st.st_size != self.src_size or st.st_mtime_ns != self.src_mtime_ns
+
+    def close(self) -> None:
+        if isinstance(self._buf, mmap.mmap):
+            for view in (self._off, self._hashes, self._ids):
+                if isinstance(view, memoryview):
+                    view.release()
+            self._buf.close()
+
+    def first_index(self, cs: str) -> Optional[int]:
+        """规范形为 cs 的第一条（总表顺序）的序号；没有则 None。"""
+        h = canon_hash(cs)
+        k = bisect_left(self._hashes, h)
+        while k < self._n and self._hashes[k] == h:
+            i = self._ids[k]
+            if canon_property(self[i]) == cs:   # 哈希相同再核对一次原文
+                return i
+            k += 1
+        return None
+
+    def missing_for(self, json_canon: Iterable[str], existing_canon: Set[str]) -> List[str]:
+        """
+        总表中规范形出现在 json_canon、且不在 existing_canon 的条目（每个规范形一条，按总表顺序）。
+        与原逐行扫描一致，命中的规范形会加入 existing_canon。
+        """
+        hits: List[int] = []
+        for cs in json_canon:
+            if not isinstance(cs, str) or cs in existing_canon:
+                continue
+            i = self.first_index(cs)
+            if i is not None:
+                hits.append(i)
+        hits.sort()
+        out = [self[i] for i in hits]
+        existing_canon.update(canon_property(s) for s in out)
+        return out
+
+
+def _open_compiled(path: Path, source: str) -> Optional[NameTable]:
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        return NameTable(mm, source)
+    except (ValueError, struct.error, TypeError):
+        mm.close()
+        return None
+
+
+_TABLES: Dict[str, NameTable] = {}
+
+
+def load_table(txt: PathLike) -> NameTable:
+    """
+    载入 txt 对应的编译总表（进程内缓存）；编译文件缺失、损坏或比 txt 旧时重新编译。
+    txt 不存在且也没有编译文件时抛出 FileNotFoundError。
+    """
+    key = os.path.abspath(txt)
+    table = _TABLES.get(key)
+    if table is not None and not table.is_stale(txt):
+        return table
+    if table is not None:
+        table.close()
+        del _TABLES[key]
+
+    out = compiled_path(txt)
+    table = _open_compiled(out, key)
+    if table is not None and table.is_stale(txt):
+        table.close()
+        table = None
+    if table is None:
+        if not os.path.exists(txt):
+            raise FileNotFoundError(f"找不到 NameMap 总表：{txt}")
+        try:
+            compile_file(txt, out)
+            table = _open_compiled(out, key)
+        except OSError as e:
+            print(f"[NameMap] 无法写出编译总表（{e}），本次在内存中使用。")
+        if table is None:
+            table = NameTable(compile_file(txt), key)
+    _TABLES[key] = table
+    return table
+
+
+def close_all() -> None:
+    """关闭进程内缓存的全部映射（删除/替换编译文件前调用；Windows 下映射中的文件无法删除）。"""
+    for table in _TABLES.values():
+        table.close()
+    _TABLES.clear()
+
+
+def main():
+    txt = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles\namemap_all.txt")
+    t0 = time.perf_counter()
+    lines = read_lines(txt)
+    t_read = time.perf_counter() - t0
+
+    out = compiled_path(txt)
+    t0 = time.perf_counter()
+    compile_file(txt, out)
+    t_compile = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    table = _open_compiled(out, str(txt))
+    t_open = time.perf_counter() - t0
+    assert table is not None and list(table) == lines, "编译结果与 .txt 不一致"
+    print(f"[总表] {len(lines)} 条，.txt {os.path.getsize(txt) / 1024:.1f} KB -> {out.name} {os.path.getsize(out) / 1024:.1f} KB")
+    print(f"[耗时] 读 .txt {t_read * 1000:.2f} ms / 编译 {t_compile * 1000:.2f} ms / 映射载入 {t_open * 1e6:.1f} µs")
+
+    # 模拟一个文件：取总表中每 20 条的规范形作为“文件中出现过的字符串”，NameMap 已有其中一半
+    json_canon = {canon_property(s) for s in lines[::20]} | {"NotInTable_%d" % i for i in range(200)}
+    existing = {canon_property(s) for s in lines[::40]}
+    t0 = time.perf_counter()
+    old: List[str] = []
+    seen = set(existing)
+    for s in read_lines(txt):
+        cs = canon_property(s)
+        if cs in json_canon and cs not in seen:
+            old.append(s)
+            seen.add(cs)
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = load_table(txt).missing_for(json_canon, set(existing))
+    t_new = time.perf_counter() - t0
+    print(f"[每文件] 逐行扫描 {t_old * 1000:.2f} ms / 哈希索引 {t_new * 1000:.3f} ms，结果{'一致' if old == new else '不一致！'}（{len(new)} 条）")
+    table.close()
+
+
+if __name__ == "__main__":
+    main()
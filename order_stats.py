@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) fuc_main2minor 的“常用次序记忆”统计引擎：每个主函数一个 OrderStats，
+   次要函数块的功能键（fk_to_str 形式）驻留为整数编号，先后计数存成 k×k 整数矩阵 M（M[a, b] = a 排在 b 前面的次数）。
+2) 累计：同一主函数里完全相同的次序序列很多（同一函数在各 GE 里排布一致），先合并成 (序列, 次数) 再累加；
+   装有 NumPy 时同长度的序列叠成矩阵，按上三角下标取出全部 (前, 后) 对，一次 bincount 累加；
+   没有 NumPy 时退回按行累加（结果相同）。
+3) 排序：Copeland 分（胜 - 负）降序 → 平均名次升序 → 键名升序，与原 derive_order_from_stats 相同；
+   NumPy 下整块矩阵运算，不再先把字典补成稠密再逐对比较。平均名次比较前取 12 位小数，不受求和顺序的浮点误差影响。
+4) 与 fc_order_memory.json 的 {"pairwise": {a: {b: 次数}}} 互转（from_pairwise / to_pairwise，只写非零计数）。
+5) 记忆持久化改为紧凑二进制 fc_order_memory.fom（load_memory / save_memory）：
+   一张共用的键表 + 每个主函数的稀疏 (行, 列, 次数)，正文 zlib 压缩，载入只需几次 array.frombytes（毫秒级）。
+6) 迁移：旧版 JSON 里有的键被 fk_to_str 多套了一层（␟ 插在每个字符之间），repair_key 还原后合并重名键的计数。
+   load_memory 在 .fom 不存在时自动从旧 JSON 迁移；也可直接运行本脚本一次性迁移并对比大小与载入耗时。
+用法：
+    st = OrderStats()
+    st.add_sequences(seqs)          # seqs：若干个键序列（每个序列内键不重复）
+    order = st.order()
+    stats, orders = load_memory(fom_path, legacy_json=json_path)
+    python order_stats.py [旧 fc_order_memory.json] [输出 .fom]
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import json_io
+
+try:
+    import numpy as np  # 可选
+except ImportError:
+    np = None
+
+# ============== 配置 ==============
+USE_NUMPY = True        # False 时即使装有 NumPy 也用纯 Python 实现（对照 / 排错用）
+RANK_DIGITS = 12        # 平均名次比较精度（小数位）
+MEMORY_SUFFIX = ".fom"  # 二进制记忆文件后缀
+# =================================
+
+SEP = "␟"               # 与 fuc_main2minor._SEP 一致
+FK_FIELDS = 6           # 与 fuc_main2minor._ID_KEYS 的个数一致
+
+PathLike = Union[str, os.PathLike]
+
+
+def _numpy_enabled() -> bool:
+    return USE_NUMPY and np is not None
+
+
+class OrderStats:
+    """单个主函数的两两先后计数。键按首次出现编号；矩阵按需扩容。"""
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self.keys: List[str] = []
+        self.index: Dict[str, int] = {}
+        self._np = _numpy_enabled()
+        self._cap = 0
+        self._m = np.zeros((0, 0), dtype=np.int64) if self._np else None   # NumPy：int64 方阵（容量 _cap）
+        self._rows: List[array] = []      # 纯 Python：每行一个 array('q')
+        for k in keys:
+            self.intern(k)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # ---------- 键驻留 ----------
+    def intern(self, key: str) -> int:
+        i = self.index.get(key)
+        if i is None:
+            i = len(self.keys)
+            self.keys.append(key)
+            self.index[key] = i
+            self._grow(i + 1)
+        return i
+
+    def _grow(self, n: int) -> None:
+        if self._np:
+            if n > self._cap:
+                cap = max(8, self._cap * 2, n)
+                m = np.zeros((cap, cap), dtype=np.int64)
+                m[:self._cap, :self._cap] = self._m
+                self._m, self._cap = m, cap
+            return
+        while len(self._rows) < n:
+            for row in self._rows:
+                row.append(0)
+            self._rows.append(array("q", bytes(8 * (len(self._rows) + 1))))
+
+    # ---------- 累计 ----------
+    def add_sequence(self, seq: Sequence[str], weight: int = 1) -> None:
+        """seq 中每个在前的键对每个在后的键计 weight 次（序列内键不重复）。"""
+        if len(seq) < 2 or weight <= 0:
+            return
+        ids = [self.intern(k) for k in seq]
+        if self._np:
+            n = len(ids)
+            ix = np.asarray(ids, dtype=np.intp)
+            self._m[np.ix_(ix, ix)] += np.triu(np.full((n, n), weight, dtype=np.int64), 1)
+            return
+        rows = self._rows
+        for i in range(len(ids) - 1):
+            row = rows[ids[i]]
+            for b in ids[i + 1:]:
+                row[b] += weight
+
+    def add_sequences(self, seqs: Iterable[Sequence[str]]) -> None:
+        """相同序列先合并计数再累加；NumPy 下同长度的序列叠成一个矩阵，用一次 bincount 累加全部先后对。"""
+        counted = Counter(tuple(s) for s in seqs if len(s) >= 2)
+        if not self._np:
+            for seq, w in counted.items():
+                self.add_sequence(seq, w)
+            return
+        by_len: Dict[int, Tuple[List[List[int]], List[int]]] = {}
+        for seq, w in counted.items():
+            ids_list, weights = by_len.setdefault(len(seq), ([], []))
+            ids_list.append([self.intern(k) for k in seq])
+            weights.append(w)
+        k = len(self.keys)
+        flat = np.zeros(k * k, dtype=np.int64)
+        for n, (ids_list, weights) in by_len.items():
+            iu, ju = np.triu_indices(n, 1)
+            ids = np.asarray(ids_list, dtype=np.int64)
+            pos = (ids[:, iu] * k + ids[:, ju]).ravel()
+            w = np.repeat(np.asarray(weights, dtype=np.int64), len(iu))
+            flat += np.bincount(pos, weights=w, minlength=k * k).astype(np.int64)
+        self._m[:k, :k] += flat.reshape(k, k)
+
+    def add_pair(self, a: str, b: str, count: int) -> None:
+        ia, ib = self.intern(a), self.intern(b)
+        if ia == ib or not count:
+            return
+        if self._np:
+            self._m[ia, ib] += count
+        else:
+            self._rows[ia][ib] += count
+
+    def merge(self, other: "OrderStats") -> None:
+        """把 other 的计数累加进来（键按 other 的编号顺序驻留）。"""
+        ids = [self.intern(k) for k in other.keys]
+        if not ids:
+            return
+        if self._np and other._np:
+            ix = np.asarray(ids, dtype=np.intp)
+            self._m[np.ix_(ix, ix)] += other.matrix()
+            return
+        for ia, row in zip(ids, other._row_lists()):
+            for jb, c in enumerate(row):
+                if c:
+                    if self._np:
+                        self._m[ia, ids[jb]] += c
+                    else:
+                        self._rows[ia][ids[jb]] += c
+
+    # ---------- 读取 ----------
+    def matrix(self):
+        """NumPy 模式下的 k×k 计数矩阵（视图）。"""
+        n = len(self.keys)
+        return self._m[:n, :n]
+
+    def _row_lists(self) -> List[List[int]]:
+        if self._np:
+            return self.matrix().tolist()
+        return [row.tolist() for row in self._rows]
+
+    def count(self, a: str, b: str) -> int:
+        ia, ib = self.index.get(a), self.index.get(b)
+        if ia is None or ib is None:
+            return 0
+        return int(self._m[ia, ib]) if self._np else self._rows[ia][ib]
+
+    def total(self) -> int:
+        if self._np:
+            return int(self.matrix().sum())
+        return sum(sum(row) for row in self._rows)
+
+    def pairs(self) -> Iterable[Tuple[int, int, int]]:
+        """非零计数 (a 编号, b 编号, 次数)，按 (a, b) 升序。"""
+        if self._np:
+            m = self.matrix()
+            a_idx, b_idx = np.nonzero(m)
+            return zip(a_idx.tolist(), b_idx.tolist(), m[a_idx, b_idx].tolist())
+        return ((a, b, c) for a, row in enumerate(self._rows) for b, c in enumerate(row) if c)
+
+    # ---------- 排序 ----------
+    def scores(self) -> Tuple[List[int], List[float]]:
+        """各键的 (Copeland 分, 平均名次)；平均名次 = 对每个有过比较的对手，被对手领先的比例的平均，无比较时 0.5。"""
+        n = len(self.keys)
+        if not n:
+            return [], []
+        if self._np:
+            w = self.matrix()
+            wt = w.T
+            copeland = (w > wt).sum(axis=1) - (w < wt).sum(axis=1)
+            tot = w + wt
+            seen = tot > 0
+            frac = np.divide(wt, tot, out=np.zeros((n, n), dtype=np.float64), where=seen)
+            cnt = seen.sum(axis=1)
+            avg = np.divide(frac.sum(axis=1), cnt, out=np.full(n, 0.5), where=cnt > 0)
+            return copeland.tolist(), avg.tolist()
+        rows = self._rows
+        copeland: List[int] = []
+        avg: List[float] = []
+        for a in range(n):
+            ra = rows[a]
+            wins = losses = total = 0
+            rank_sum = 0.0
+            for b in range(n):
+                if a == b:
+                    continue
+                wa, wb = ra[b], rows[b][a]
+                if wa > wb: wins += 1
+                elif wa < wb: losses += 1
+                if wa + wb > 0:
+                    rank_sum += wb / (wa + wb)
+                    total += 1
+            copeland.append(wins - losses)
+            avg.append(rank_sum / total if total > 0 else 0.5)
+        return copeland, avg
+
+    def order(self) -> List[str]:
+        copeland, avg = self.scores()
+        return sorted(self.keys, key=lambda k: (-copeland[self.index[k]], round(avg[self.index[k]], RANK_DIGITS), k))
+
+    # ---------- 与 JSON 记忆互转 ----------
+    @classmethod
+    def from_pairwise(cls, pairwise: Optional[Dict[str, Dict[str, int]]], repair: bool = False) -> "OrderStats":
+        """repair=True 时先用 repair_key 修复键；修复后重名的键计数合并。"""
+        st = cls()
+        if not isinstance(pairwise, dict):
+            return st
+        fix = repair_key if repair else (lambda k: k)
+        for a in pairwise:
+            st.intern(fix(a))
+        for a, row in pairwise.items():
+            if not isinstance(row, dict):
+                continue
+            for b, c in row.items():
+                if isinstance(c, int) and not isinstance(c, bool) and c:
+                    st.add_pair(fix(a), fix(b), c)
+                else:
+                    st.intern(fix(b))
+        return st
+
+    @classmethod
+    def from_pairs(cls, keys: List[str], a_ids: Sequence[int], b_ids: Sequence[int],
+                   counts: Sequence[int]) -> "OrderStats":
+        """由键表与稀疏计数（各 (a, b) 不重复）直接构造。"""
+        st = cls(keys)
+        if st._np:
+            if len(counts):
+                st._m[np.asarray(a_ids, dtype=np.intp), np.asarray(b_ids, dtype=np.intp)] = np.asarray(counts, dtype=np.int64)
+        else:
+            rows = st._rows
+            for a, b, c in zip(a_ids, b_ids, counts):
+                rows[a][b] = c
+        return st
+
+    def to_pairwise(self) -> Dict[str, Dict[str, int]]:
+        """每个键一行（含空行，保留键集合），只写非零计数。"""
+        out: Dict[str, Dict[str, int]] = {k: {} for k in self.keys}
+        keys = self.keys
+        for a, b, c in self.pairs():
+            out[keys[a]][keys[b]] = c
+        return out
+
+
+# ---------- 键修复 ----------
+def repair_key(key: str) -> str:
+    """
+    修复被 fk_to_str 再套了一层的键（把字符串当元组逐字符用 ␟ 连接，奇数位全是 ␟）：取偶数位，可多层。
+    合法键恰有 FK_FIELDS - 1 个分隔符，不会被误改。
+    """
+    while (isinstance(key, str) and key.count(SEP) > FK_FIELDS - 1 and len(key) % 2 == 1
+           and key[1::2].count(SEP) == len(key) // 2):
+        key = key[0::2]
+    return key
+
+
+# ---------- 记忆文件（二进制） ----------
+# 文件头（不压缩）：魔数 / 版本 / 键表条数 / 主函数数；其后为 zlib 压缩的正文：
+#   键表：uint32 偏移 × (n_keys+1) + UTF-8 blob（主函数名与功能键共用一张表）
+#   目录：每个主函数 uint32 × 4 = (名字编号, 键数 k, 非零计数数 nnz, 记忆顺序长度)
+#   各主函数依次拼接：键编号 uint32 × k；计数行号 uint32 × nnz；列号 uint32 × nnz；次数 uint64 × nnz；顺序 uint32 × len
+#   （行号 / 列号 / 顺序都是该主函数内的局部编号）
+_MAGIC = b"FOM1"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+
+
+def _le(arr: array) -> array:
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+def dumps_memory(stats: Dict[str, OrderStats], orders: Dict[str, List[str]]) -> bytes:
+    table: Dict[str, int] = {}
+
+    def key_id(k: str) -> int:
+        i = table.get(k)
+        if i is None:
+            i = table[k] = len(table)
+        return i
+
+    directory = array("I")
+    key_ids, rows, cols, order_ids = array("I"), array("I"), array("I"), array("I")
+    counts = array("Q")
+    for fn in sorted(stats):
+        st = stats[fn]
+        order = [k for k in orders.get(fn, []) if k in st.index]
+        nnz = 0
+        for a, b, c in st.pairs():
+            rows.append(a); cols.append(b); counts.append(c)
+            nnz += 1
+        directory.extend((key_id(fn), len(st.keys), nnz, len(order)))
+        key_ids.extend(key_id(k) for k in st.keys)
+        order_ids.extend(st.index[k] for k in order)
+
+    blobs = [k.encode("utf-8", "surrogatepass") for k in table]
+    offsets = array("I", [0])
+    for b in blobs:
+        offsets.append(offsets[-1] + len(b))
+    body = b"".join([_le(offsets).tobytes(), b"".join(blobs)]
+                    + [_le(arr).tobytes() for arr in (directory, key_ids, rows, cols, counts, order_ids)])
+    return _HEADER.pack(_MAGIC, _VERSION, len(table), len(directory) // 4) + zlib.compress(body, 6)
+
+
+def loads_memory(data: bytes) -> Tuple[Dict[str, OrderStats], Dict[str, List[str]]]:
+    magic, version, n_keys, n_funcs = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("不是可识别的次序记忆文件")
+    body = memoryview(zlib.decompress(data[_HEADER.size:]))
+    pos = 0
+
+    def take(code: str, n: int) -> array:
+        nonlocal pos
+        arr = array(code)
+        size = arr.itemsize * n
+        if pos + size > len(body):
+            raise ValueError("次序记忆文件不完整")
+        arr.frombytes(body[pos:pos + size])
+        pos += size
+        return _le(arr)
+
+    offsets = take("I", n_keys + 1)
+    blob = bytes(body[pos:pos + offsets[-1]])
+    pos += offsets[-1]
+    names = [blob[offsets[i]:offsets[i + 1]].decode("utf-8", "surrogatepass") for i in range(n_keys)]
+    directory = take("I", 4 * n_funcs)
+    k_sum = sum(directory[1::4]); nnz_sum = sum(directory[2::4]); ord_sum = sum(directory[3::4])
+    key_ids, rows, cols = take("I", k_sum), take("I", nnz_sum), take("I", nnz_sum)
+    counts, order_ids = take("Q", nnz_sum), take("I", ord_sum)
+
+    stats: Dict[str, OrderStats] = {}
+    orders: Dict[str, List[str]] = {}
+    pk = pp = po = 0
+    for f in range(n_funcs):
+        name_id, k, nnz, n_ord = directory[4 * f:4 * f + 4]
+        keys = [names[i] for i in key_ids[pk:pk + k]]
+        fn = names[name_id]
+        stats[fn] = OrderStats.from_pairs(keys, rows[pp:pp + nnz], cols[pp:pp + nnz], counts[pp:pp + nnz])
+        if n_ord:
+            orders[fn] = [keys[i] for i in order_ids[po:po + n_ord]]
+        pk += k; pp += nnz; po += n_ord
+    return stats, orders
+
+
+def migrate_legacy(data: Any) -> Tuple[Dict[str, OrderStats], Dict[str, List[str]], Dict[str, int]]:
+    """
+    旧版 fc_order_memory.json（{主函数: {"pairwise": {a: {b: 次数}}, "order": [...]}}）→ 引擎对象。
+    修复被逐字符插入 ␟ 的键并合并重名键的计数；记忆顺序按修复后的计数重新推导。
+    返回 (stats, orders, 统计：keys_before / keys_after / repaired)。
+    """
+    stats: Dict[str, OrderStats] = {}
+    orders: Dict[str, List[str]] = {}
+    info = {"keys_before": 0, "keys_after": 0, "repaired": 0}
+    if not isinstance(data, dict):
+        return stats, orders, info
+    for fn, entry in data.items():
+        if not isinstance(entry, dict):
+            continue
+        pairwise = entry.get("pairwise")
+        raw = set(pairwise) if isinstance(pairwise, dict) else set()
+        for row in (pairwise.values() if isinstance(pairwise, dict) else ()):
+            if isinstance(row, dict):
+                raw.update(row)
+        st = OrderStats.from_pairwise(pairwise, repair=True)
+        info["keys_before"] += len(raw)
+        info["keys_after"] += len(st.keys)
+        info["repaired"] += sum(1 for k in raw if repair_key(k) != k)
+        stats[fn] = st
+        if "order" in entry:
+            orders[fn] = st.order()
+    return stats, orders, info
+
+
+def load_memory(path: PathLike, legacy_json: Optional[PathLike] = None) -> Tuple[Dict[str, OrderStats], Dict[str, List[str]]]:
+    """
+    读取二进制记忆；文件缺失或损坏时若给了 legacy_json 且存在，则从旧版 JSON 迁移（修复键）；都没有返回空。
+    """
+    if os.path.isfile(path):
+        try:
+            with open(path, "rb") as f:
+                return loads_memory(f.read())
+        except (ValueError, struct.error, zlib.error) as e:
+            print(f"[记忆] {path} 无法读取（{e}），忽略。")
+    if legacy_json and os.path.isfile(legacy_json):
+        stats, orders, info = migrate_legacy(json_io.load_loose(legacy_json))
+        print(f"[记忆] 从旧版 {os.path.basename(legacy_json)} 迁移：{len(stats)} 个主函数，"
+              f"修复键 {info['repaired']} 个，键 {info['keys_before']} → {info['keys_after']}")
+        return stats, orders
+    return {}, {}
+
+
+def save_memory(path: PathLike, stats: Dict[str, OrderStats], orders: Dict[str, List[str]]) -> None:
+    """原子写出（先写临时文件再替换）。"""
+    data = dumps_memory(stats, orders)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{os.fspath(path)}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def main():
+    """迁移工具：python order_stats.py [旧 fc_order_memory.json] [输出 .fom]"""
+    src = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles\fc_order_memory.json")
+    out = Path(sys.argv[2]) if len(sys.argv) > 2 else src.with_suffix(MEMORY_SUFFIX)
+    if not src.is_file():
+        print(f"[错误] 找不到：{src}")
+        return
+    t0 = time.perf_counter()
+    data = json_io.load_loose(src)
+    t_json = time.perf_counter() - t0
+    stats, orders, info = migrate_legacy(data)
+    save_memory(out, stats, orders)
+
+    t0 = time.perf_counter()
+    stats2, orders2 = load_memory(out)
+    t_bin = time.perf_counter() - t0
+    same = (orders2 == orders and stats2.keys() == stats.keys()
+            and all(stats2[fn].to_pairwise() == st.to_pairwise() for fn, st in stats.items()))
+    print(f"[迁移] {len(stats)} 个主函数；修复键 {info['repaired']} 个；键 {info['keys_before']} → {info['keys_after']}（合并重复）")
+    print(f"[大小] {src.name} {src.stat().st_size / 1024:.1f} KB → {out.name} {out.stat().st_size / 1024:.1f} KB")
+    print(f"[载入] 旧 JSON {t_json * 1000:.2f} ms / 新格式 {t_bin * 1000:.2f} ms；回读{'一致' if same else '不一致！'}")
+    print(f"[完成] 已写入：{out}（原 JSON 保留，可手动删除）")
+
+
+if __name__ == "__main__":
+    main()
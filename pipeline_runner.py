@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 单次流水线：每个 JSON 只读一次、写一次，中间各步骤全在内存中完成：
+     读取 → fill_indices_export（重排/平移/回填）→ fix_indices_namemap（Imports/索引/NameMap 修正）
+          → NameMap 重复检查（namemap_dedupe，可选去重）→ 写出 → 可选直接交给 json2uasset 转换
+   以前三个脚本各自 load + json.dump(indent=2) 一遍，同一资源被解析、美化输出三次。
+2) 多进程并行（ProcessPoolExecutor）：每个进程启动时只加载一次 fc_main_imports.json 与 namemap_all.txt
+   （总表为 namemap_table 的编译文件，主进程先确保编译好，各进程 mmap 共享同一份）。
+   各文件的控制台输出在子进程内收集，回到主进程后按文件整段打印，不会互相穿插。
+3) 各步骤自身的配置（前缀、平移位点、映射表路径、转换器等）仍取各脚本顶部常量；本脚本只管输入、输出与开关。
+"""
+
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import fill_indices_export
+import fix_indices_namemap
+import json2uasset
+import namemap_dedupe
+import namemap_table
+
+# ============== 配置（按需修改） ==============
+# 递归处理这些目录下、文件名以 FILENAME_PREFIXES 开头的 .json；命令行给出文件/目录时以命令行为准
+INPUT_DIRS: List[str] = [
+    r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_XTZH\Wandering_Sword\Content\JH\Skills\JH_A_ZhongSheng",
+]
+FILENAME_PREFIXES: Tuple[str, ...] = ("GE",)   # () 表示不过滤
+
+# 输出：True 覆盖源文件；False 按输入目录镜像到 OUTPUT_DIR
+WRITE_TO_SOURCE = True
+OUTPUT_DIR = r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles\pipeline"
+
+# 步骤开关
+RUN_FILL_INDICES = True      # fill_indices_export
+RUN_FIX_NAMEMAP = True       # fix_indices_namemap
+RUN_DEDUPE_CHECK = True      # NameMap 重复检查
+DEDUPE_REMOVE = False        # True：写出前去掉 NameMap 中的重复项（保留首次出现）
+RUN_CONVERT = False          # True：写出后直接调用 json2uasset 转换
+
+# 并行进程数；0/None = CPU 核数
+MAX_PROCESSES = 0
+# 控制台只打印每个文件输出的前 N 行（0 = 全部）
+LOG_LINES_PER_FILE = 0
+# ===========================================
+
+# 子进程内的共享资源（由 _init_worker 设置）
+_SETTINGS: Dict[str, Any] = {}
+_MAIN_IMPORTS_MAP: Optional[Dict[str, List[Dict[str, Any]]]] = None
+_NM_LINES: Union[namemap_table.NameTable, List[str], None] = None   # 加载失败时为空列表（跳过总表对比）
+
+
+def _settings(shift_plan: Dict[str, List[int]]) -> Dict[str, Any]:
+    """主进程的开关打包传给子进程（Windows 下子进程重新导入本模块，看不到运行时改过的全局变量）。"""
+    return {
+        "write_to_source": WRITE_TO_SOURCE, "output_dir": OUTPUT_DIR,
+        "fill": RUN_FILL_INDICES, "fix": RUN_FIX_NAMEMAP,
+        "dedupe": RUN_DEDUPE_CHECK, "dedupe_remove": DEDUPE_REMOVE, "convert": RUN_CONVERT,
+        "shift": fill_indices_export.ENABLE_SHIFT,
+        "shift_positions": list(fill_indices_export.SHIFT_POSITIONS), "shift_plan": shift_plan,
+    }
+
+
+def _init_worker(settings: Dict[str, Any]) -> None:
+    global _SETTINGS, _MAIN_IMPORTS_MAP, _NM_LINES
+    _SETTINGS = settings
+    if not settings["fix"]:
+        return
+    try:
+        _MAIN_IMPORTS_MAP = fix_indices_namemap.load_main_imports_map(fix_indices_namemap.MAIN_IMPORTS_MAP_PATH)
+    except FileNotFoundError as e:
+        _MAIN_IMPORTS_MAP = {}
+        print(f"[警告] {e}；跳过 Import 补齐。")
+    try:
+        _NM_LINES = namemap_table.load_table(fix_indices_namemap.NAMEMAP_TXT)
+    except Exception as e:
+        _NM_LINES = []
+        print(f"[NameMap] 加载总表失败（{e}），跳过总表对比阶段。")
+
+
+def gather_inputs(targets: List[str]) -> List[Tuple[str, str]]:
+    """返回 [(所属根目录, json 路径)]；单文件的根目录取其所在目录。"""
+    out: List[Tuple[str, str]] = []
+    seen = set()
+    for t in targets:
+        if os.path.isfile(t):
+            items = [(os.path.dirname(t), t)]
+        elif os.path.isdir(t):
+            items = fix_indices_namemap._iter_json_files([t], FILENAME_PREFIXES)
+        else:
+            print(f"[跳过] 不存在：{t}")
+            continue
+        for root, p in items:
+            p = os.path.abspath(p)
+            if p not in seen:
+                seen.add(p)
+                out.append((root, p))
+    return out
+
+
+def dedupe_namemap(data: Dict[str, Any], remove: bool) -> None:
+    _, nm = fix_indices_namemap.get_namemap_key_and_list(data)
+    dups = namemap_dedupe.array_duplicates(nm)
+    if not dups:
+        print("[NameMap 查重] 未发现重复")
+        return
+    print(f"[NameMap 查重] 重复 {len(dups)} 项：" + "，".join(f"{it}×{n}" for it, n in dups[:10]))
+    if remove:
+        seen = set()
+        kept = []
+        for v in nm:
+            h = namemap_dedupe.json_hashable(v)
+            if h not in seen:
+                seen.add(h)
+                kept.append(v)
+        removed = len(nm) - len(kept)
+        nm[:] = kept
+        print(f"[NameMap 查重] 已去掉 {removed} 个重复项")
+
+
+def run_one(root_dir: str, json_path: str) -> Tuple[str, bool, str, str]:
+    """子进程：处理一个文件；返回 (输出路径, 是否成功, 控制台输出, 简要结果)。"""
+    s = _SETTINGS
+    buf = io.StringIO()
+    out_path = json_path
+    ok, brief = True, ""
+    with redirect_stdout(buf):
+        try:
+            t0 = time.perf_counter()
+            doc = fill_indices_export.load_json(json_path)
+            if s["fill"]:
+                shift = fill_indices_export.plan_positions(s["shift_plan"], json_path, s["shift_positions"]) if s["shift"] else []
+                fill_indices_export.process_doc(doc, shift)
+            if s["fix"]:
+                fix_indices_namemap.fix_document(doc, _MAIN_IMPORTS_MAP, _NM_LINES)
+            if s["dedupe"]:
+                dedupe_namemap(doc, s["dedupe_remove"])
+            if not s["write_to_source"]:
+                out_path = os.path.join(s["output_dir"], os.path.relpath(json_path, start=root_dir))
+            fill_indices_export.dump_json(doc, out_path)
+            brief = f"OK {time.perf_counter() - t0:.2f}s -> {out_path}"
+            if s["convert"]:
+                c_ok, c_brief, c_detail = json2uasset.convert_one(Path(out_path))
+                print(f"[json2uasset] {c_brief}")
+                if not c_ok:
+                    ok = False
+                    brief = c_brief
+                    if c_detail:
+                        print(c_detail)
+        except Exception as e:
+            ok = False
+            brief = f"ERR {type(e).__name__}: {e}"
+            print(brief)
+    return out_path, ok, buf.getvalue(), brief
+
+
+def main():
+    targets = sys.argv[1:] or INPUT_DIRS
+    inputs = gather_inputs(targets)
+    if not inputs:
+        print("[错误] 没有可处理的 JSON。")
+        return
+
+    procs = MAX_PROCESSES or os.cpu_count() or 1
+    procs = max(1, min(procs, len(inputs)))
+    print(f"[流水线] {len(inputs)} 个文件，{procs} 个进程；"
+          f"步骤：{'回填 ' if RUN_FILL_INDICES else ''}{'NameMap修正 ' if RUN_FIX_NAMEMAP else ''}"
+          f"{'查重 ' if RUN_DEDUPE_CHECK else ''}{'转换' if RUN_CONVERT else ''}")
+
+    if RUN_FIX_NAMEMAP:
+        try:   # 先在主进程编译好，子进程直接映射，不会各自重编译
+            namemap_table.load_table(fix_indices_namemap.NAMEMAP_TXT)
+        except Exception as e:
+            print(f"[NameMap] 加载总表失败（{e}），跳过总表对比阶段。")
+
+    # 平移计划只在主进程读一次；计划非空时不在计划里的文件不平移（与 fill_indices_export 一致）
+    shift_plan = fill_indices_export.load_shift_plan() if RUN_FILL_INDICES and fill_indices_export.ENABLE_SHIFT else {}
+
+    t0 = time.perf_counter()
+    ok_n = 0
+    failed: List[Tuple[str, str]] = []
+    with ProcessPoolExecutor(max_workers=procs, initializer=_init_worker, initargs=(_settings(shift_plan),)) as ex:
+        futures = {ex.submit(run_one, root, p): p for root, p in inputs}
+        for i, fut in enumerate(as_completed(futures), 1):
+            src = futures[fut]
+            _, ok, log, brief = fut.result()
+            print("\n" + "=" * 80)
+            print(f"[{i}/{len(inputs)}] {src}")
+            lines = log.rstrip().splitlines()
+            if LOG_LINES_PER_FILE and len(lines) > LOG_LINES_PER_FILE:
+                lines = lines[:LOG_LINES_PER_FILE] + [f"...（省略 {len(lines) - LOG_LINES_PER_FILE} 行）"]
+            for ln in lines:
+                print(ln)
+            print(brief)
+            if ok:
+                ok_n += 1
+            else:
+                failed.append((src, brief))
+
+    el = time.perf_counter() - t0
+    print(f"\n[汇总] 成功 {ok_n} / 失败 {len(failed)} / 共 {len(inputs)}，用时 {el:.1f}s（{len(inputs) / max(el, 1e-9):.1f} 文件/s）")
+    for p, b in failed[:10]:
+        print(f"  - {p}: {b}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 逐文件的扫描结果缓存（SQLite 单文件），替代整份读入、整份 indent=2 重写的 JSON 缓存。
+2) 每条记录：路径 / 大小 / mtime / 结果标签 / 结果正文（紧凑 JSON，zlib 压缩）。
+   - 存储结构版本（STORE_VERSION）写在 meta 表，不符时整库清空；
+   - 结果标签由调用方给出（结果格式版本 + 影响结果的配置），与当前标签不同的条目视为过期；
+   - 可再传 validate(结果) 做结构检查，不通过的条目同样视为过期（按未命中处理，重新解析后覆盖）。
+3) 读：get_many 按路径批量查询，只返回签名与标签都对得上、且能通过检查的条目；
+   写：put_many 只写本次重新解析的文件（一个事务），其它条目原样保留。
+4) 直接运行：打印缓存条目数、按标签分布与文件大小。
+用法：
+    cache = ScanCache(path, tag="7:keep_first", validate=is_valid)
+    hits = cache.get_many({fp: sig, ...})
+    cache.put_many([(fp, sig, result), ...])
+    cache.close()
+    python scan_cache.py [fc_scan_cache.sqlite]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+try:
+    import orjson  # 可选
+except ImportError:
+    orjson = None
+
+# ============== 配置 ==============
+STORE_VERSION = 1      # 存储结构版本：表结构 / 正文编码变化时递增，旧库自动清空
+COMPRESS_LEVEL = 1     # 正文 zlib 压缩级别（0=不压缩）
+# =================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta(
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files(
+    path  TEXT PRIMARY KEY,
+    size  INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    tag   TEXT NOT NULL,
+    body  BLOB NOT NULL
+);
+"""
+
+PathLike = Union[str, os.PathLike]
+Signature = Tuple[int, float]   # (大小, mtime)
+
+
+def file_signature(path: str) -> Optional[Signature]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+
+def _encode(value: Any) -> bytes:
+    raw = None
+    if orjson is not None:
+        try:
+            raw = orjson.dumps(value)
+        except TypeError:   # 超 64 位整数等：交给标准库
+            raw = None
+    if raw is None:
+        raw = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, COMPRESS_LEVEL) if COMPRESS_LEVEL else raw
+
+
+def _decode(body: bytes) -> Any:
+    raw = zlib.decompress(body) if COMPRESS_LEVEL else body
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _chunks(seq: Sequence[Any], n: int = 900):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+
+class ScanCache:
+    """单个缓存库；tag 为当前结果标签，validate 为可选的结构检查。"""
+
+    def __init__(self, path: PathLike, tag: str, validate: Optional[Callable[[Any], bool]] = None):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.tag = tag
+        self.validate = validate
+        self.stale = 0    # 最近一次 get_many 中签名相同但标签 / 结构不符的条目数
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        row = self.conn.execute("SELECT value FROM meta WHERE key='store_version'").fetchone()
+        if row is None or row[0] != str(STORE_VERSION):
+            with self.conn:
+                self.conn.execute("DELETE FROM files")
+                self.conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('store_version', ?)",
+                                  (str(STORE_VERSION),))
+
+    def get_many(self, sigs: Dict[str, Signature]) -> Dict[str, Any]:
+        """sigs：路径 -> 当前签名。返回命中的 路径 -> 结果。"""
+        hits: Dict[str, Any] = {}
+        self.stale = 0
+        for chunk in _chunks(list(sigs)):
+            rows = self.conn.execute(
+                f"SELECT path, size, mtime, tag, body FROM files WHERE path IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for path, size, mtime, tag, body in rows:
+                if (size, mtime) != tuple(sigs[path]):
+                    continue
+                try:
+                    value = _decode(body) if tag == self.tag else None
+                except (zlib.error, ValueError):
+                    value = None
+                if value is None or (self.validate is not None and not self.validate(value)):
+                    self.stale += 1
+                    continue
+                hits[path] = value
+        return hits
+
+    def put_many(self, items: Iterable[Tuple[str, Signature, Any]]) -> int:
+        """写入 (路径, 签名, 结果)，同路径覆盖；返回写入条数。"""
+        rows = [(path, sig[0], sig[1], self.tag, _encode(value)) for path, sig, value in items]
+        if rows:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO files(path, size, mtime, tag, body) VALUES(?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def main():
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles\fc_scan_cache.sqlite")
+    if not path.is_file():
+        print(f"[错误] 找不到：{path}")
+        return
+    conn = sqlite3.connect(str(path))
+    row = conn.execute("SELECT value FROM meta WHERE key='store_version'").fetchone()
+    print(f"[缓存] {path}（{path.stat().st_size / 1024:.1f} KB，存储版本 {row[0] if row else '?'}）")
+    for tag, n, size in conn.execute("SELECT tag, COUNT(*), SUM(LENGTH(body)) FROM files GROUP BY tag ORDER BY tag"):
+        print(f"  标签 {tag}：{n} 个文件，正文 {size / 1024:.1f} KB")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 扫描类脚本（search_funcNtagNtrigger / namemap_all_exporter / find_buffid / fuc_main2minor）共用的并行执行器：
+   - "thread"：线程池（原行为）；json.load 与递归遍历受 GIL 限制，线程再多也基本只用到一个核；
+   - "process"：进程池，真正多核解析。
+2) 进程模式按块下发：每个任务是一批文件（CHUNK_SIZE，0=自动），子进程一次处理整块再整体返回，
+   不再每个文件一次进程间往返；同时在途的块数有上限，大目录也不会一次性提交全部任务。
+3) 结果回传尽量紧凑：只回传任务在输入中的序号与函数返回值（字符串集合等），不回传路径对象与原始文档。
+4) 进程模式下 fn 必须是模块顶层函数（可被 pickle）；Windows 子进程会重新导入该模块，
+   运行时改过的全局变量看不到，需要的参数请通过 args 传入。
+用法：
+    for item, result, err in scan_map(process_file, files, mode=EXECUTOR, workers=MAX_WORKERS):
+        ...
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+# ============== 配置 ==============
+CHUNK_SIZE = 0          # 进程模式每块文件数；0 = 自动（约每个进程 4 块，单块 1~64 个）
+INFLIGHT_PER_WORKER = 2 # 进程模式每个进程同时在途的块数
+# =================================
+
+MODES = ("thread", "process")
+
+
+def default_workers(mode: str) -> int:
+    """进程模式默认 = CPU 核数；线程模式与 ThreadPoolExecutor 的默认值一致。"""
+    n = os.cpu_count() or 1
+    return n if mode == "process" else min(32, n + 4)
+
+
+def auto_chunk(n_items: int, workers: int) -> int:
+    if CHUNK_SIZE > 0:
+        return CHUNK_SIZE
+    return max(1, min(64, n_items // max(1, workers * 4)))
+
+
+def _run_chunk(fn: Callable, start: int, items: Sequence[Any], args: tuple) -> List[Tuple[int, Any, Optional[str]]]:
+    """子进程：处理一块；单个文件出错不影响同块其它文件。"""
+    out: List[Tuple[int, Any, Optional[str]]] = []
+    for i, it in enumerate(items):
+        try:
+            out.append((start + i, fn(it, *args), None))
+        except Exception as e:
+            out.append((start + i, None, f"{type(e).__name__}: {e}"))
+    return out
+
+
+def _run_one(fn: Callable, it: Any, args: tuple) -> Tuple[Any, Optional[str]]:
+    try:
+        return fn(it, *args), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def scan_map(fn: Callable, items: Sequence[Any], mode: str = "thread", workers: Optional[int] = None,
+             args: tuple = (), chunk_size: Optional[int] = None) -> Iterator[Tuple[Any, Any, Optional[str]]]:
+    """
+    对 items 逐个执行 fn(item, *args)，按完成顺序产出 (item, result, err)；出错时 result=None、err 为说明。
+    """
+    if mode not in MODES:
+        raise ValueError(f"未知执行模式：{mode}（可选 {', '.join(MODES)}）")
+    items = list(items)
+    if not items:
+        return
+    workers = max(1, min(workers or default_workers(mode), len(items)))
+
+    if mode == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futs = {ex.submit(_run_one, fn, it, args): it for it in items}
+            for fut in as_completed(futs):
+                result, err = fut.result()
+                yield futs[fut], result, err
+        return
+
+    size = chunk_size or auto_chunk(len(items), workers)
+    chunks = [(s, items[s:s + size]) for s in range(0, len(items), size)]
+    limit = workers * INFLIGHT_PER_WORKER
+    next_chunk = 0
+    inflight = set()
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        while next_chunk < len(chunks) or inflight:
+            while next_chunk < len(chunks) and len(inflight) < limit:
+                start, part = chunks[next_chunk]
+                next_chunk += 1
+                inflight.add(ex.submit(_run_chunk, fn, start, part, args))
+            done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                for idx, result, err in fut.result():
+                    yield items[idx], result, err
@@ -2,13 +2,17 @@
 功能：
 - 导出 指定文件夹及其子文件夹中，所有GE、GA文件 的 Blueprint 路径，格式为：ID + 基础路径 + 完整路径_C
 - 可以指定单个BuffId或者SkillId，只导出其完整路径_C
+- USE_CORPUS_INDEX=True 时从共享语料索引（corpus_index）读取 Id / SkillId / NameMap，只增量解析变更文件
+- 延迟载入（uasset_model.load_lazy_json）：NameMap 命中、且 GE 的 Exports[2] 有 Id 时只解析这一个 export 的 Data，
+  否则再整份展开做原来的递归查找，结果不变
 """
 
 import os
 import re
-import json
 from typing import Any, Dict, List, Optional, Tuple
 
+import uasset_model
+
 # === 配置区（按需修改） =========================================================
 SEARCH_DIRS = [
     r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_XTZH\Wandering_Sword\Content\JH\Skills",
@@ -25,14 +29,17 @@ FULL_OUTPUT: bool = False
 #   - skillid: GA 的 SkillId
 SPECIFY_BUFFIDS: List[int] = [2593060,2593061,2593062,2593063,2593064,2593065]      # 例如：[2592920, 2592930]
 SPECIFY_SKILLIDS: List[int] = []     # 例如：[2592902, 2592903]
+
+# True：使用共享语料索引（corpus_index.INDEX_PATH）；False：逐文件全量解析
+USE_CORPUS_INDEX: bool = False
 # ============================================================================
 
 
 # === 工具函数 ===
 def read_json(path: str) -> Optional[Dict[str, Any]]:
+    """延迟载入：export 的 Data 用到时才解析（uasset_model.export_data / materialize）。"""
     try:
-        with open(path, "r", encoding="utf-8-sig") as f:
-            return json.load(f)
+        return uasset_model.load_lazy_json(path)
     except Exception as e:
         print(f"[读取失败] {path} -> {e}")
         return None
@@ -66,6 +73,11 @@ def build_namemap_from_path(file_path: str) -> Optional[Tuple[str, str, List[str
     namemap = "/".join(nm_parts).replace("//", "/")
     return namemap, base_prefix, middle_parts, name
 
+def _namemap_list(obj: Dict[str, Any]) -> List[Any]:
+    key = next((k for k in obj if str(k).lower() == "namemap"), None)
+    nm = obj.get(key) if key is not None else None
+    return nm if isinstance(nm, list) else []
+
 def json_contains_value(obj: Any, target: str) -> bool:
     """递归检查 JSON 是否包含指定字符串值（完全匹配）"""
     if isinstance(obj, dict):
@@ -83,12 +95,12 @@ def json_contains_value(obj: Any, target: str) -> bool:
 
 def extract_ge_id(obj: Dict[str, Any]) -> Optional[int]:
     """
-    优先严格按要求：读取 Exports[2] -> Data 中 Name == "Id" 的 Value
-    若结构稍有差异，做容错：尝试 Export/exports/递归回退。
+    优先严格按要求：读取 Exports[2] -> Data 中 Name == "Id" 的 Value（延迟载入时只解析这一个 export 的 Data）
+    若结构稍有差异，做容错：尝试 Export/exports/递归回退（此时整份展开）。
     """
     for key in ("Exports", "Export", "exports", "export"):
         if key in obj and isinstance(obj[key], list) and len(obj[key]) > 2 and isinstance(obj[key][2], dict):
-            data = obj[key][2].get("Data")
+            data = uasset_model.export_data(obj[key][2])
             if isinstance(data, list):
                 for item in data:
                     if isinstance(item, dict) and item.get("Name") == "Id":
@@ -96,6 +108,7 @@ def extract_ge_id(obj: Dict[str, Any]) -> Optional[int]:
                         if isinstance(val, int):
                             return val
     # 回退：全表递归找 Name=="Id" 的 int Value
+    uasset_model.materialize(obj)
     found: List[int] = []
 
     def dfs(o: Any):
@@ -141,11 +154,12 @@ def write_block(fh, id_val: int, namemap: str, name: str):
     fh.write(f"\"{namemap}\",\n")
     fh.write(f"\"{full_c}\",\n")   # ← 原来这里是 \n\n，去掉一个换行
 
-def process_file(json_path: str, issues: List[str], ge_records: List[Tuple[int, str, str]], ga_records: List[Tuple[int, str, str]]):
+def classify_file(json_path: str) -> Optional[Tuple[bool, bool]]:
+    """按文件名判定 GE / GA；不需要处理的文件返回 None。"""
     base = os.path.basename(json_path)
     stem, ext = os.path.splitext(base)
     if ext.lower() != ".json":
-        return
+        return None
 
     # 大小写严格区分：前缀与 _BD 后缀
     is_ge = stem.startswith("GE_") or stem.endswith("_BD")
@@ -153,43 +167,94 @@ def process_file(json_path: str, issues: List[str], ge_records: List[Tuple[int,
 
     # 非 GE / GA（且不满足 _BD 规则）的文件直接跳过
     if not (is_ge or is_ga):
-        return
+        return None
 
     # 忽略项：GA 且文件名包含 Passive / PASS（按段匹配，大小写不敏感），避免命中如 "bypass"
     if is_ga:
         if re.search(r'(?i)(?:^|_)(passive|pass)(?:_|$)', stem):
-            return
+            return None
+    return is_ge, is_ga
 
-    nm_info = build_namemap_from_path(json_path)
-    if nm_info is None:
-        issues.append(f"[路径无法定位 Skills] {json_path}")
-        return
-    namemap, base_prefix, middle_parts, name = nm_info
-
-    data = read_json(json_path)
-    if data is None:
-        issues.append(f"[JSON读取失败] {json_path}")
-        return
-
-    # 确认 JSON 内确实包含该 NameMap（完全匹配）
-    has_nm = json_contains_value(data, namemap)
+def record_file(json_path: str, is_ge: bool, namemap: str, name: str, has_nm: bool,
+                ge_id: Optional[int], skill_id: Optional[int], issues: List[str],
+                ge_records: List[Tuple[int, str, str]], ga_records: List[Tuple[int, str, str]]):
     if not has_nm:
         issues.append(f"[NameMap未找到] {json_path} :: {namemap}")
 
     # 提取 ID / SkillId
     if is_ge:
-        ge_id = extract_ge_id(data)
         if ge_id is None:
             issues.append(f"[GE缺少Id] {json_path}")
         else:
             ge_records.append((ge_id, namemap, name))
     else:  # is_ga
-        skill_id = extract_ga_skillid(data)
         if skill_id is None:
             issues.append(f"[GA缺少SkillId] {json_path}")
         else:
             ga_records.append((skill_id, namemap, name))
 
+def process_file(json_path: str, issues: List[str], ge_records: List[Tuple[int, str, str]], ga_records: List[Tuple[int, str, str]]):
+    kind = classify_file(json_path)
+    if kind is None:
+        return
+    is_ge, _ = kind
+
+    nm_info = build_namemap_from_path(json_path)
+    if nm_info is None:
+        issues.append(f"[路径无法定位 Skills] {json_path}")
+        return
+    namemap, base_prefix, middle_parts, name = nm_info
+
+    data = read_json(json_path)
+    if data is None:
+        issues.append(f"[JSON读取失败] {json_path}")
+        return
+
+    # 确认 JSON 内确实包含该 NameMap（完全匹配）；NameMap 里有就不必展开全部 Data
+    has_nm = namemap in _namemap_list(data) or json_contains_value(uasset_model.materialize(data), namemap)
+    ge_id = extract_ge_id(data) if is_ge else None
+    skill_id = None if is_ge else extract_ga_skillid(uasset_model.materialize(data))
+    record_file(json_path, is_ge, namemap, name, has_nm, ge_id, skill_id, issues, ge_records, ga_records)
+
+def process_files_with_index(roots: List[str], issues: List[str], ge_records: List[Tuple[int, str, str]], ga_records: List[Tuple[int, str, str]]):
+    """
+    与 process_file 相同的判定，但 Id / SkillId / NameMap 从语料索引读取：
+      - GE Id：优先 Exports[2].Data 顶层 Id，否则第一个 Name=="Id"
+      - GA SkillId：第一个 SkillId
+      - NameMap 校验：NameMap 或 Import 名中存在该路径
+    """
+    import corpus_index as ci
+    conn = ci.open_index()
+    try:
+        paths = ci.refresh(conn, roots, lambda fn: classify_file(fn) is not None)
+        kinds = (ci.K_NAMEMAP, ci.K_IMPORT, ci.K_ID_MAIN, ci.K_ID, ci.K_SKILLID)
+        rows_by_file = ci.query_values(conn, paths, kinds)
+    finally:
+        conn.close()
+
+    for json_path in paths:
+        is_ge, _ = classify_file(json_path)
+        nm_info = build_namemap_from_path(json_path)
+        if nm_info is None:
+            issues.append(f"[路径无法定位 Skills] {json_path}")
+            continue
+        namemap, _, _, name = nm_info
+
+        rows = rows_by_file.get(json_path)
+        if rows is None:
+            issues.append(f"[JSON读取失败] {json_path}")
+            continue
+        firsts: Dict[str, int] = {}
+        has_nm = False
+        for kind, value, _ in rows:
+            if kind in (ci.K_NAMEMAP, ci.K_IMPORT):
+                has_nm = has_nm or value == namemap
+            else:
+                firsts.setdefault(kind, value)
+        ge_id = firsts.get(ci.K_ID_MAIN, firsts.get(ci.K_ID)) if is_ge else None
+        skill_id = None if is_ge else firsts.get(ci.K_SKILLID)
+        record_file(json_path, is_ge, namemap, name, has_nm, ge_id, skill_id, issues, ge_records, ga_records)
+
 # === 主流程 ===
 def main():
     ensure_dir(OUTPUT_DIR)
@@ -198,16 +263,22 @@ def main():
     issues: List[str] = []
 
     # 扫描与收集
+    valid_roots: List[str] = []
     for root in SEARCH_DIRS:
         if not os.path.isdir(root):
             issues.append(f"[目录不存在] {root}")
             continue
+        valid_roots.append(root)
+        if USE_CORPUS_INDEX:
+            continue
         for dirpath, _, filenames in os.walk(root):
             for fname in filenames:
                 if not fname.lower().endswith(".json"):
                     continue
                 # 不再用文件名前缀筛选，全部交给 process_file 判定
                 process_file(os.path.join(dirpath, fname), issues, ge_records, ga_records)
+    if USE_CORPUS_INDEX:
+        process_files_with_index(valid_roots, issues, ge_records, ga_records)
 
     # 统一排序（按 ID 升序）
     ge_records.sort(key=lambda x: x[0])
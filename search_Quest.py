@@ -5,13 +5,17 @@ from tkinter import ttk, messagebox
 from tkinter.scrolledtext import ScrolledText
 from pathlib import Path
 
+import json_io
+import json_stream
+
 # === 配置：任务 JSON 路径（按需修改/保持不变） ===
 QUESTS_JSON_PATH = Path(r"D:\Unreal_tools\original_files\Wandering_Sword\Content\JH\Tables\Quests.json")
+# True: 每次查找流式逐条读取 QuestSetting（内存只占一条）；False: 整表 json.load 后递归
+USE_STREAMING = True
 
 def load_json(path: Path):
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_io.load(path)
     except FileNotFoundError:
         messagebox.showerror("错误", f"找不到文件：\n{path}")
     except json.JSONDecodeError as e:
@@ -66,6 +70,17 @@ def block_matches_id(block: dict, qid: str) -> bool:
 def find_blocks_by_id(data, qid: str):
     return [b for b in iter_quest_blocks(data) if block_matches_id(b, qid)]
 
+def find_blocks_by_id_stream(path: Path, qid: str):
+    try:
+        return [b for _, b in json_stream.iter_structs(path, ("QuestSetting",)) if block_matches_id(b, qid)]
+    except FileNotFoundError:
+        messagebox.showerror("错误", f"找不到文件：\n{path}")
+    except (json.JSONDecodeError, ValueError) as e:
+        messagebox.showerror("错误", f"JSON 解析失败：\n{e}")
+    except Exception as e:
+        messagebox.showerror("错误", f"读取失败：\n{e}")
+    return None
+
 def do_search():
     qid = entry_id.get().strip()
     output.delete("1.0", tk.END)
@@ -74,11 +89,15 @@ def do_search():
         messagebox.showwarning("提示", "请输入任务 ID。")
         return
 
-    data = load_json(QUESTS_JSON_PATH)
-    if data is None:
-        return
-
-    blocks = find_blocks_by_id(data, qid)
+    if USE_STREAMING:
+        blocks = find_blocks_by_id_stream(QUESTS_JSON_PATH, qid)
+        if blocks is None:
+            return
+    else:
+        data = load_json(QUESTS_JSON_PATH)
+        if data is None:
+            return
+        blocks = find_blocks_by_id(data, qid)
     if not blocks:
         output.insert(tk.END, f"未找到任务 ID = {qid} 的代码段。\n")
         return
@@ -8,12 +8,28 @@
    - 快速模式：直接读取已保存来源表并进入查询；
    - 标准流程：扫描→导出 functions/tags/detectors→交互查询→可选择保存来源表。
 5) 统一输出到 OUT_DIR，支持自定义目录。
+6) USE_CORPUS_INDEX=True 时从共享语料索引（corpus_index）查询，仅增量解析变更文件。
+7) EXECUTOR="process" 时用进程池（scan_pool）多核解析，结果只回传字符串集合。
+8) 每个文件只解析一次，函数/Tag/触发器在同一次遍历中收集（extract_names）；
+   --profile（或 PROFILE=True）时统计每个文件的解析耗时与遍历耗时，打印最慢的文件并写出 scan_profile.tsv。
+9) INCREMENTAL_UPDATE=True 时增量维护来源表：SCAN_STATE_PATH 记录每个文件的签名（大小、修改时间）与提取结果，
+   只重新解析新增/变更的文件，已删除的文件移除，随后直接写出 name_sources.json；
+   每个名称的来源用容量为 MAX_SOURCES_PER_NAME 的有界堆维护（不再每插入一次就整表排序）。
+10) 查询未精确命中时（FUZZY_LOOKUP=True），用 name_index 列出前缀 / 分段前缀 / 近似（错字、漏字）候选及其来源，
+    例如输入 JHGEExtAct_Add 会列出 JHGEExtAct_AddBuff 等。
+用法：
+    python search_funcNtagNtrigger.py             按下方配置运行
+    python search_funcNtagNtrigger.py --profile   强制走完整扫描流程，并输出解析/遍历耗时剖析
 """
 
-import os, json, re
+import heapq, os, json, re, sys, time
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+import json_io
+import name_index
+import scan_pool
+import uasset_model
 
 # =============== 仅用已保存来源表（新流程总开关）================
 # True：只读 SAVED_SOURCES_PATH -> 直接进入查询循环 -> 退出
@@ -34,12 +50,28 @@ SUPP_DIRS = [
 ]
 
 MAX_WORKERS = min(32, (os.cpu_count() or 4) * 2)
+# 执行模式："thread" 线程池（原行为）；"process" 进程池（解析受 GIL 限制，多核时明显更快）
+EXECUTOR = "thread"
+# 进程模式的进程数；None = CPU 核数
+MAX_PROCESSES = None
+
+# 开关：True 时使用共享语料索引（corpus_index.INDEX_PATH），只重新解析变更过的文件
+USE_CORPUS_INDEX = False
+
+# 增量模式：True 时只重新解析新增/变更的文件（签名与结果存于 SCAN_STATE_PATH），扫描后直接写出来源表
+# （USE_CORPUS_INDEX=True 时由语料索引负责增量，此开关不生效）
+INCREMENTAL_UPDATE = False
 
 # 开关：标签与触发器。True:搜索Export；False：搜索NameMap
 TAGS_FROM_EXPORTS = True
 # 从第几项 Export 开始提取 Tag/触发器（0 基索引）
 START_EXPORT_INDEX_FOR_TAGS_DETS = 1
 
+# 剖析：True（或命令行 --profile）时走完整扫描流程，统计每个文件的解析/遍历耗时
+PROFILE = False
+# 剖析报告打印最慢的前 N 个文件（全部明细写入 OUT_PROFILE）
+PROFILE_TOP_N = 15
+
 # =============== 输出目录控制（True 启用自定义目录）==============
 USE_CUSTOM_OUT_DIR = True
 CUSTOM_OUT_DIR = Path(r"D:\Python\pythonProject1\Files\yijian_mod_creat\outputfiles")
@@ -53,14 +85,25 @@ OUT_DIR.mkdir(parents=True, exist_ok=True)
 OUT_FUNCS     = OUT_DIR / "functions.txt"
 OUT_TAGS      = OUT_DIR / "tags.txt"
 OUT_DETECTORS = OUT_DIR / "detectors.txt"
+OUT_PROFILE   = OUT_DIR / "scan_profile.tsv"
 # 默认保存来源映射为 JSON（更易读/程序友好）；若想存 TSV，只需把后缀改成 .txt
 OUT_SOURCES   = OUT_DIR / "name_sources.json"
+# 增量模式的状态文件（文件签名 + 每个文件的函数/Tag/触发器），与来源表放在一起
+SCAN_STATE_PATH = OUT_DIR / "name_sources.state.json"
+SCAN_STATE_VERSION = 1
 # 同一名称最多保留多少条“来源文件路径”（按字典序最小优先）——可快速修改
 MAX_SOURCES_PER_NAME = 3
+# 查询未精确命中时给出前缀/近似候选（name_index），最多列出 FUZZY_TOP_N 个
+FUZZY_LOOKUP = True
+FUZZY_TOP_N = 8
 # ============================================================
 
 # 函数名前缀（认可的起始）
 FUNCTION_PREFIXES = ("JHGEExtAct", "JHExecutionPhase", "JHGEExtReq")
+TAG_PREFIX = "JH.Ability."
+DETECTOR_PREFIX = "EAbilitySystemEventType::"
+# Data 中每个属性参与 Tag/触发器提取的键（其下嵌套的字符串全部收集）
+DATA_STRING_KEYS = ("Name", "Value", "String", "Text")
 SUFFIX_NUM_RE = re.compile(r"_(\d+)$")
 
 # ---------- 查询净化辅助：去引号/空白、取末段、剥离尾部 _数字(可重复) ----------
@@ -112,11 +155,7 @@ def normalize_for_lookup(raw: str) -> str:
 
 # ======================= 通用 JSON 工具 ==========================
 def load_json(path: Path):
-    try:
-        with path.open("r", encoding="utf-8", errors="replace") as f:
-            return json.load(f)
-    except Exception:
-        return None
+    return json_io.load_loose(path)
 
 def _ci_eq(a: str, b: str) -> bool:
     return a.lower() == b.lower()
@@ -131,60 +170,15 @@ def _get_exports(data: dict) -> List[dict]:
     exps = data.get(key)
     return exps if isinstance(exps, list) else []
 
-def _gather_strings(node, out: List[str], max_per_node: int = None):
-    """
-    递归收集节点下的字符串。
-    - dict: 遍历 values
-    - list: 遍历元素
-    - str : 收集
-    - 其它：忽略
-    max_per_node=None 表示不限制；给整数则为软上限
-    """
-    if isinstance(node, str):
-        out.append(node)
-        return
-    if isinstance(node, dict):
-        for v in node.values():
-            if max_per_node is not None and len(out) >= max_per_node:
-                break
-            _gather_strings(v, out, max_per_node)
-    elif isinstance(node, list):
-        for v in node:
-            if max_per_node is not None and len(out) >= max_per_node:
-                break
-            _gather_strings(v, out, max_per_node)
-
 # ======================= 函数名提取（Exports[2:]） ==========================
 def last_segment(name: str) -> str:
     """'A.B' -> 'B'；再去掉尾部 '_123' 数字后缀（单次）。"""
     base = name.split(".")[-1]
     return SUFFIX_NUM_RE.sub("", base)
 
-def read_functions_from_exports(path: Path) -> Set[str]:
-    """从 JSON.Exports[2:] 的 ObjectName 中提取函数名集合。"""
-    data = load_json(path)
-    if not isinstance(data, dict):
-        return set()
-    exps = _get_exports(data)
-    if not exps:
-        return set()
-
-    funcs: Set[str] = set()
-    for exp in exps[2:]:  # 从第3项开始
-        if isinstance(exp, dict):
-            on = exp.get("ObjectName")
-            if isinstance(on, str) and on:
-                name = last_segment(on)
-                if any(name.startswith(p) for p in FUNCTION_PREFIXES):
-                    funcs.add(name)
-    return funcs
-
-# ======================= Tag/触发器提取 ==========================
-def read_namemap_strings(path: Path) -> List[str]:
-    """只读 NameMap/Namemap（大小写容错），提取其中的字符串。"""
-    data = load_json(path)
-    if not isinstance(data, dict):
-        return []
+# ======================= 单次遍历提取 ==========================
+def _namemap_strings(data: dict) -> List[str]:
+    """NameMap/Namemap（大小写容错）中的字符串。"""
     key = next((k for k in data.keys() if str(k).lower() == "namemap"), None)
     if key is None:
         return []
@@ -200,85 +194,286 @@ def read_namemap_strings(path: Path) -> List[str]:
                     out.append(val)
     return out
 
-def read_strings_from_exports_datablock(path: Path, start_index: int = None) -> List[str]:
+def extract_names(data, tags_from_exports: bool = None) -> Tuple[Set[str], Set[str], Set[str]]:
     """
-    从 Exports[start_index:] 的每个 Export 的 Data 中尽量抽取字符串（Name/Value/String/Text 及其嵌套）。
-    默认 start_index 取全局配置 START_EXPORT_INDEX_FOR_TAGS_DETS。
+    对已载入的文档做一次遍历，同时收集：
+      - 函数：Exports[2:] 的 ObjectName（末段、去尾部 _数字，匹配 FUNCTION_PREFIXES）；
+      - Tag / 触发器：tags_from_exports 时来自 Exports[START_EXPORT_INDEX_FOR_TAGS_DETS:] 的 Data
+        （每个属性的 Name/Value/String/Text 及其嵌套字符串），否则来自 NameMap。
     """
-    if start_index is None:
-        start_index = START_EXPORT_INDEX_FOR_TAGS_DETS
-
-    data = load_json(path)
+    if tags_from_exports is None:
+        tags_from_exports = TAGS_FROM_EXPORTS
+    funcs: Set[str] = set()
+    tags: Set[str] = set()
+    dets: Set[str] = set()
     if not isinstance(data, dict):
-        return []
-    exps = _get_exports(data)
-    if not exps:
-        return []
+        return funcs, tags, dets
 
-    out: List[str] = []
-    for exp in exps[start_index:]:
+    def take(s: str):
+        if s.startswith(TAG_PREFIX):
+            tags.add(s)
+        elif s.startswith(DETECTOR_PREFIX):
+            dets.add(s)
+
+    exps = _get_exports(data)
+    tag_from = len(exps[:START_EXPORT_INDEX_FOR_TAGS_DETS]) if tags_from_exports else len(exps)
+    for i, exp in enumerate(exps):
         if not isinstance(exp, dict):
             continue
+        if i >= 2:
+            on = exp.get("ObjectName")
+            if isinstance(on, str) and on:
+                name = last_segment(on)
+                if name.startswith(FUNCTION_PREFIXES):
+                    funcs.add(name)
+        if i < tag_from:
+            continue
         data_list = exp.get("Data")
         if not isinstance(data_list, list):
             continue
         for prop in data_list:
-            if isinstance(prop, dict):
-                for key in ("Name", "Value", "String", "Text"):
-                    val = prop.get(key)
-                    _gather_strings(val, out, max_per_node=None)
-            elif isinstance(prop, str):
-                out.append(prop)
-    return sorted(set(out))
+            if isinstance(prop, str):
+                take(prop)
+                continue
+            if not isinstance(prop, dict):
+                continue
+            stack = [prop.get(k) for k in DATA_STRING_KEYS]
+            while stack:
+                node = stack.pop()
+                if isinstance(node, str):
+                    take(node)
+                elif isinstance(node, dict):
+                    stack.extend(node.values())
+                elif isinstance(node, list):
+                    stack.extend(node)
+
+    if not tags_from_exports:
+        for s in _namemap_strings(data):
+            take(s)
+    return funcs, tags, dets
 
 # ======================= 单文件处理 ==========================
-def process_file(path: Path) -> Tuple[Set[str], Set[str], Set[str]]:
-    funcs = read_functions_from_exports(path)  # 仍从 Export[2:] 提函数名
-
-    if TAGS_FROM_EXPORTS:
-        pool = read_strings_from_exports_datablock(path)  # 现在从 Export[1:]（可配）
-    else:
-        pool = read_namemap_strings(path)
+def _load_for_scan(path: Path, tags_from_exports: bool):
+    """Tag 来自 Data 时整份解析；只用 NameMap 与 export 头部时延迟载入（不解析 Data）。"""
+    if tags_from_exports:
+        return load_json(path)
+    try:
+        return uasset_model.load_lazy_json(path)
+    except Exception:
+        return load_json(path)
 
-    tags = {s for s in pool if isinstance(s, str) and s.startswith("JH.Ability.")}
-    dets = {s for s in pool if isinstance(s, str) and s.startswith("EAbilitySystemEventType::")}
-    return funcs, tags, dets
+def process_file(path: Path, profile: bool = False, tags_from_exports: bool = None):
+    """
+    单文件：只解析一次，返回 (funcs, tags, dets)；
+    profile=True 时返回 (funcs, tags, dets, 解析秒, 遍历秒)。
+    进程模式下子进程看不到运行时改过的全局变量，剖析开关与 Tag 来源由参数传入。
+    """
+    if tags_from_exports is None:
+        tags_from_exports = TAGS_FROM_EXPORTS
+    t0 = time.perf_counter()
+    data = _load_for_scan(path, tags_from_exports)
+    t1 = time.perf_counter()
+    funcs, tags, dets = extract_names(data, tags_from_exports)
+    if not profile:
+        return funcs, tags, dets
+    return funcs, tags, dets, t1 - t0, time.perf_counter() - t1
 
 # ======================= 并行扫描与来源统计 ==========================
-def scan_dir(json_dir: Path):
+def iter_results_from_index(json_dir: Path):
+    """从语料索引按文件产出 (path, funcs, tags, dets)，提取规则与 process_file 一致。"""
+    import corpus_index as ci
+    conn = ci.open_index()
+    try:
+        paths = ci.refresh(conn, [json_dir])
+        rows_by_file = ci.query_values(conn, paths, (ci.K_EXPORT, ci.K_TAG, ci.K_DETECTOR))
+    finally:
+        conn.close()
+    for path in sorted(rows_by_file):
+        funcs: Set[str] = set()
+        tags: Set[str] = set()
+        dets: Set[str] = set()
+        for kind, value, export_no in rows_by_file[path]:
+            if kind == ci.K_EXPORT:
+                if export_no >= 3:  # Exports[2:]
+                    name = last_segment(value)
+                    if any(name.startswith(p) for p in FUNCTION_PREFIXES):
+                        funcs.add(name)
+                continue
+            if TAGS_FROM_EXPORTS:
+                if export_no < START_EXPORT_INDEX_FOR_TAGS_DETS + 1:
+                    continue
+            elif export_no != 0:  # 0 表示来自 NameMap
+                continue
+            (tags if kind == ci.K_TAG else dets).add(value)
+        yield Path(path), funcs, tags, dets
+
+def list_json_files(json_dir: Path) -> List[Path]:
+    return sorted({p.resolve() for p in json_dir.rglob("*.json")})
+
+def scan_files(files: List[Path], profile: Optional[List[Tuple[Path, float, float]]] = None):
+    """逐个文件解析，产出 (path, funcs, tags, dets)；profile 给定时追加 (path, 解析秒, 遍历秒)。读取失败的文件跳过。"""
+    workers = MAX_PROCESSES if EXECUTOR == "process" else MAX_WORKERS
+    args = (profile is not None, TAGS_FROM_EXPORTS)
+    for path, res, err in scan_pool.scan_map(process_file, files, mode=EXECUTOR, workers=workers, args=args):
+        if err is not None:
+            continue
+        if profile is not None:
+            fset, tset, dset, t_parse, t_walk = res
+            profile.append((path, t_parse, t_walk))
+        else:
+            fset, tset, dset = res
+        yield path, fset, tset, dset
+
+def iter_results_parallel(json_dir: Path, profile: Optional[List[Tuple[Path, float, float]]] = None):
+    """扫描一个目录下全部 .json，产出 (path, funcs, tags, dets)。"""
+    return scan_files(list_json_files(json_dir), profile)
+
+# -------------------- 来源表：有界堆 --------------------
+class _Desc:
+    """heapq 是小根堆；包一层反序比较，堆顶就是当前保留的字典序最大的来源，便于淘汰。"""
+    __slots__ = ("s",)
+
+    def __init__(self, s: str):
+        self.s = s
+
+    def __lt__(self, other: "_Desc") -> bool:
+        return other.s < self.s
+
+class SourceTable:
+    """名称 -> 字典序最小的 limit 个来源文件；每次插入 O(log limit)，结束时才排序输出。"""
+
+    def __init__(self, limit: int = None):
+        self.limit = limit or MAX_SOURCES_PER_NAME
+        self._heaps: Dict[str, List[_Desc]] = {}
+
+    def add(self, names: Set[str], src: str):
+        for n in names:
+            h = self._heaps.get(n)
+            if h is None:
+                self._heaps[n] = [_Desc(src)]
+            elif any(d.s == src for d in h):
+                continue
+            elif len(h) < self.limit:
+                heapq.heappush(h, _Desc(src))
+            elif src < h[0].s:
+                heapq.heapreplace(h, _Desc(src))
+
+    def to_map(self) -> Dict[str, List[Path]]:
+        return {n: [Path(s) for s in sorted(d.s for d in h)] for n, h in self._heaps.items()}
+
+def scan_dir(json_dir: Path, profile: Optional[List[Tuple[Path, float, float]]] = None):
     """并行扫描一个目录，返回 (funcs, tags, dets, src_map)。
-       src_map: 名称 -> 该目录内的**前 N 个**来源文件（按字典序最小，去重）。"""
-    files = sorted({p.resolve() for p in json_dir.rglob("*.json")})
+       src_map: 名称 -> 该目录内的**前 N 个**来源文件（按字典序最小，去重）。
+       profile: 剖析明细列表（见 scan_files）；使用语料索引时不剖析。"""
     funcs_all, tags_all, dets_all = set(), set(), set()
-    src_map: Dict[str, List[Path]] = {}
+    table = SourceTable()
+
+    results = iter_results_from_index(json_dir) if USE_CORPUS_INDEX else iter_results_parallel(json_dir, profile)
+    for src, fset, tset, dset in results:
+        funcs_all |= fset
+        tags_all  |= tset
+        dets_all  |= dset
+        key = str(src)
+        table.add(fset, key)
+        table.add(tset, key)
+        table.add(dset, key)
+    return funcs_all, tags_all, dets_all, table.to_map()
+
+# -------------------- 增量扫描 --------------------
+def _state_config() -> Dict[str, object]:
+    """影响提取结果的配置；与状态文件中记录的不同则整体重扫。"""
+    return {"tags_from_exports": TAGS_FROM_EXPORTS,
+            "start_export_index": START_EXPORT_INDEX_FOR_TAGS_DETS,
+            "function_prefixes": list(FUNCTION_PREFIXES)}
+
+def load_scan_state(path: Path) -> Dict[str, dict]:
+    """读取状态文件，返回 {文件路径: {"sig": [大小, 修改时间], "f": [...], "t": [...], "d": [...]}}。"""
+    obj = json_io.load_loose(path) if path.exists() else None
+    if not isinstance(obj, dict) or obj.get("version") != SCAN_STATE_VERSION:
+        return {}
+    if obj.get("config") != _state_config():
+        print("[增量] 提取配置已变化，全部重新扫描。")
+        return {}
+    files = obj.get("files")
+    return files if isinstance(files, dict) else {}
 
-    def record(names: Set[str], src: Path):
-        for n in names:
-            lst = src_map.get(n)
-            if lst is None:
-                lst = []
-                src_map[n] = lst
-            if src not in lst:
-                lst.append(src)
-            lst.sort(key=lambda p: str(p))
-            if len(lst) > MAX_SOURCES_PER_NAME:
-                del lst[MAX_SOURCES_PER_NAME:]
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
-        futs = {ex.submit(process_file, p): p for p in files}
-        for fut in as_completed(futs):
+def save_scan_state(path: Path, files: Dict[str, dict]):
+    json_io.dump({"version": SCAN_STATE_VERSION, "config": _state_config(), "files": files}, path)
+
+def scan_incremental(roots: List[Path], profile: Optional[List[Tuple[Path, float, float]]] = None):
+    """
+    增量扫描多个根目录：签名未变的文件复用状态文件中的结果，只解析新增/变更文件，状态中不再存在的文件移除。
+    返回 (per_root, files)：per_root 为 [(根目录, 该根下的文件路径列表)]（同一文件只归属第一个根），
+    files 为新的状态（解析失败的文件不记录，下次再试）。
+    """
+    t0 = time.perf_counter()
+    old = load_scan_state(SCAN_STATE_PATH)
+    files: Dict[str, dict] = {}
+    per_root: List[Tuple[Path, List[str]]] = []
+    stale: Dict[str, List[float]] = {}
+    seen: Set[str] = set()
+    for root in roots:
+        keys: List[str] = []
+        for p in list_json_files(root):
+            key = str(p)
+            if key in seen:
+                continue
+            seen.add(key)
             try:
-                fset, tset, dset = fut.result()
-                src = futs[fut]
-                funcs_all |= fset
-                tags_all  |= tset
-                dets_all  |= dset
-                record(fset, src)
-                record(tset, src)
-                record(dset, src)
-            except Exception:
-                pass
-    return funcs_all, tags_all, dets_all, src_map
+                st = p.stat()
+            except OSError:
+                continue
+            keys.append(key)
+            sig = [st.st_size, st.st_mtime]
+            rec = old.get(key)
+            if isinstance(rec, dict) and rec.get("sig") == sig:
+                files[key] = rec
+            else:
+                stale[key] = sig
+        per_root.append((root, keys))
+
+    for path, fset, tset, dset in scan_files([Path(k) for k in stale], profile):
+        key = str(path)
+        files[key] = {"sig": stale[key], "f": sorted(fset), "t": sorted(tset), "d": sorted(dset)}
+
+    gone = sum(1 for k in old if k not in seen)
+    save_scan_state(SCAN_STATE_PATH, files)
+    print(f"[增量] {len(seen)} 个文件；重新解析 {len(stale)}，复用 {len(seen) - len(stale)}，"
+          f"移除 {gone}，用时 {time.perf_counter() - t0:.2f}s")
+    return per_root, files
+
+# -------------------- 剖析报告 --------------------
+def report_profile(rows: List[Tuple[Path, float, float]], wall: float, out_path: Path = None):
+    """打印解析/遍历耗时汇总与最慢的 PROFILE_TOP_N 个文件；明细写入 out_path（TSV，毫秒）。"""
+    if not rows:
+        print("\n[剖析] 没有剖析数据（USE_CORPUS_INDEX=True 时不逐文件解析）。")
+        return
+    t_parse = sum(r[1] for r in rows)
+    t_walk = sum(r[2] for r in rows)
+    total = (t_parse + t_walk) or 1e-9
+    n = len(rows)
+    print(f"\n[剖析] {n} 个文件，扫描墙钟 {wall:.2f}s（{EXECUTOR}）；各文件累计："
+          f"解析 {t_parse:.2f}s（{t_parse / total:.0%}），遍历 {t_walk:.2f}s（{t_walk / total:.0%}）")
+    print(f"  平均每文件：解析 {t_parse / n * 1000:.2f} ms，遍历 {t_walk / n * 1000:.2f} ms")
+    if EXECUTOR == "thread":
+        print("  注：线程模式下单文件耗时包含等待 GIL 的时间，看比例即可；绝对值以 EXECUTOR=\"process\" 为准。")
+    rows = sorted(rows, key=lambda r: r[1] + r[2], reverse=True)
+    print(f"  最慢的 {min(PROFILE_TOP_N, n)} 个文件：")
+    print(f"  {'解析ms':>9}{'遍历ms':>9}{'KB':>9}  文件")
+    sizes: Dict[Path, int] = {}
+    for path, _, _ in rows:
+        try:
+            sizes[path] = path.stat().st_size
+        except OSError:
+            sizes[path] = 0
+    for path, tp, tw in rows[:PROFILE_TOP_N]:
+        print(f"  {tp * 1000:>9.2f}{tw * 1000:>9.2f}{sizes[path] / 1024:>9.0f}  {path}")
+    if out_path is not None:
+        with out_path.open("w", encoding="utf-8") as f:
+            f.write("path\tparse_ms\twalk_ms\tsize_kb\n")
+            for path, tp, tw in rows:
+                f.write(f"{path}\t{tp * 1000:.3f}\t{tw * 1000:.3f}\t{sizes[path] / 1024:.1f}\n")
+        print(f"  明细：{out_path}")
 
 # -------------------- 来源表：读取/保存（JSON/TSV 兼容） --------------------
 def load_sources_json(path: Path) -> Dict[str, List[Path]]:
@@ -349,6 +544,16 @@ def save_sources_file(path: Path, src_map: Dict[str, List[Path]]):
         save_sources_tsv(path, src_map)
 
 # -------------------------- 查询交互 --------------------------
+_MATCH_LABELS = {name_index.M_EXACT: "大小写不同", name_index.M_PREFIX: "前缀",
+                 name_index.M_SEGMENT: "分段前缀", name_index.M_FUZZY: "近似"}
+
+def _name_kind(name: str) -> str:
+    if name.startswith(TAG_PREFIX):
+        return "Tag"
+    if name.startswith(DETECTOR_PREFIX):
+        return "触发器"
+    return "函数"
+
 def query_loop(src_map: Dict[str, List[Path]], *, auto_start: bool):
     """
     交互式查询名称来源（可显示多条）。
@@ -364,6 +569,8 @@ def query_loop(src_map: Dict[str, List[Path]], *, auto_start: bool):
             print("跳过查询。")
             return
 
+    index = name_index.NameIndex(src_map.keys()) if FUZZY_LOOKUP else None
+
     # 直接开始查询循环
     while True:
         try:
@@ -381,13 +588,78 @@ def query_loop(src_map: Dict[str, List[Path]], *, auto_start: bool):
             print("来源（最多前 %d 个）：" % MAX_SOURCES_PER_NAME)
             for i, p in enumerate(lst, 1):
                 print(f"  {i}. {p}")
-        else:
+            continue
+        cands = index.search(key, FUZZY_TOP_N) if index is not None else []
+        if not cands:
             print(f"未找到该名称：{key}（请检查是否在 functions/tags/detectors 中）。")
+            continue
+        print(f"未精确找到：{key}，候选（按相关度）：")
+        for name, how, dist in cands:
+            print(f"  [{_name_kind(name)}/{_MATCH_LABELS[how]}{f' 差{dist}处' if dist else ''}] {name}")
+            for p in src_map.get(name, []):
+                print(f"      {p}")
 
 # =========================== 主流程 ============================
+def _supp_roots() -> List[Path]:
+    if not SUPP_ENABLED or not SUPP_DIRS:
+        return []
+    return [Path(sup) for sup in SUPP_DIRS if sup and Path(sup).exists()]
+
+def scan_all(profile: Optional[List[Tuple[Path, float, float]]] = None):
+    """全量扫描主目录与补充目录，返回 (主目录 funcs/tags/dets, 合并后 funcs/tags/dets, src_map)。"""
+    f_main, t_main, d_main, src_main = scan_dir(ROOT_DIR, profile)
+
+    f_all, t_all, d_all = set(f_main), set(t_main), set(d_main)
+    src_map: Dict[str, List[Path]] = dict(src_main)  # 主目录优先
+
+    for sup in _supp_roots():
+        f_sup, t_sup, d_sup, src_sup = scan_dir(sup, profile)
+        f_all |= f_sup
+        t_all |= t_sup
+        d_all |= d_sup
+        for name, sup_list in src_sup.items():
+            base_list = src_map.get(name, [])
+            merged = {str(p) for p in base_list}
+            merged.update(str(p) for p in sup_list)
+            merged = sorted(merged, key=lambda s: s)[:MAX_SOURCES_PER_NAME]
+            src_map[name] = [Path(p) for p in merged]
+    return f_main, t_main, d_main, f_all, t_all, d_all, src_map
+
+def scan_all_incremental(profile: Optional[List[Tuple[Path, float, float]]] = None):
+    """与 scan_all 返回相同，但只解析新增/变更文件（见 scan_incremental）。"""
+    per_root, files = scan_incremental([ROOT_DIR] + _supp_roots(), profile)
+    f_main, t_main, d_main = set(), set(), set()
+    f_all, t_all, d_all = set(), set(), set()
+    table = SourceTable()
+    for i, (_, keys) in enumerate(per_root):
+        for key in keys:
+            rec = files.get(key)
+            if rec is None:
+                continue
+            fset, tset, dset = set(rec["f"]), set(rec["t"]), set(rec["d"])
+            if i == 0:
+                f_main |= fset
+                t_main |= tset
+                d_main |= dset
+            f_all |= fset
+            t_all |= tset
+            d_all |= dset
+            table.add(fset, key)
+            table.add(tset, key)
+            table.add(dset, key)
+    return f_main, t_main, d_main, f_all, t_all, d_all, table.to_map()
+
+def parse_args(argv: List[str]) -> None:
+    global PROFILE
+    if "--profile" in argv:
+        PROFILE = True
+
 def main():
-    # ====== 快速模式：仅用已保存的来源表 ======
-    if USE_SAVED_SOURCES:
+    parse_args(sys.argv[1:])
+    profile: Optional[List[Tuple[Path, float, float]]] = [] if PROFILE else None
+
+    # ====== 快速模式：仅用已保存的来源表（剖析时跳过，走完整扫描） ======
+    if USE_SAVED_SOURCES and not PROFILE:
         src_map = load_sources_file(SAVED_SOURCES_PATH)
         if not src_map:
             print("来源表为空或未找到，程序结束。")
@@ -401,25 +673,13 @@ def main():
     # ====== 正常完整流程 ======
     if not ROOT_DIR.exists():
         raise FileNotFoundError(f"找不到主目录：{ROOT_DIR}")
-    f_main, t_main, d_main, src_main = scan_dir(ROOT_DIR)
-
-    f_all, t_all, d_all = set(f_main), set(t_main), set(d_main)
-    src_map: Dict[str, List[Path]] = dict(src_main)  # 主目录优先
-
-    if SUPP_ENABLED and SUPP_DIRS:
-        for sup in SUPP_DIRS:
-            if not sup or not Path(sup).exists():
-                continue
-            f_sup, t_sup, d_sup, src_sup = scan_dir(Path(sup))
-            f_all |= f_sup
-            t_all |= t_sup
-            d_all |= d_sup
-            for name, sup_list in src_sup.items():
-                base_list = src_map.get(name, [])
-                merged = {str(p) for p in base_list}
-                merged.update(str(p) for p in sup_list)
-                merged = sorted(merged, key=lambda s: s)[:MAX_SOURCES_PER_NAME]
-                src_map[name] = [Path(p) for p in merged]
+    incremental = INCREMENTAL_UPDATE and not USE_CORPUS_INDEX
+    t_scan = time.perf_counter()
+    if incremental:
+        f_main, t_main, d_main, f_all, t_all, d_all, src_map = scan_all_incremental(profile)
+    else:
+        f_main, t_main, d_main, f_all, t_all, d_all, src_map = scan_all(profile)
+    t_scan = time.perf_counter() - t_scan
 
     OUT_FUNCS.write_text("\n".join(sorted(f_all)), encoding="utf-8")
     OUT_TAGS.write_text("\n".join(sorted(t_all)), encoding="utf-8")
@@ -431,10 +691,20 @@ def main():
     print(f"输出目录：{OUT_DIR}")
     print(f"输出文件：\n  {OUT_FUNCS}\n  {OUT_TAGS}\n  {OUT_DETECTORS}")
     print(f"标签/触发器来源：{'Exports[2:]' if TAGS_FROM_EXPORTS else 'NameMap'}")
+    if profile is not None:
+        report_profile(profile, t_scan, OUT_PROFILE)
+
+    if incremental:
+        # 增量模式：来源表与状态文件一起更新（扫描后立即写，查询中 Ctrl+C 也不会留下旧的来源表），不再询问
+        save_sources_file(OUT_SOURCES, src_map)
+        print(f"已保存：{OUT_SOURCES}（每个名称最多 {MAX_SOURCES_PER_NAME} 条来源；状态：{SCAN_STATE_PATH}）")
 
     # 完整流程下，按旧逻辑：先询问是否进入查询
     query_loop(src_map, auto_start=False)
 
+    if incremental:
+        return
+
     # 询问是否保存名称来源
     try:
         save_ans = input("\n保存本次名称来源文件？输入 yes 保存；回车或 no 放弃（不区分大小写）：").strip().lower()
@@ -2,18 +2,22 @@
 """
 功能：
 将Skills文件按照ID+名称+描述格式输出为Excel表。
+USE_STREAMING=True 时用 json_stream 流式逐条读取 SkillSetting，不再整表 json.load。
 """
 
-import json
 import os
 import re
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
+import json_io
+import json_stream
+
 # ===== 路径配置 =====
 INPUT_SKILLS_PATH = r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_1\Wandering_Sword\Content\JH\Tables\Skills.json"
 OUTPUT_XLSX = "skills描述.xlsx"
+USE_STREAMING = True  # True: 流式逐条读取（内存只占一行）；False: json.load 整表后递归遍历
 
 # ===== 工具函数 =====
 def iter_nodes(obj: Any) -> Generator[Dict[str, Any], None, None]:
@@ -90,46 +94,37 @@ def extract_skill_fields(skill_node: Dict[str, Any]) -> Tuple[str, str, str]:
 
     return skill_id, name_text, desc_text
 
-def collect_skills_from_exports(data: Any) -> List[Tuple[str, str, str]]:
-    """
-    仅遍历 Exports（若缺失，则回退到全局递归，增强鲁棒性），收集所有 SkillSetting。
-    """
+def skill_rows_from_nodes(nodes: Iterable[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+    """从节点序列中收集所有 SkillSetting（仅导出有 ID 的项）。"""
     rows: List[Tuple[str, str, str]] = []
-
-    def process_node(node: Dict[str, Any]) -> None:
+    for node in nodes:
         if is_skill_setting(node):
             skill_id, name_text, desc_text = extract_skill_fields(node)
-            if skill_id:  # 仅导出有 ID 的项
+            if skill_id:
                 rows.append((skill_id, name_text, desc_text))
+    return rows
 
+def collect_skills_from_exports(data: Any) -> List[Tuple[str, str, str]]:
+    """
+    仅遍历 Exports（若缺失，则回退到全局递归，增强鲁棒性），收集所有 SkillSetting。
+    """
     exports = data.get("Exports") if isinstance(data, dict) else None
-    if isinstance(exports, list):
-        # 先处理顶层 Exports 的每个节点
-        for node in exports:
-            if isinstance(node, dict):
-                process_node(node)
-            # Exports 节点内有时还会嵌套结构，递归其子项
-            for sub in iter_nodes(node):
-                if sub is node:
-                    continue
-                process_node(sub)
-    else:
-        # 回退：全局递归
-        for node in iter_nodes(data):
-            if isinstance(node, dict):
-                process_node(node)
+    return skill_rows_from_nodes(iter_nodes(exports if isinstance(exports, list) else data))
 
-    return rows
+def collect_skills_stream(path: str) -> List[Tuple[str, str, str]]:
+    """流式读取：逐条解析 SkillSetting，内存峰值约为一行。"""
+    return skill_rows_from_nodes(json_stream.iter_struct_values(path, "SkillSetting"))
 
 # ===== 主流程 =====
 def main():
     if not os.path.isfile(INPUT_SKILLS_PATH):
         raise FileNotFoundError(f"找不到输入文件：{INPUT_SKILLS_PATH}")
 
-    with open(INPUT_SKILLS_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    rows = collect_skills_from_exports(data)
+    if USE_STREAMING:
+        rows = collect_skills_stream(INPUT_SKILLS_PATH)
+    else:
+        data = json_io.load(INPUT_SKILLS_PATH)
+        rows = collect_skills_from_exports(data)
 
     out_path = os.path.join(os.getcwd(), OUTPUT_XLSX)
     df = pd.DataFrame(rows, columns=["SkillID", "Name", "Description"])
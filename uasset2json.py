@@ -2,16 +2,26 @@
 """
 功能：
 将主文件夹、副文件夹及其子文件夹的所有uasset文件另存为Json。
+USE_CONVERTER_HOST=True 时通过 converter_host 保持 MAX_WORKERS 个常驻转换进程，逐个下发文件，
+不再每个文件（含回退）各启动一次 .NET 进程；跳过策略、usmap 回退与错误日志不变。
+SKIP_POLICY="hash" 时按内容哈希清单（hash_manifest）判定：.uasset+.uexp+usmap 与 json 都未变才跳过。
+调度：convert_scheduler 按文件大小从大到小下发、限制在途任务数，并可按吞吐自动调整并发，结束时打印吞吐汇总。
+usmap 池：启动时只预建（并发上限）份 usmap（优先硬链接），任务借用/归还，不再每个文件建一份再删；
+USMAP_SHARED=True 时所有任务直接共用原 usmap（转换器只读打开时可用）。结束时打印节省的 usmap I/O。
 """
 
 import os
+import queue
 import shutil
 import subprocess
 import tempfile
+import threading
 from pathlib import Path
 from datetime import datetime
 from uuid import uuid4
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import convert_scheduler
+import converter_host
+import hash_manifest
 
 # ===== 必填路径 =====
 EXE   = Path(r"D:\Program Files (x86)\Microsoft Visual Studio\works\UAssetDumpJson\UAssetDumpJson\UAssetDumpJson\bin\Release\net8.0\UAssetDumpJson.exe")
@@ -21,7 +31,9 @@ USMAP = Path(r"D:\Unreal_tools\Mappings.usmap")
 # MODE = "all"    # 遍历文件夹及其子文件夹（含可选副文件夹）
 # MODE = "single" # 只处理单一文件
 MODE = "all"
-SKIP_POLICY = "none"   # "exists"：跳过已有json | "mtime"：uasset文件新于json时重跑 | "none"：全部重跑
+SKIP_POLICY = "none"   # "exists"：跳过已有json | "mtime"：uasset文件新于json时重跑 | "hash"：内容变化才重跑 | "none"：全部重跑
+# SKIP_POLICY="hash" 的哈希清单（放在各工作副本上级目录，_1/_2/_XTZH 共用）
+MANIFEST_PATH = Path(r"D:\Unreal_tools\yijian\convert_manifest.json")
 
 # 主目录（MODE=all 时生效）
 ROOT_DIR = Path(r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_2\Wandering_Sword\Content\JH\Tables")
@@ -36,15 +48,22 @@ SUB_DIRS = [
 ]
 
 # 并行与跳过策略
-MAX_WORKERS = 8
+MAX_WORKERS = 8                # 起始并发
+AUTO_TUNE_WORKERS = True       # 按吞吐自动调整并发（1 ~ MAX_WORKERS_LIMIT）；False 时固定 MAX_WORKERS
+MAX_WORKERS_LIMIT = 16
 ONLY_WITH_UEXP = True #True只处理携带.uexp的.uasset文件；为False时单.uasset文件也处理
 
+# 常驻转换进程（需转换器支持 --serve 的 JSON Lines 协议，见 converter_host；测试可把 EXE 指向 converter_stub.py）
+USE_CONVERTER_HOST = False
+
 WRITE_ERROR_LOG = True
 ERROR_LOG_PATH = Path.cwd() / f"uasset2json_errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
-# 临时 usmap 目录（并发时为每个任务准备独立文件，避免锁usmap）
+# 临时 usmap 目录（并发时为每个工作线程准备独立文件，避免锁usmap）
 TEMP_DIR = Path(tempfile.gettempdir()) / "uasset_usmap_cache"
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
+# True：所有任务共用原 usmap，不建副本（仅当转换器以只读共享方式打开 usmap 时使用）
+USMAP_SHARED = False
 
 
 def run_utf8(cmd):
@@ -57,14 +76,94 @@ def run_utf8(cmd):
         return p
 
 
-def make_task_usmap(base_usmap: Path) -> Path:
-    """为当前任务准备独立的 usmap：优先硬链接，失败则复制。"""
+HOST: converter_host.ConverterHost | None = None  # 常驻模式下由 main 设置
+
+
+MANIFEST: hash_manifest.HashManifest | None = None  # SKIP_POLICY="hash" 时由 main 设置
+
+
+def source_digest(uasset: Path) -> str | None:
+    return MANIFEST.digest([uasset, uasset.with_suffix(".uexp"), USMAP])
+
+
+def run_converter(args: list[str]):
+    """执行一次转换命令：常驻模式走进程池，否则单独启动一个进程。"""
+    if HOST is not None:
+        return HOST.run(args)
+    return run_utf8(converter_host.base_command(EXE) + args)
+
+
+def make_task_usmap(base_usmap: Path) -> tuple[Path, bool]:
+    """准备一份独立的 usmap：优先硬链接，失败则复制；返回 (路径, 是否为复制)。"""
     dst = TEMP_DIR / f"Mappings_{uuid4().hex}.usmap"
     try:
         os.link(base_usmap, dst)
+        return dst, False
     except OSError:
         shutil.copy2(base_usmap, dst)
-    return dst
+        return dst, True
+
+
+class UsmapPool:
+    """
+    启动时预建 size 份 usmap，任务 acquire() 借用、release() 归还；同一时刻每份只被一个任务使用。
+    shared=True 时不建副本，acquire() 直接返回原 usmap。
+    """
+
+    def __init__(self, base: Path, size: int, shared: bool = False):
+        self.base = base
+        self.shared = shared
+        self.usmap_size = base.stat().st_size
+        self.copies: list[Path] = []
+        self.size = 0
+        self.copied_bytes = 0
+        self.uses = 0
+        self._free: "queue.Queue[Path]" = queue.Queue()
+        self._lock = threading.Lock()
+        if shared:
+            return
+        for _ in range(max(1, size)):
+            p, copied = make_task_usmap(base)
+            self.copies.append(p)
+            if copied:
+                self.copied_bytes += self.usmap_size
+            self._free.put(p)
+        self.size = len(self.copies)
+
+    def acquire(self) -> Path:
+        with self._lock:
+            self.uses += 1
+        if self.shared:
+            return self.base
+        return self._free.get()
+
+    def release(self, p: Path) -> None:
+        if not self.shared:
+            self._free.put(p)
+
+    def close(self) -> None:
+        for p in self.copies:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+        self.copies.clear()
+
+    def report(self) -> str:
+        """与“每个任务建一份再删”相比节省的 usmap I/O。"""
+        mb = 1048576
+        if self.shared:
+            return f"usmap：共用原文件 {self.uses} 次，未建副本（旧方式需建/删 {self.uses} 份）。"
+        n = self.size
+        if self.copied_bytes:
+            saved = max(0, self.uses - n) * self.usmap_size
+            return (f"usmap：池 {n} 份（复制 {self.copied_bytes / mb:.1f} MB），任务使用 {self.uses} 次；"
+                    f"比逐任务复制少写 {saved / mb:.1f} MB（{saved} 字节）。")
+        return (f"usmap：池 {n} 份（硬链接），任务使用 {self.uses} 次；"
+                f"少做 {max(0, self.uses - n)} 次硬链接创建+删除（无复制字节）。")
+
+
+USMAP_POOL: UsmapPool | None = None  # 由 main 设置
 
 
 def need_process(uasset: Path) -> (bool, str):
@@ -82,18 +181,23 @@ def need_process(uasset: Path) -> (bool, str):
         if ue.exists():
             src_m = max(src_m, ue.stat().st_mtime)
         return (src_m > json_path.stat().st_mtime, "SKIP up-to-date: " + str(json_path))
+    if SKIP_POLICY == "hash" and MANIFEST is not None:
+        fresh = MANIFEST.is_fresh(hash_manifest.content_key(uasset), source_digest(uasset), [json_path])
+        return (not fresh, "SKIP unchanged: " + str(json_path))
     return True, ""
 
 
 def try_convert(uasset: Path, use_usmap: bool, local_usmap: Path | None) -> tuple[bool, str, str]:
     """执行一次转换；返回 (ok, brief, detail)。"""
-    cmd = [str(EXE), str(uasset)]
+    args = [str(uasset)]
     if use_usmap and local_usmap is not None:
-        cmd += ["--usmap", str(local_usmap)]
-    proc = run_utf8(cmd)
+        args += ["--usmap", str(local_usmap)]
+    proc = run_converter(args)
     json_path = uasset.with_suffix(".json")
     ok = (proc.returncode == 0) and json_path.exists()
     if ok:
+        if MANIFEST is not None:
+            MANIFEST.record(hash_manifest.content_key(uasset), source_digest(uasset), [json_path])
         return True, f"OK ({'usmap' if use_usmap else 'no-usmap'}): {uasset}", ""
     else:
         detail = [f"ERR ({'usmap' if use_usmap else 'no-usmap'}): {uasset} (code={proc.returncode})"]
@@ -114,12 +218,7 @@ def convert_one(uasset: Path):
     if not uasset.exists():
         return False, f"ERR: not found {uasset}", f"ERR: {uasset} (not found)"
 
-    local_usmap = None
-    if USMAP.exists():
-        try:
-            local_usmap = make_task_usmap(USMAP)
-        except Exception:
-            local_usmap = None
+    local_usmap = USMAP_POOL.acquire() if USMAP_POOL is not None else None
 
     try:
         if local_usmap is not None:
@@ -140,11 +239,8 @@ def convert_one(uasset: Path):
             merged.append(detail2)
             return False, brief2, "\n\n---- FALLBACK MERGE ----\n\n".join(merged)
     finally:
-        try:
-            if local_usmap and local_usmap.exists():
-                local_usmap.unlink()
-        except Exception:
-            pass
+        if local_usmap is not None:
+            USMAP_POOL.release(local_usmap)
 
 
 def resolve_single_uasset(given: Path) -> tuple[Path | None, str]:
@@ -192,6 +288,7 @@ def collect_files() -> list[Path]:
 
 
 def main():
+    global HOST, MANIFEST, USMAP_POOL
     # 基本检查
     missing = []
     if not EXE.exists():
@@ -209,15 +306,31 @@ def main():
         return
 
     workers = (total if MAX_WORKERS in (None, 0) else MAX_WORKERS)
+    sched = convert_scheduler.ConvertScheduler(
+        start_workers=min(workers, total),
+        max_workers=min(max(workers, MAX_WORKERS_LIMIT) if AUTO_TUNE_WORKERS else workers, total),
+        autotune=AUTO_TUNE_WORKERS,
+    )
 
     successes = failures = 0
     skipped_info = []
     error_details = []
     error_files = []  # 新增：收集失败的uasset路径
-    with ThreadPoolExecutor(max_workers=workers) as ex:
-        futures = {ex.submit(convert_one, f): f for f in files}
-        for fut in as_completed(futures):
-            ok, brief, detail = fut.result()
+    if USE_CONVERTER_HOST:
+        HOST = converter_host.ConverterHost(EXE, sched.max_workers)
+    if SKIP_POLICY == "hash":
+        MANIFEST = hash_manifest.HashManifest("uasset2json", MANIFEST_PATH)
+    if USMAP.exists():
+        try:
+            USMAP_POOL = UsmapPool(USMAP, sched.max_workers, shared=USMAP_SHARED)
+        except Exception as e:
+            print(f"usmap 池创建失败，将不带 usmap 转换：{e}")
+            USMAP_POOL = None
+    try:
+        results = sched.run(files, convert_one,
+                            size_of=lambda f: convert_scheduler.files_size([f, f.with_suffix(".uexp")]),
+                            is_work=lambda r: not r[1].startswith("SKIP"))
+        for f, (ok, brief, detail) in results:
             if brief.startswith("SKIP"):
                 skipped_info.append(brief); continue
             if ok:
@@ -225,9 +338,27 @@ def main():
             else:
                 failures += 1
                 error_details.append(detail)
-                error_files.append(futures[fut])  # 新增：记下出错的文件
+                error_files.append(f)  # 新增：记下出错的文件
+    finally:
+        if HOST is not None:
+            HOST.close()
+            HOST = None
+        if USMAP_POOL is not None:
+            USMAP_POOL.close()
+            print(USMAP_POOL.report())
+            USMAP_POOL = None
+        if MANIFEST is not None:
+            try:
+                MANIFEST.save()
+                print(f"哈希清单：本次读盘哈希 {MANIFEST.hashed_bytes / 1048576:.1f} MB -> {MANIFEST_PATH}")
+            except Exception as e:
+                # 不打断收尾（汇总、跳过清单、错误日志照常输出），但要说明：下次会把这些文件全部重新转换
+                print(f"[警告] 哈希清单保存失败（{type(e).__name__}: {e}）：{MANIFEST_PATH}；下次运行将重新转换。")
+            MANIFEST = None
     skipped = len(skipped_info)
     print(f"完成：成功 {successes} / 失败 {failures} / 跳过 {skipped} / 共 {total}")
+    if successes or failures:
+        print(sched.summary())
     if skipped:
         print("跳过（最多10条）：")
         for s in skipped_info[:10]:
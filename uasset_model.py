@@ -0,0 +1,642 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) UAssetAPI JSON 的轻量类型模型（__slots__ 类）：Document / NameMap / Import / Export，
+   以及 PropertyData / ObjectPropertyData / StructPropertyData / ArrayPropertyData。
+   顶层键名的大小写/别名（Exports/exports/Export、NameMap/Namemap）与 $type 后缀只在载入时判定一次，
+   之后直接用属性：exp.outer_index、exp.sbs、prop.struct_type、prop.kind == "ArrayPropertyData"。
+2) 无损往返：每个对象记住原始键顺序（相同键序列共用一个元组），未建模的键原样保存在 extra 中；
+   to_json() 的结果经 json_io.dumps 与原文件逐字节一致。
+3) Export.Data 延迟物化：载入时只保留原始列表，第一次访问 exp.data 才转换成属性对象；
+   没碰过的 Data 写出时直接用原始列表，只改头部字段（SBS/CBC/OuterIndex 等）的流程几乎没有额外开销。
+4) 常见字符串（$type、Name、StructType、ArrayType 等）会 intern，多份文件同时载入时共用同一个对象。
+5) 延迟载入（load_lazy_json / Document.load_lazy）：按 UAssetAPI 的 2 空格缩进版式定位各顶层段与每个 export 的
+   Data 字节范围，NameMap / Imports / export 头部立即解析，Data 只记下字节范围，用到时才解析；
+   只看头部（ObjectName、ClassIndex、依赖列表）或 NameMap 的扫描不再解析 Data 的字节。
+   load_lazy_json 返回普通 dict（脚本原有的 dict 写法不用改），Document.load_lazy 返回模型；
+   版式不符（压缩成一行、其它缩进）时自动退回整份解析，结果相同。
+   实测 orjson 整份解析比建索引更快，LAZY_INDEX="auto" 时只在标准库 json 后端下建索引（约快 1.1~1.8 倍，Data 越大越明显）。
+用法：
+    doc = uasset_model.Document.load(path)   # 或 Document.load_lazy(path)
+    obj = uasset_model.load_lazy_json(path)   # dict；exp["ObjectName"] 直接用，Data 用 export_data(exp)
+    for exp in doc.exports[2:]:
+        for arr in exp.iter_arrays("ObjectProperty", REF_ARRAY_NAMES): ...
+    doc.dump(path)
+命令行：python uasset_model.py a.json [b.json ...]   校验往返一致（含 load_lazy），对比内存占用与只读头部的耗时
+"""
+
+import json
+import re
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import json_io
+
+# ============== 配置 ==============
+# 延迟载入是否按字节索引跳过 Data：
+#   "auto"   只在没有 orjson/msgspec 时跳过（orjson 整份解析已接近 bytes.find 的速度，建索引反而更慢）；
+#   "always" 总是跳过；"never" 总是整份解析（export_data / Document.load_lazy 的用法不变）。
+LAZY_INDEX = "auto"
+# =================================
+
+_MISSING = object()
+_LAYOUTS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_intern = sys.intern
+
+
+def _layout(keys: Iterable[str]) -> Tuple[str, ...]:
+    t = tuple(keys)
+    return _LAYOUTS.setdefault(t, t)
+
+
+@lru_cache(maxsize=512)
+def short_type(type_name: Any) -> str:
+    """'UAssetAPI.PropertyTypes.Structs.StructPropertyData, UAssetAPI' → 'StructPropertyData'。"""
+    if not isinstance(type_name, str):
+        return ""
+    return type_name.split(",", 1)[0].rsplit(".", 1)[-1]
+
+
+@lru_cache(maxsize=None)
+def _absent_fields(cls: type, layout: Tuple[str, ...]) -> Tuple[str, ...]:
+    """该键序列里没有出现的建模字段（按类与键序列缓存）。"""
+    return tuple(k for k in cls.FIELDS if k not in layout)
+
+
+def _istr(v: Any) -> Any:
+    return _intern(v) if type(v) is str else v
+
+
+def _loads_slice(b: bytes) -> Any:
+    """解析文件中的一段；非 UTF-8（GB18030 存档）时与 json_io.load 一样换编码再试。"""
+    try:
+        return json_io.loads(b)
+    except (ValueError, UnicodeDecodeError):
+        return json.loads(b.decode("gb18030"))
+
+
+class _RawData:
+    """尚未解析的 Data：原文件缓冲区中的字节范围（多个 export 共用同一个缓冲区）。"""
+    __slots__ = ("buf", "start", "end")
+
+    def __init__(self, buf: bytes, start: int, end: int):
+        self.buf = buf
+        self.start = start
+        self.end = end
+
+    def decode(self) -> Any:
+        return _loads_slice(self.buf[self.start:self.end])
+
+
+# ---------- 基类 ----------
+class _Node:
+    """
+    FIELDS：JSON 键 → 属性名；未列出的键进入 extra。
+    INTERN：值需要 intern 的属性名。
+    """
+    __slots__ = ("_layout", "extra")
+    FIELDS: Dict[str, str] = {}
+    INTERN: frozenset = frozenset()
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "_Node":
+        self = cls.__new__(cls)
+        fields = cls.FIELDS
+        layout = _layout(d)
+        for k in _absent_fields(cls, layout):
+            object.__setattr__(self, fields[k], _MISSING)
+        decode = self._decode if cls._decode is not _Node._decode else None
+        intern = cls.INTERN
+        extra = None
+        for k, v in d.items():
+            attr = fields.get(k)
+            if attr is None:
+                if extra is None:
+                    extra = {}
+                extra[k] = v
+            elif decode is not None:
+                object.__setattr__(self, attr, decode(attr, v))
+            else:
+                object.__setattr__(self, attr, _intern(v) if attr in intern and type(v) is str else v)
+        self._layout = layout
+        self.extra = extra
+        return self
+
+    def _decode(self, attr: str, v: Any) -> Any:
+        return _istr(v) if attr in self.INTERN else v
+
+    def _encode(self, attr: str, v: Any) -> Any:
+        return v
+
+    def to_json(self) -> Dict[str, Any]:
+        fields = self.FIELDS
+        extra = self.extra
+        out: Dict[str, Any] = {}
+        for k in self._layout:
+            attr = fields.get(k)
+            if attr is None:
+                out[k] = extra[k]
+            else:
+                v = getattr(self, attr)
+                if v is not _MISSING:
+                    out[k] = self._encode(attr, v)
+        for k in _absent_fields(type(self), self._layout):   # 载入后新设置的字段追加在末尾
+            v = getattr(self, fields[k])
+            if v is not _MISSING:
+                out[k] = self._encode(fields[k], v)
+        return out
+
+    def get(self, attr: str, default: Any = None) -> Any:
+        v = getattr(self, attr, _MISSING)
+        return default if v is _MISSING else v
+
+    def __repr__(self) -> str:
+        name = self.get("name") or self.get("object_name") or ""
+        return f"<{type(self).__name__} {name!r}>"
+
+
+# ---------- 属性 ----------
+class PropertyData(_Node):
+    """通用属性（Int/Float/Name/Text/SoftObject …）；Value 原样保存。"""
+    __slots__ = ("type", "name", "duplication_index", "is_zero", "value")
+    FIELDS = {"$type": "type", "Name": "name", "DuplicationIndex": "duplication_index",
+              "IsZero": "is_zero", "Value": "value"}
+    INTERN = frozenset(("type", "name"))
+
+    @property
+    def kind(self) -> str:
+        return short_type(self.type)
+
+
+class ObjectPropertyData(PropertyData):
+    """Value 为包索引：正数 = export 序号（1 基），负数 = import，0 = 空。"""
+    __slots__ = ()
+
+
+class _Container(PropertyData):
+    """Value 为子属性列表的属性；子项按 $type 转成属性对象。"""
+    __slots__ = ()
+
+    def _decode(self, attr: str, v: Any) -> Any:
+        if attr == "value" and type(v) is list:
+            return [property_from_json(x) if type(x) is dict and "$type" in x else x for x in v]
+        return _istr(v) if attr in self.INTERN else v
+
+    def _encode(self, attr: str, v: Any) -> Any:
+        if attr == "value" and type(v) is list:
+            return [x.to_json() if isinstance(x, _Node) else x for x in v]
+        return v
+
+    def children(self) -> List[Any]:
+        v = self.value
+        return v if type(v) is list else []
+
+
+class StructPropertyData(_Container):
+    __slots__ = ("struct_type", "serialize_none", "struct_guid")
+    FIELDS = {"$type": "type", "StructType": "struct_type", "SerializeNone": "serialize_none",
+              "StructGUID": "struct_guid", "Name": "name", "DuplicationIndex": "duplication_index",
+              "IsZero": "is_zero", "Value": "value"}
+    INTERN = frozenset(("type", "name", "struct_type", "struct_guid"))
+
+
+class ArrayPropertyData(_Container):
+    __slots__ = ("array_type", "dummy_struct")
+    FIELDS = {"$type": "type", "ArrayType": "array_type", "DummyStruct": "dummy_struct", "Name": "name",
+              "DuplicationIndex": "duplication_index", "IsZero": "is_zero", "Value": "value"}
+    INTERN = frozenset(("type", "name", "array_type"))
+
+
+_PROPERTY_CLASSES = {
+    "ObjectPropertyData": ObjectPropertyData,
+    "StructPropertyData": StructPropertyData,
+    "ArrayPropertyData": ArrayPropertyData,
+}
+
+
+def property_from_json(d: Dict[str, Any]) -> PropertyData:
+    return _PROPERTY_CLASSES.get(short_type(d.get("$type")), PropertyData).from_json(d)
+
+
+def walk(props: Iterable[Any]) -> Iterator[PropertyData]:
+    """深度优先遍历属性及其子属性（Struct/Array 的 Value）。"""
+    stack = list(reversed(list(props)))
+    while stack:
+        p = stack.pop()
+        if not isinstance(p, PropertyData):
+            continue
+        yield p
+        if isinstance(p, _Container):
+            stack.extend(reversed(p.children()))
+
+
+# ---------- Import / Export ----------
+class Import(_Node):
+    __slots__ = ("type", "object_name", "outer_index", "class_package", "class_name", "package_name",
+                 "optional")
+    FIELDS = {"$type": "type", "ObjectName": "object_name", "OuterIndex": "outer_index",
+              "ClassPackage": "class_package", "ClassName": "class_name", "PackageName": "package_name",
+              "bImportOptional": "optional"}
+    INTERN = frozenset(("type", "class_package", "class_name"))
+
+
+class Export(_Node):
+    """
+    依赖列表：sbs = SerializationBeforeSerializationDependencies，cbs = CreateBeforeSerializationDependencies，
+              sbc = SerializationBeforeCreateDependencies，cbc = CreateBeforeCreateDependencies。
+    data：第一次访问时把原始 Data 列表物化为属性对象。
+    """
+    __slots__ = ("type", "object_name", "object_flags", "outer_index", "class_index", "super_index",
+                 "template_index", "serial_size", "serial_offset", "sbs", "cbs", "sbc", "cbc", "_data", "_live")
+    FIELDS = {"$type": "type", "ObjectName": "object_name", "ObjectFlags": "object_flags",
+              "OuterIndex": "outer_index", "ClassIndex": "class_index", "SuperIndex": "super_index",
+              "TemplateIndex": "template_index", "SerialSize": "serial_size", "SerialOffset": "serial_offset",
+              "SerializationBeforeSerializationDependencies": "sbs",
+              "CreateBeforeSerializationDependencies": "cbs",
+              "SerializationBeforeCreateDependencies": "sbc",
+              "CreateBeforeCreateDependencies": "cbc",
+              "Data": "_data"}
+    INTERN = frozenset(("type", "object_flags"))
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Export":
+        self = super().from_json(d)
+        self._live = False
+        return self
+
+    @property
+    def data(self) -> List[Any]:
+        """Data 属性列表（首次访问时物化）；原文件没有 Data 或不是列表时返回空列表且不写回。"""
+        if not self._live:
+            raw = self._data
+            if type(raw) is _RawData:
+                raw = self._data = raw.decode()
+            if type(raw) is list:
+                self._data = [property_from_json(x) if type(x) is dict and "$type" in x else x for x in raw]
+                self._live = True
+            else:
+                return []
+        return self._data
+
+    @property
+    def data_loaded(self) -> bool:
+        return self._live
+
+    def _encode(self, attr: str, v: Any) -> Any:
+        if attr == "_data":
+            if self._live:
+                return [x.to_json() if isinstance(x, _Node) else x for x in v]
+            if type(v) is _RawData:
+                return v.decode()
+        return v
+
+    def dep_list(self, attr: str) -> List[Any]:
+        """返回依赖列表（sbs/cbs/sbc/cbc）；不是列表时置为空列表。"""
+        v = getattr(self, attr)
+        if type(v) is not list:
+            v = []
+            setattr(self, attr, v)
+        return v
+
+    def find(self, kind: str, name: Optional[str] = None) -> Optional[PropertyData]:
+        """Data 顶层第一个 kind（短类型名）且 Name 匹配的属性。"""
+        for p in self.data:
+            if isinstance(p, PropertyData) and p.kind == kind and (name is None or p.name == name):
+                return p
+        return None
+
+    def iter_arrays(self, array_type: str, names: Optional[Iterable[str]] = None) -> Iterator[ArrayPropertyData]:
+        """Data 顶层 ArrayType == array_type（且 Name 属于 names）的数组属性。"""
+        names = None if names is None else set(names)
+        for p in self.data:
+            if type(p) is ArrayPropertyData and p.array_type == array_type and (names is None or p.name in names):
+                yield p
+
+
+# ---------- NameMap ----------
+class NameMap:
+    """名称表；index_of / add 用字典加速，首次使用时建立。"""
+    __slots__ = ("names", "_index")
+
+    def __init__(self, names: Optional[List[Any]] = None):
+        self.names: List[Any] = names if names is not None else []
+        self._index: Optional[Dict[Any, int]] = None
+
+    def _idx(self) -> Dict[Any, int]:
+        if self._index is None:
+            idx: Dict[Any, int] = {}
+            for i, n in enumerate(self.names):
+                if isinstance(n, str):
+                    idx.setdefault(n, i)
+            self._index = idx
+        return self._index
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._idx()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def index_of(self, name: str) -> int:
+        return self._idx().get(name, -1)
+
+    def add(self, name: str) -> int:
+        """不存在则追加到末尾；返回其序号。"""
+        idx = self._idx()
+        i = idx.get(name)
+        if i is None:
+            i = len(self.names)
+            self.names.append(name)
+            idx[name] = i
+        return i
+
+    def to_json(self) -> List[Any]:
+        return self.names
+
+
+# ---------- 文档 ----------
+_TOP_ALIASES = {"namemap": "name_map", "imports": "imports", "exports": "exports", "export": "exports"}
+
+
+class Document:
+    """
+    顶层：name_map / imports / exports 为模型对象；其余键（Info、PackageFlags …）原样保存在 extra。
+    keys 记录原始键名与顺序，写出时按原样还原。
+    """
+    __slots__ = ("name_map", "imports", "exports", "extra", "keys", "_roles")
+
+    def __init__(self):
+        self.name_map = NameMap()
+        self.imports: List[Import] = []
+        self.exports: List[Export] = []
+        self.extra: Dict[str, Any] = {}
+        self.keys: Tuple[str, ...] = ("Info", "NameMap", "Imports", "Exports")
+        self._roles: Dict[str, str] = {"NameMap": "name_map", "Imports": "imports", "Exports": "exports"}
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> "Document":
+        self = cls()
+        self.keys = tuple(d)
+        self._roles = {}
+        for k, v in d.items():
+            role = _TOP_ALIASES.get(k.lower()) if isinstance(k, str) else None
+            if role is None or role in self._roles.values() or type(v) is not list:
+                self.extra[k] = v
+                continue
+            self._roles[k] = role
+            if role == "name_map":
+                self.name_map = NameMap(v)
+            elif role == "imports":
+                self.imports = [Import.from_json(x) if type(x) is dict else x for x in v]
+            else:
+                self.exports = [Export.from_json(x) if type(x) is dict else x for x in v]
+        return self
+
+    def to_json(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for k in self.keys:
+            role = self._roles.get(k)
+            if role is None:
+                out[k] = self.extra[k]
+            elif role == "name_map":
+                out[k] = self.name_map.to_json()
+            else:
+                out[k] = [x.to_json() if isinstance(x, _Node) else x for x in getattr(self, role)]
+        return out
+
+    @classmethod
+    def load(cls, path) -> "Document":
+        return cls.from_json(json_io.load(path))
+
+    @classmethod
+    def load_lazy(cls, path) -> "Document":
+        """头部立即解析、Data 按需解析（见模块说明 5）。"""
+        return cls.from_json(load_lazy_json(path))
+
+    def dump(self, path) -> None:
+        json_io.dump(self.to_json(), path)
+
+    def export(self, no: int) -> Optional[Export]:
+        """按 1 基序号取 export（与 ObjectProperty 的正数引用一致）；越界返回 None。"""
+        if 1 <= no <= len(self.exports):
+            return self.exports[no - 1]
+        return None
+
+
+# ---------- 延迟载入：字节索引 ----------
+# UAssetAPI / json.dump(indent=2) 的版式：顶层键在 2 空格缩进行，export 的 { } 在 4 空格缩进行，
+# export 的键在 6 空格缩进行。字符串里不会出现真正的换行，所以“换行 + 恰好 N 个空格 + 指定字符”只可能是结构。
+_BOM = b"\xef\xbb\xbf"
+_TOP_KEY = re.compile(rb'\n  "((?:[^"\\\r\n]|\\.)*)": ')
+# export 的 "Data": [ 在 6 空格缩进行；其内容缩进更深，同缩进的第一个 ] 就是它的结尾
+_DATA_KEY = b'\n      "Data": ['
+_DATA_CLOSE = b"\n      ]"
+_PLACEHOLDER = b"\\u0000data:"       # 解析后为 "\x00data:<序号>"，正常的 Data 不会是这样的字符串
+_PLACEHOLDER_STR = "\x00data:"
+
+
+def _index_top(raw: bytes) -> Optional[Dict[str, Tuple[int, int]]]:
+    """
+    顶层键 → 值的字节范围 [start, end)。
+    数组/对象值直接跳到 2 空格缩进的 ] / }，不逐字节扫描其内容。
+    """
+    if not raw.startswith(b"{"):
+        return None
+    tail = len(raw.rstrip())
+    if raw[tail - 1:tail] != b"}":
+        return None
+    out: Dict[str, Tuple[int, int]] = {}
+    pos = 1
+    while True:
+        nl = raw.find(b"\n", pos, tail)
+        m = _TOP_KEY.match(raw, nl) if nl >= 0 else None
+        if m is None:
+            break
+        if raw[pos:nl].strip() != (b"," if out else b""):
+            return None
+        vs = m.end()
+        opener = raw[vs:vs + 1]
+        if opener in (b"[", b"{") and raw[vs + 1:vs + 2] not in (b"]", b"}"):
+            close = raw.find(b"\n  " + (b"]" if opener == b"[" else b"}"), vs, tail)
+            if close < 0:
+                return None
+            ve = close + 4
+        else:
+            nxt = raw.find(b'\n  "', vs, tail)
+            ve = nxt if nxt >= 0 else tail - 1
+            ve = vs + len(raw[vs:ve].rstrip().rstrip(b","))
+        key = json.loads(b'"' + m.group(1) + b'"')
+        if key in out:
+            return None
+        out[key] = (vs, ve)
+        pos = ve
+    if not out or raw[pos:tail - 1].strip():
+        return None
+    return out
+
+
+def _lazy_exports(raw: bytes, s: int, e: int) -> List[Any]:
+    """
+    Exports 数组：把每个 export 的非空 Data 换成占位字符串后整段一次解析（只剩头部），再把占位换成 _RawData。
+    定位只用 bytes.find（C 实现），Data 内部的字节不经过 JSON 解析器，也不产生 Python 对象。
+    """
+    find = raw.find
+    pieces: List[bytes] = []
+    spans: List[_RawData] = []
+    pos = s
+    k = find(_DATA_KEY, s, e)
+    while k >= 0:
+        vs = k + len(_DATA_KEY) - 1          # "[" 的位置
+        close = -1 if raw[vs + 1:vs + 2] == b"]" else find(_DATA_CLOSE, vs, e)
+        if close < 0:                        # 空列表（或版式异常）：保持原样，随头部一起解析
+            k = find(_DATA_KEY, vs, e)
+            continue
+        ve = close + len(_DATA_CLOSE)
+        pieces.append(raw[pos:vs])
+        pieces.append(b'"%s%d"' % (_PLACEHOLDER, len(spans)))
+        spans.append(_RawData(raw, vs, ve))
+        pos = ve
+        k = find(_DATA_KEY, ve, e)
+    pieces.append(raw[pos:e])
+    exports = _loads_slice(b"".join(pieces))
+    if spans:
+        for d in exports:
+            if type(d) is dict:
+                v = d.get("Data")
+                if type(v) is str and v.startswith(_PLACEHOLDER_STR):
+                    d["Data"] = spans[int(v[len(_PLACEHOLDER_STR):])]
+    return exports
+
+
+def loads_lazy(raw: bytes) -> Optional[Dict[str, Any]]:
+    """按缩进版式建立字节索引并解析头部；不是 2 空格缩进的 UAssetAPI 版式时返回 None。"""
+    if raw.startswith(_BOM):
+        raw = raw[len(_BOM):]
+    sections = _index_top(raw)
+    if sections is None:
+        return None
+    exports_key = next((k for k in sections if k.lower() in ("exports", "export")), None)
+    out: Dict[str, Any] = {}
+    for k, (s, e) in sections.items():
+        if k == exports_key and raw[s:s + 1] == b"[":
+            out[k] = _lazy_exports(raw, s, e)
+        else:
+            out[k] = _loads_slice(raw[s:e])
+    return out
+
+
+def load_lazy_json(path) -> Any:
+    """
+    与 json_io.load 结果相同的 dict，只是各 export 的非空 Data 暂为未解析的字节范围，
+    用 export_data(exp) 取用（首次取用时解析并写回）；要整份使用（写出、递归遍历）前先 materialize。
+    版式不符时退回 json_io.load。
+    """
+    if LAZY_INDEX == "never" or (LAZY_INDEX == "auto" and json_io.BACKEND != "json"):
+        return json_io.load(path)
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        obj = loads_lazy(raw)
+    except (ValueError, UnicodeDecodeError):
+        obj = None
+    return obj if obj is not None else json_io.load(path)
+
+
+def export_data(exp: Dict[str, Any]) -> Any:
+    """export 的 Data（load_lazy_json 的结果中按需解析）。"""
+    v = exp.get("Data")
+    if type(v) is _RawData:
+        v = exp["Data"] = v.decode()
+    return v
+
+
+def materialize(obj: Any) -> Any:
+    """把 load_lazy_json 结果中尚未解析的 Data 全部解析，得到与 json_io.load 相同的普通 dict。"""
+    if isinstance(obj, dict):
+        for v in obj.values():
+            if type(v) is list:
+                for exp in v:
+                    if type(exp) is dict and type(exp.get("Data")) is _RawData:
+                        export_data(exp)
+    return obj
+
+
+# ---------- 命令行：往返与内存校验 ----------
+def _measure(fn):
+    import tracemalloc
+    tracemalloc.start()
+    obj = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def main(argv: List[str]) -> int:
+    if not argv:
+        print("用法：python uasset_model.py a.json [b.json ...]")
+        return 2
+    bad = 0
+    for path in argv:
+        raw, raw_size = _measure(lambda: json_io.load(path))
+        original = json_io.dumps(raw)
+        del raw
+        doc, lazy_size = _measure(lambda: Document.load(path))
+        same_lazy = json_io.dumps(doc.to_json()) == original
+        for exp in doc.exports:
+            if isinstance(exp, Export):
+                exp.data
+        same_live = json_io.dumps(doc.to_json()) == original
+        del doc
+
+        def load_live():
+            d = Document.load(path)
+            for e in d.exports:
+                if isinstance(e, Export):
+                    e.data
+            return d
+        _, live_size = _measure(load_live)
+
+        with open(path, "rb") as f:
+            data = f.read()
+        t0 = time.perf_counter()
+        json_io.load(path)
+        t_full = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        try:
+            lazy = loads_lazy(data)
+        except (ValueError, UnicodeDecodeError):
+            lazy = None
+        t_head = time.perf_counter() - t0
+        same_idx = True
+        n_raw = 0
+        if lazy is not None:
+            doc = Document.from_json(lazy)
+            n_raw = sum(1 for e in doc.exports if isinstance(e, Export) and type(e._data) is _RawData)
+            same_idx = json_io.dumps(doc.to_json()) == original
+            for exp in doc.exports:
+                if isinstance(exp, Export):
+                    exp.data
+            same_idx = same_idx and json_io.dumps(doc.to_json()) == original
+            same_idx = same_idx and json_io.dumps(materialize(lazy)) == original
+            del doc
+
+        ok = same_lazy and same_live and same_idx
+        bad += not ok
+        print(f"{path}\n  往返一致：{'是' if ok else '否'}；内存 dict {raw_size / 1024:.0f} KB，"
+              f"模型(未物化 Data) {lazy_size / 1024:.0f} KB，模型(全部物化) {live_size / 1024:.0f} KB"
+              f"（{live_size / max(raw_size, 1):.0%}）")
+        if lazy is None:
+            print(f"  整份解析（{json_io.BACKEND}）{t_full * 1000:.1f} ms；不是 2 空格缩进版式，延迟载入会退回整份解析")
+        else:
+            print(f"  整份解析（{json_io.BACKEND}）{t_full * 1000:.1f} ms；字节索引只解析头部 {t_head * 1000:.1f} ms"
+                  f"（{n_raw} 个 export 的 Data 未解析）")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
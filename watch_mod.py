@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+功能：
+1) 监视 mod 目录，JSON 一保存就只把这一个文件送进修复/转换流水线，不再手动逐个脚本整目录重跑：
+     fill_indices_export.process_file → fix_indices_namemap.process_one_json_file → json2uasset.convert_one
+   三步各自的配置（输出位置、备份、前缀、SKIP_POLICY 等）仍取各脚本顶部常量，可用 RUN_* 开关单独关闭。
+2) 变化检测：装了 watchdog 用系统通知（Windows ReadDirectoryChangesW / Linux inotify），否则轮询 mtime+大小。
+3) 防抖：同一文件最后一次变化后静默 DEBOUNCE_SEC 秒才处理（编辑器“临时文件+改名”的保存方式也能合并为一次）。
+4) 流水线自己写回的文件会记下签名，不会再次触发自身。
+5) json2uasset 开启 USE_CONVERTER_HOST 时保持 1 个常驻转换进程，单文件往返不再付 .NET 启动开销。
+6) 监视期间强制关闭 fill_indices_export 的索引平移（SHIFT_POSITIONS 只应对一次性批处理生效）。
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from watchdog.observers import Observer              # 可选
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+import fill_indices_export
+import fix_indices_namemap
+import json2uasset
+import converter_host
+
+# ============== 配置（按需修改） ==============
+WATCH_DIRS: List[str] = [
+    r"D:\Unreal_tools\yijian\Wandering_Sword-WindowsNoEditor_XTZH\Wandering_Sword\Content\JH\Skills",
+]
+# 仅处理文件名以这些前缀开头的 .json；() 表示不过滤
+FILENAME_PREFIXES: Tuple[str, ...] = ("GE",)
+
+DEBOUNCE_SEC = 0.5      # 最后一次变化后静默多久才处理
+POLL_INTERVAL = 0.5     # 轮询模式的扫描间隔（秒）；通知模式下为主循环检查间隔
+USE_WATCHDOG = True     # False 时强制轮询
+
+RUN_FILL_INDICES = True     # 第1步：fill_indices_export
+RUN_FIX_NAMEMAP = True      # 第2步：fix_indices_namemap
+RUN_JSON2UASSET = True      # 第3步：json2uasset
+# ===========================================
+
+
+def _match(path: str) -> bool:
+    name = os.path.basename(path)
+    if not name.lower().endswith(".json"):
+        return False
+    return not FILENAME_PREFIXES or name.startswith(FILENAME_PREFIXES)
+
+
+def _sig(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# ---------- 变化来源 ----------
+class PollingSource:
+    """轮询：每次 poll() 扫描目录，返回 mtime/大小有变化（或新增）的文件。"""
+
+    def __init__(self, dirs: Iterable[str]):
+        self.dirs = list(dirs)
+        self.snap = self._scan()
+        self.last = time.monotonic()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snap: Dict[str, Tuple[int, int]] = {}
+        for d in self.dirs:
+            for root, _, files in os.walk(d):
+                for fn in files:
+                    p = os.path.join(root, fn)
+                    if _match(p):
+                        s = _sig(p)
+                        if s is not None:
+                            snap[p] = s
+        return snap
+
+    def poll(self) -> Set[str]:
+        if time.monotonic() - self.last < POLL_INTERVAL:
+            return set()
+        self.last = time.monotonic()
+        snap = self._scan()
+        changed = {p for p, s in snap.items() if self.snap.get(p) != s}
+        self.snap = snap
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class _Handler(FileSystemEventHandler):
+    def __init__(self, sink: Set[str], lock: threading.Lock):
+        self.sink, self.lock = sink, lock
+
+    def _add(self, path) -> None:
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        if path and _match(path):
+            with self.lock:
+                self.sink.add(os.path.abspath(path))
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._add(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._add(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._add(event.dest_path)
+
+
+class WatchdogSource:
+    """系统通知：事件线程把路径放进集合，poll() 取走。"""
+
+    def __init__(self, dirs: Iterable[str]):
+        self.lock = threading.Lock()
+        self.events: Set[str] = set()
+        self.observer = Observer()
+        handler = _Handler(self.events, self.lock)
+        for d in dirs:
+            self.observer.schedule(handler, d, recursive=True)
+        self.observer.start()
+
+    def poll(self) -> Set[str]:
+        with self.lock:
+            out = set(self.events)
+            self.events.clear()
+        return out
+
+    def close(self) -> None:
+        self.observer.stop()
+        self.observer.join(timeout=5)
+
+
+# ---------- 单文件流水线 ----------
+def run_pipeline(path: str) -> str:
+    """按顺序跑三步；返回最终 JSON 路径（各步可能改写输出位置）。"""
+    cur = path
+    if RUN_FILL_INDICES:
+        cur = fill_indices_export.process_file(cur)
+    if RUN_FIX_NAMEMAP:
+        cur = fix_indices_namemap.process_one_json_file(cur)
+    if RUN_JSON2UASSET:
+        ok, brief, detail = json2uasset.convert_one(Path(cur))
+        print(f"[json2uasset] {brief}")
+        if not ok and detail:
+            print(detail)
+    return cur
+
+
+def watch(dirs: List[str], stop: Optional[threading.Event] = None) -> None:
+    dirs = [d for d in dirs if os.path.isdir(d)]
+    if not dirs:
+        print("[错误] WATCH_DIRS 中没有存在的目录。")
+        return
+
+    fill_indices_export.ENABLE_SHIFT = False
+    if RUN_JSON2UASSET and json2uasset.USE_CONVERTER_HOST and json2uasset.EXE.exists():
+        json2uasset.HOST = converter_host.ConverterHost(json2uasset.EXE, 1)
+
+    use_notify = USE_WATCHDOG and Observer is not None
+    source = WatchdogSource(dirs) if use_notify else PollingSource(dirs)
+    print(f"[监视] {'系统通知' if use_notify else '轮询'}模式，目录 {len(dirs)} 个，防抖 {DEBOUNCE_SEC}s。Ctrl+C 退出。")
+    for d in dirs:
+        print(f"  - {d}")
+
+    pending: Dict[str, float] = {}        # 路径 -> 最后一次变化时刻
+    ours: Dict[str, Tuple[int, int]] = {}  # 流水线自己写出的签名
+    try:
+        while not (stop and stop.is_set()):
+            now = time.monotonic()
+            for p in source.poll():
+                pending[p] = now
+            ready = [p for p, t in pending.items() if now - t >= DEBOUNCE_SEC]
+            for p in ready:
+                del pending[p]
+                s = _sig(p)
+                if s is None or ours.get(p) == s:
+                    continue
+                t0 = time.perf_counter()
+                print("\n" + "=" * 80)
+                print(f"[变化] {p}")
+                try:
+                    out = run_pipeline(p)
+                except Exception as e:
+                    # 编辑器可能仍在写文件、或 JSON 暂时不合法：等下一次保存
+                    print(f"[失败] {p}: {type(e).__name__}: {e}")
+                    traceback.print_exc(limit=3)
+                    ours[p] = s
+                    continue
+                for q in {p, out}:
+                    qs = _sig(q)
+                    if qs is not None:
+                        ours[q] = qs
+                print(f"[完成] {os.path.basename(p)} 用时 {time.perf_counter() - t0:.2f}s")
+            time.sleep(min(POLL_INTERVAL, DEBOUNCE_SEC) / 2)
+    except KeyboardInterrupt:
+        print("\n[监视] 已退出。")
+    finally:
+        source.close()
+        if json2uasset.HOST is not None:
+            json2uasset.HOST.close()
+            json2uasset.HOST = None
+
+
+def main():
+    dirs = sys.argv[1:] or WATCH_DIRS
+    watch(dirs)
+
+
+if __name__ == "__main__":
+    main()